@@ -0,0 +1,379 @@
+"""Headless self-play arena for battleship players.
+
+Plays player classes against each other in-process by calling their
+actions directly, without launching agents, an exchange, or a manager.
+Games are split into seeded batches that are spread across a process pool.
+
+Usage:
+    python -m academy_tutorial.arena PLAYER_0 PLAYER_1 --games 100000
+
+where each player is an import path such as
+``testing.agents:MyBattleshipPlayer``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import math
+import os
+import random
+import statistics
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+
+import numpy as np
+
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Game
+from academy_tutorial.player import BattleshipPlayer
+from academy_tutorial.referee import DEFAULT_MAX_REPEATS
+from academy_tutorial.referee import Referee
+
+DEFAULT_SHIPS = (5, 5, 4, 3, 2)
+
+PlayerSpec = str | type[BattleshipPlayer]
+
+
+def load_player(spec: PlayerSpec) -> type[BattleshipPlayer]:
+    """Resolve a player class from a ``'module:Class'`` path.
+
+    Args:
+        spec: A player class, or its import path as ``'module:Class'`` or
+            ``'module.Class'``.
+
+    Raises:
+        TypeError: If spec does not refer to a BattleshipPlayer subclass.
+    """
+    if isinstance(spec, str):
+        module_name, sep, class_name = spec.partition(':')
+        if not sep:
+            module_name, _, class_name = spec.rpartition('.')
+        spec = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(spec, type) and issubclass(spec, BattleshipPlayer)):
+        raise TypeError(f'{spec!r} is not a BattleshipPlayer subclass.')
+    return spec
+
+
+def player_name(spec: PlayerSpec) -> str:
+    """Display name of a player spec."""
+    if isinstance(spec, str):
+        return spec
+    return f'{spec.__module__}:{spec.__qualname__}'
+
+
+@dataclass
+class ArenaResult:
+    """Aggregated outcome of games between two players."""
+
+    players: tuple[str, str]
+    wins: list[int] = field(default_factory=lambda: [0, 0])
+    forfeits: list[int] = field(default_factory=lambda: [0, 0])
+    draws: int = 0
+    moves: int = 0
+
+    @property
+    def games(self) -> int:
+        """Number of games played."""
+        return self.wins[0] + self.wins[1] + self.draws
+
+    @property
+    def mean_length(self) -> float:
+        """Mean number of moves per game."""
+        return self.moves / self.games if self.games > 0 else 0
+
+    def win_rate(self, player: int) -> float:
+        """Proportion of games won by player."""
+        return self.wins[player] / self.games if self.games > 0 else 0
+
+    def confidence_interval(
+        self,
+        player: int,
+        confidence: float = 0.95,
+    ) -> tuple[float, float]:
+        """Wilson score interval of the win rate of player."""
+        if self.games == 0:
+            return (0, 1)
+        z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+        n = self.games
+        p = self.win_rate(player)
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        margin = (
+            z
+            * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+            / (1 + z * z / n)
+        )
+        return (max(0, center - margin), min(1, center + margin))
+
+    def merge(self, other: ArenaResult) -> None:
+        """Add the games of other to this result."""
+        for player in (0, 1):
+            self.wins[player] += other.wins[player]
+            self.forfeits[player] += other.forfeits[player]
+        self.draws += other.draws
+        self.moves += other.moves
+
+    def summary(self, confidence: float = 0.95) -> str:
+        """Human readable report of the result."""
+        lines = []
+        for player in (0, 1):
+            low, high = self.confidence_interval(player, confidence)
+            lines.append(
+                f'Player {player} ({self.players[player]}): '
+                f'won {self.wins[player]}/{self.games} '
+                f'({self.win_rate(player):.4f}, '
+                f'{confidence:.0%} CI [{low:.4f}, {high:.4f}]), '
+                f'forfeited {self.forfeits[player]}',
+            )
+        lines.append(
+            f'Draws: {self.draws}, '
+            f'mean game length: {self.mean_length:.2f} moves',
+        )
+        return '\n'.join(lines)
+
+
+async def play_game(  # noqa: PLR0913
+    player_0: BattleshipPlayer,
+    player_1: BattleshipPlayer,
+    ships: Sequence[int] = DEFAULT_SHIPS,
+    size: int = 10,
+    max_moves: int | None = None,
+    *,
+    max_repeats: int = DEFAULT_MAX_REPEATS,
+) -> tuple[int, int, bool]:
+    """Play a single game by invoking the player actions directly.
+
+    A player that raises or returns an invalid board forfeits, as does a
+    player that breaks the rules of the :class:`Referee` of the game.
+
+    Args:
+        player_0: Player that moves first.
+        player_1: Player that moves second.
+        ships: Lengths of the ships each player places.
+        size: Size of the board.
+        max_moves: Number of moves after which the game is a draw.
+            Defaults to the cap of :class:`Referee`.
+        max_repeats: Number of repeated shots a player may make in a game
+            before it forfeits.
+
+    Returns:
+        The winner (or -1 for a draw), the number of moves played, and
+        whether the game ended by forfeit.
+    """
+    players = (player_0, player_1)
+    referee = Referee(size, max_moves, max_repeats)
+
+    boards = []
+    for i, player in enumerate(players):
+        try:
+            board = await player.new_game(list(ships), size)
+            if sorted(s.length for s in board.ships) != sorted(ships):
+                raise ValueError('Invalid board.')
+            boards.append(BitBoard.from_board(board))
+        except Exception:
+            return 1 - i, 0, True
+
+    game = Game(boards[0], boards[1])
+    moves = 0
+    while not referee.exhausted:
+        mover = game.current_turn
+        try:
+            attack = referee.check_move(
+                mover,
+                await players[mover].get_move(),
+            )
+            result = game.attack(mover, attack).result
+            referee.check_result(mover, result)
+            await players[mover].notify_result(attack, result)
+        except Exception:
+            return 1 - mover, moves, True
+        moves += 1
+
+        winner = game.check_winner()
+        if winner >= 0:
+            return winner, moves, False
+
+        try:
+            await players[1 - mover].notify_move(attack)
+        except Exception:
+            return mover, moves, True
+
+    return -1, moves, False
+
+
+@dataclass
+class _Batch:
+    player_0: PlayerSpec
+    player_1: PlayerSpec
+    first_game: int
+    games: int
+    seed: int
+    ships: tuple[int, ...]
+    size: int
+    max_moves: int | None
+    max_repeats: int
+
+
+async def _play_batch(batch: _Batch) -> ArenaResult:
+    players = (load_player(batch.player_0)(), load_player(batch.player_1)())
+    # the players are not launched as agents, so run their startup and
+    # shutdown around the games, which start and stop their resources
+    for player in players:
+        await player.agent_on_startup()
+    try:
+        return await _play_games(batch, players)
+    finally:
+        for player in players:
+            await player.agent_on_shutdown()
+
+
+async def _play_games(
+    batch: _Batch,
+    players: tuple[BattleshipPlayer, BattleshipPlayer],
+) -> ArenaResult:
+    result = ArenaResult(
+        (player_name(batch.player_0), player_name(batch.player_1)),
+    )
+    for game in range(batch.first_game, batch.first_game + batch.games):
+        # alternate who moves first to cancel out the first move advantage
+        first = game % 2
+        winner, moves, forfeit = await play_game(
+            players[first],
+            players[1 - first],
+            batch.ships,
+            batch.size,
+            batch.max_moves,
+            max_repeats=batch.max_repeats,
+        )
+        result.moves += moves
+        if winner < 0:
+            result.draws += 1
+            continue
+        winner = winner if first == 0 else 1 - winner
+        result.wins[winner] += 1
+        if forfeit:
+            result.forfeits[1 - winner] += 1
+    return result
+
+
+def play_batch(batch: _Batch) -> ArenaResult:
+    """Play a seeded batch of games in the current process."""
+    random.seed(batch.seed)
+    np.random.seed(batch.seed % 2**32)
+    return asyncio.run(_play_batch(batch))
+
+
+def run_arena(  # noqa: PLR0913
+    player_0: PlayerSpec,
+    player_1: PlayerSpec,
+    games: int,
+    *,
+    seed: int = 0,
+    workers: int | None = None,
+    batch_size: int = 500,
+    ships: Sequence[int] = DEFAULT_SHIPS,
+    size: int = 10,
+    max_moves: int | None = None,
+    max_repeats: int = DEFAULT_MAX_REPEATS,
+) -> ArenaResult:
+    """Play games between two player classes across a process pool.
+
+    Games are split into batches of batch_size, each seeded from seed and
+    its index, so the result only depends on the arguments and not on how
+    the batches are scheduled on the workers.
+
+    Args:
+        player_0: First player class or its import path.
+        player_1: Second player class or its import path.
+        games: Number of games to play.
+        seed: Seed of the random number generators of the players.
+        workers: Number of processes. Defaults to the number of CPUs, and
+            a value of 1 plays every game in the current process.
+        batch_size: Number of games per batch.
+        ships: Lengths of the ships each player places.
+        size: Size of the board.
+        max_moves: Number of moves after which a game is a draw.
+        max_repeats: Number of repeated shots a player may make in a game
+            before it forfeits.
+
+    Returns:
+        The aggregated result, where player 0 is always player_0.
+    """
+    # Fail fast in the parent if a player can not be imported.
+    load_player(player_0)
+    load_player(player_1)
+
+    seeds = np.random.SeedSequence(seed).spawn(math.ceil(games / batch_size))
+    batches = [
+        _Batch(
+            player_0,
+            player_1,
+            first_game=start,
+            games=min(batch_size, games - start),
+            seed=int(seq.generate_state(1, np.uint64)[0]),
+            ships=tuple(ships),
+            size=size,
+            max_moves=max_moves,
+            max_repeats=max_repeats,
+        )
+        for start, seq in zip(range(0, games, batch_size), seeds)
+    ]
+
+    result = ArenaResult((player_name(player_0), player_name(player_1)))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for batch in batches:
+            result.merge(play_batch(batch))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch_result in executor.map(play_batch, batches):
+            result.merge(batch_result)
+    return result
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the arena from the command line."""
+    parser = argparse.ArgumentParser(
+        description='Play battleship players against each other headlessly.',
+    )
+    parser.add_argument('player_0', help='Player class as module:Class.')
+    parser.add_argument('player_1', help='Player class as module:Class.')
+    parser.add_argument('--games', '-n', type=int, default=10_000)
+    parser.add_argument('--seed', '-s', type=int, default=0)
+    parser.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        help='Number of processes (default: number of CPUs).',
+    )
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument(
+        '--ships',
+        type=int,
+        nargs='+',
+        default=list(DEFAULT_SHIPS),
+    )
+    parser.add_argument('--confidence', type=float, default=0.95)
+    args = parser.parse_args(argv)
+
+    result = run_arena(
+        args.player_0,
+        args.player_1,
+        args.games,
+        seed=args.seed,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        ships=args.ships,
+        size=args.size,
+    )
+    print(result.summary(args.confidence))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,9 +1,35 @@
 from __future__ import annotations
 
+import functools
+import random
+import struct
+from array import array
+from collections.abc import Iterable
+from collections.abc import Sequence
+from typing import Any
+from typing import ClassVar
 from typing import Literal
 from typing import NamedTuple
+from typing import SupportsIndex
+from typing import TypeVar
 
 import emoji
+import numpy as np
+import numpy.typing as npt
+
+BoardT = TypeVar('BoardT', bound='Board')
+
+# Layout of the compact wire encoding, see Board.to_bytes and Game.to_bytes
+_CRD = struct.Struct('<ii')  # row, col
+_BOARD = struct.Struct('<BB')  # size, number of ships
+_SHIP = struct.Struct('<HB')  # start cell, length with the vertical flag
+# turn, winner, BitBoard flags, board length, version
+_GAME = struct.Struct('<BbBHI')
+_VERTICAL = 0x80
+_MAX_ENCODED = 0xFF  # largest size and number of ships of a board
+# version of the compact wire encoding that this release decodes
+CODEC_VERSION = 1
+
 
 class Crd(NamedTuple):
     """Coordinate structure."""
@@ -11,20 +37,53 @@ class Crd(NamedTuple):
     x: int
     y: int
 
+    def to_bytes(self) -> bytes:
+        """Encode the coordinate as two little-endian 32-bit integers."""
+        return _CRD.pack(self.x, self.y)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Crd:
+        """Decode a coordinate encoded with :meth:`to_bytes`."""
+        return cls(*_CRD.unpack(data))
+
+
+@functools.lru_cache(maxsize=8)
+def crd_table(size: int) -> tuple[Crd, ...]:
+    """Shared coordinates of every cell of a board of size.
+
+    The coordinate of ``(row, col)`` is at index ``row * size + col``.
+    Boards take their ship positions and decoded guesses from this table
+    instead of allocating a new :class:`Crd` each time.
+    """
+    return tuple(Crd(row, col) for row in range(size) for col in range(size))
+
 
 class Ship:
     """Structure to represent a battleship."""
 
-    def __init__(self, positions: list[Crd]):
+    __slots__ = ('_hit_mask', 'length', 'positions')
+
+    def __init__(self, positions: Sequence[Crd]):
         """Structure to represent a battleship.
 
         Args:
-            length: Number of slots on the ship.
             positions: Coordinates of ship.
         """
         self.length = len(positions)
-        self.positions = positions  # e.g., [(2,3), (2,4), (2,5)]
-        self.hits: set[Crd] = set()
+        self.positions = tuple(positions)  # e.g., ((2,3), (2,4), (2,5))
+        self._hit_mask = 0  # bit i is set when positions[i] has been hit
+
+    @property
+    def hits(self) -> frozenset[Crd]:
+        """Positions of the ship that have been hit.
+
+        A read-only snapshot, use :meth:`register_hit` to add a hit.
+        """
+        return frozenset(
+            pos
+            for i, pos in enumerate(self.positions)
+            if self._hit_mask >> i & 1
+        )
 
     def register_hit(self, pos: Crd) -> None:
         """Add a hit to this ship.
@@ -33,20 +92,270 @@ class Ship:
             pos: Position of the attack.
         """
         if pos in self.positions:
-            self.hits.add(pos)
+            self._hit_mask |= 1 << self.positions.index(pos)
+
+    def register_hit_index(self, index: int) -> None:
+        """Add a hit to the position of this ship at index."""
+        self._hit_mask |= 1 << index
 
     @property
     def is_sunk(self) -> bool:
         """Check if ship is sunk."""
-        return len(self.hits) == self.length
+        return self._hit_mask == (1 << self.length) - 1
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The attributes of ships before the class had slots, so that
+        # earlier releases can unpickle ships sent by this one.
+        return {
+            'length': self.length,
+            'positions': list(self.positions),
+            'hits': set(self.hits),
+        }
+
+    def __setstate__(self, state: Any) -> None:
+        # Ships pickled before the class had slots carry their __dict__,
+        # with the hit positions as a set rather than a mask.
+        if isinstance(state, tuple):
+            _, state = state
+        self.length = state['length']
+        self.positions = tuple(state['positions'])
+        self._hit_mask = state.get('_hit_mask', 0)
+        for pos in state.get('hits', ()):
+            self.register_hit(pos)
 
     def __repr__(self) -> str:
         return f'<Ship length={self.length} sunk={self.is_sunk}>'
 
 
+class AttackResult(NamedTuple):
+    """Outcome of a single attack on a board."""
+
+    result: Literal['hit', 'miss', 'guessed']
+    sunk: Ship | None = None  # the ship, if the attack sunk it
+
+
+class MoveEvent(NamedTuple):
+    """A move played in a :class:`Game`."""
+
+    version: int  # version of the game after the move
+    player: int
+    pos: Crd
+    result: Literal['hit', 'miss', 'guessed']
+    sunk: bool  # whether the attack sunk a ship
+
+
+class Placement(NamedTuple):
+    """Position of a ship on a board."""
+
+    start: Crd
+    length: int
+    direction: Literal['horizontal', 'vertical']
+
+
+class PlacementIndex:
+    """Every legal placement of a ship of length on a board of size.
+
+    Placement ``i`` covers the cells set in ``masks[i]``, where cell
+    ``(row, col)`` is bit ``row * size + col`` as in :class:`BitBoard`, and
+    row ``i`` of :attr:`cells` is the same mask as a flat boolean grid.
+    Horizontal placements come first, each group ordered by start cell.
+    The tables are built on first use since the masks and the grid grow
+    with the square of the number of cells.
+
+    Use :func:`placement_index` to get the shared, cached index rather
+    than building one directly.
+
+    Args:
+        size: Size of the board.
+        length: Length of the ship.
+    """
+
+    def __init__(self, size: int, length: int):
+        self.size = size
+        self.length = length
+        # number of columns a horizontal ship can start in and of
+        # horizontal placements, after which the vertical ones follow
+        self._span = max(size - length + 1, 0) if length > 0 else 0
+        self._n_horizontal = size * self._span
+        # mask of a ship starting at cell 0, shifted by the start cell
+        self._units = {
+            'horizontal': (1 << length) - 1,
+            'vertical': sum(1 << (i * size) for i in range(length)),
+        }
+
+    def __len__(self) -> int:
+        return 2 * self._n_horizontal
+
+    @functools.cached_property
+    def starts(self) -> npt.NDArray[np.intp]:
+        """Start cell of each placement."""
+        cells = np.arange(self.size * self.size).reshape(self.size, -1)
+        return np.concatenate(
+            (cells[:, : self._span].ravel(), cells[: self._span].ravel()),
+        )
+
+    @functools.cached_property
+    def placements(self) -> tuple[Placement, ...]:
+        """Start and direction of each placement."""
+        table = crd_table(self.size)
+        return tuple(
+            Placement(
+                table[start],
+                self.length,
+                'horizontal' if i < self._n_horizontal else 'vertical',
+            )
+            for i, start in enumerate(self.starts.tolist())
+        )
+
+    @functools.cached_property
+    def masks(self) -> tuple[int, ...]:
+        """Bitmask of the cells of each placement."""
+        return tuple(self.mask(*p.start, p.direction) for p in self.placements)
+
+    @functools.cached_property
+    def cells(self) -> npt.NDArray[np.bool_]:
+        """Read-only boolean grid of the cells of each placement."""
+        cells = np.zeros((len(self), self.size * self.size), dtype=np.bool_)
+        rows = np.arange(len(self))[:, None]
+        cells[rows, self.cells_of(rows[:, 0])] = True
+        cells.flags.writeable = False
+        return cells
+
+    def mask(
+        self,
+        row: int,
+        col: int,
+        direction: Literal['horizontal', 'vertical'],
+    ) -> int:
+        """Mask of the ship starting at ``(row, col)``.
+
+        The start must be a legal placement, which is not checked.
+        """
+        return self._units[direction] << (row * self.size + col)
+
+    def available(self, occupied: int) -> list[int]:
+        """Indices of the placements that do not overlap occupied."""
+        return [i for i, mask in enumerate(self.masks) if not mask & occupied]
+
+    def cells_of(self, indices: npt.ArrayLike) -> npt.NDArray[np.intp]:
+        """Flat cells covered by each of the placements at indices.
+
+        Returns:
+            Array of shape ``(len(indices), length)``.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        steps = np.where(indices < self._n_horizontal, 1, self.size)
+        offsets = np.arange(self.length, dtype=np.intp)
+        return (
+            self.starts[indices, None]
+            + steps[:, None].astype(np.intp) * offsets
+        )
+
+    def covering(self, cell: int) -> npt.NDArray[np.intp]:
+        """Indices of the placements that cover the flat cell."""
+        row, col = divmod(cell, self.size)
+        last = self._span - 1
+        cols = np.arange(max(0, col - self.length + 1), min(col, last) + 1)
+        rows = np.arange(max(0, row - self.length + 1), min(row, last) + 1)
+        return np.concatenate(
+            (
+                row * self._span + cols,
+                self._n_horizontal + rows * self.size + col,
+            ),
+        )
+
+
+@functools.lru_cache(maxsize=64)
+def placement_index(size: int, length: int) -> PlacementIndex:
+    """Shared placement index of a ship of length on a board of size."""
+    return PlacementIndex(size, length)
+
+
+def random_fleet(
+    ships: Sequence[int],
+    size: int = 10,
+    rng: random.Random | None = None,
+    max_attempts: int = 100_000,
+) -> list[Placement]:
+    """Place a fleet uniformly at random.
+
+    Every arrangement of the fleet without overlapping ships is equally
+    likely: each ship is drawn from all of its placements and the whole
+    fleet is redrawn on an overlap, which only costs a few mask operations
+    per attempt.
+
+    Args:
+        ships: Length of each ship.
+        size: Size of the board.
+        rng: Random number generator. Defaults to the one of the
+            :mod:`random` module, so seeding it makes fleets reproducible.
+        max_attempts: Number of draws before giving up.
+
+    Returns:
+        The placement of each ship, in the order of ships.
+
+    Raises:
+        ValueError: If no arrangement was found in max_attempts draws.
+    """
+    randrange = random.randrange if rng is None else rng.randrange
+    indices = [placement_index(size, length) for length in ships]
+    if all(len(index) > 0 for index in indices):
+        for _ in range(max_attempts):
+            occupied = 0
+            fleet = []
+            for index in indices:
+                choice = randrange(len(index))
+                mask = index.masks[choice]
+                if mask & occupied:
+                    break
+                occupied |= mask
+                fleet.append(index.placements[choice])
+            else:
+                return fleet
+    raise ValueError(
+        f'Could not place ships {list(ships)} on a {size}x{size} board.',
+    )
+
+
+def _mask_cells(mask: int) -> list[int]:
+    """Indices of the bits set in mask."""
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+def _from_wire(cls: Any, version: int, data: bytes) -> Any:
+    """Decode a board or game pickled with the compact encoding."""
+    if version != CODEC_VERSION:
+        raise ValueError(f'Can not decode wire codec version {version}.')
+    return cls.from_bytes(data)
+
+
+def _reduce_wire(obj: Board | Game) -> tuple[Any, ...] | None:
+    """Reduce obj to its compact encoding, if its class sends it."""
+    if obj.wire_codec is None:
+        return None
+    if obj.wire_codec != CODEC_VERSION:
+        raise ValueError(f'Unknown wire codec version {obj.wire_codec}.')
+    try:
+        return (_from_wire, (type(obj), obj.wire_codec, obj.to_bytes()))
+    except ValueError:
+        return None
+
+
 class Board:
     """Battleship game board."""
 
+    __slots__ = ('guesses', 'occupied', 'remaining', 'ships', 'size')
+
+    # version of the compact encoding sent when boards are pickled, or None
+    # to pickle the attributes, which earlier releases can read; set it to
+    # CODEC_VERSION only once every peer decodes that version
+    wire_codec: ClassVar[int | None] = None
+
     def __init__(self, size: int = 10):
         """Initialize an empty board of size.
 
@@ -56,6 +365,53 @@ class Board:
         self.size = size
         self.ships: list[Ship] = []
         self.guesses: set[Crd] = set()  # all shots made on this board
+        self.occupied = 0  # bitmask of cells covered by a ship
+        self.remaining = 0  # ship cells that have not been hit
+
+    @classmethod
+    def from_random_fleet(
+        cls: type[BoardT],
+        ships: Sequence[int],
+        size: int = 10,
+        rng: random.Random | None = None,
+    ) -> BoardT:
+        """Build a board with a uniformly random fleet.
+
+        See :func:`random_fleet` for the arguments.
+        """
+        board = cls(size)
+        for start, length, direction in random_fleet(ships, size, rng):
+            board.place_ship(start, length, direction)
+        return board
+
+    def _ship_positions(
+        self,
+        start: Crd,
+        length: int,
+        direction: Literal['horizontal', 'vertical'],
+    ) -> list[Crd] | None:
+        """Compute the cells covered by a ship.
+
+        Returns:
+            The positions of the ship, or None if it is out of bounds.
+        """
+        row, col = start
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return None
+        table = crd_table(self.size)
+        if direction == 'horizontal':
+            if col + length > self.size:
+                return None
+            start_index = row * self.size + col
+            return list(table[start_index : start_index + length])
+        elif direction == 'vertical':
+            if row + length > self.size:
+                return None
+            return [table[(row + i) * self.size + col] for i in range(length)]
+        else:
+            raise ValueError(
+                "Invalid direction, must be 'horizontal' or 'vertical'.",
+            )
 
     def place_ship(
         self,
@@ -73,29 +429,21 @@ class Board:
         Returns:
             The ship if placed successfully, or None if invalid placement.
         """
-        row, col = start
-        positions: list[Crd] = []
+        positions = self._ship_positions(start, length, direction)
+        if positions is None:
+            return None  # out of bounds
 
-        if direction == 'horizontal':
-            if col + length > self.size:
-                return None  # out of bounds
-            positions = [Crd(row, col + i) for i in range(length)]
-        elif direction == 'vertical':
-            if row + length > self.size:
-                return None  # out of bounds
-            positions = [Crd(row + i, col) for i in range(length)]
-        else:
-            raise ValueError(
-                "Invalid direction, must be 'horizontal' or 'vertical'.",
-            )
+        row, col = start
+        mask = placement_index(self.size, length).mask(row, col, direction)
+        if mask & self.occupied:
+            return None  # conflict
 
-        # check for overlaps with existing ships
-        for s in self.ships:
-            if set(positions) & set(s.positions):
-                return None  # conflict
+        return self._add_ship(Ship(positions), mask)
 
-        ship = Ship(positions)
+    def _add_ship(self, ship: Ship, mask: int) -> Ship:
         self.ships.append(ship)
+        self.occupied |= mask
+        self.remaining += ship.length
         return ship
 
     def receive_attack(self, pos: Crd) -> Literal['hit', 'miss', 'guessed']:
@@ -107,20 +455,187 @@ class Board:
         Returns:
             'hit', 'miss', or 'guessed'
         """
+        return self.resolve_attack(pos).result
+
+    def resolve_attack(self, pos: Crd) -> AttackResult:
+        """Mark an attack on the board.
+
+        Args:
+            pos: Coordinate of attack.
+
+        Returns:
+            The result of the attack, and the ship if the attack sunk it.
+        """
         if pos in self.guesses:
-            return 'guessed'
+            return AttackResult('guessed')
 
         self.guesses.add(pos)
 
         for ship in self.ships:
             if pos in ship.positions:
                 ship.register_hit(pos)
-                return 'hit'
-        return 'miss'
+                self.remaining -= 1
+                return AttackResult('hit', ship if ship.is_sunk else None)
+        return AttackResult('miss')
 
     def all_ships_sunk(self) -> bool:
         """Check if the board has remaining ships."""
-        return all(ship.is_sunk for ship in self.ships)
+        return self.remaining == 0
+
+    def fleet(self) -> list[Placement]:
+        """Placement of each ship on the board.
+
+        Raises:
+            ValueError: If a ship is not a straight line on the board.
+        """
+        return [self._placement(ship) for ship in self.ships]
+
+    def _placement(self, ship: Ship) -> Placement:
+        start = ship.positions[0] if ship.positions else Crd(-1, -1)
+        direction: Literal['horizontal', 'vertical'] = (
+            'vertical'
+            if ship.length > 1 and ship.positions[1][0] != start[0]
+            else 'horizontal'
+        )
+        positions = self._ship_positions(start, ship.length, direction)
+        if positions is None or tuple(positions) != ship.positions:
+            raise ValueError(
+                f'Ship at {ship.positions} is not a straight line on the '
+                'board.',
+            )
+        return Placement(start, ship.length, direction)
+
+    def _encode_ship(self, ship: Ship) -> tuple[int, int]:
+        (row, col), length, direction = self._placement(ship)
+        if length >= _VERTICAL:
+            raise ValueError(f'Can not encode ship of length {length}.')
+        vertical = _VERTICAL if direction == 'vertical' else 0
+        return row * self.size + col, length | vertical
+
+    def _guess_state(self) -> tuple[int, list[Crd]]:
+        """Bitmask of the guesses on the board and the guesses off it."""
+        mask = 0
+        stray = []
+        for row, col in self.guesses:
+            if 0 <= row < self.size and 0 <= col < self.size:
+                mask |= 1 << (row * self.size + col)
+            else:
+                stray.append(Crd(row, col))
+        return mask, sorted(stray)
+
+    def _load_guesses(self, mask: int) -> None:
+        """Attack every cell of the board set in mask."""
+        table = crd_table(self.size)
+        new = {table[cell] for cell in _mask_cells(mask)}
+        new -= self.guesses
+        self.guesses |= new
+        for ship in self.ships:
+            for offset, pos in enumerate(ship.positions):
+                if pos in new:
+                    ship.register_hit_index(offset)
+                    self.remaining -= 1
+
+    def to_bytes(self) -> bytes:
+        """Encode the board in a compact binary format.
+
+        The encoding holds the size, the start cell, length and direction
+        of each ship, and a bitmask of the guessed cells, so a 10x10 board
+        with five ships takes 30 bytes. Guesses outside of the board are
+        appended as pairs of 32-bit integers. Hits are not stored since
+        they follow from the ships and the guesses. Pickle only sends this
+        encoding when :attr:`wire_codec` is set, since earlier releases can
+        not decode it.
+
+        Raises:
+            ValueError: If the board is larger than 255 cells across, or a
+                ship is not a straight line on the board.
+        """
+        if self.size > _MAX_ENCODED or len(self.ships) > _MAX_ENCODED:
+            raise ValueError('Board is too large to encode.')
+        parts = [_BOARD.pack(self.size, len(self.ships))]
+        parts.extend(
+            _SHIP.pack(*self._encode_ship(ship)) for ship in self.ships
+        )
+        mask, stray = self._guess_state()
+        parts.append(mask.to_bytes((self.size * self.size + 7) // 8, 'little'))
+        parts.extend(_CRD.pack(*pos) for pos in stray)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls: type[BoardT], data: bytes) -> BoardT:
+        """Decode a board encoded with :meth:`to_bytes`.
+
+        Raises:
+            ValueError: If data is not a valid encoding of a board.
+        """
+        try:
+            size, n_ships = _BOARD.unpack_from(data)
+            board = cls(size)
+            table = crd_table(size)
+            offset = _BOARD.size
+            for _ in range(n_ships):
+                cell, code = _SHIP.unpack_from(data, offset)
+                offset += _SHIP.size
+                direction: Literal['horizontal', 'vertical'] = (
+                    'vertical' if code & _VERTICAL else 'horizontal'
+                )
+                if (
+                    cell >= len(table)
+                    or board.place_ship(
+                        table[cell],
+                        code & ~_VERTICAL,
+                        direction,
+                    )
+                    is None
+                ):
+                    raise ValueError('Invalid ship placement.')
+
+            n_bytes = (size * size + 7) // 8
+            mask = int.from_bytes(data[offset : offset + n_bytes], 'little')
+            offset += n_bytes
+            if offset > len(data) or mask >> len(table):
+                raise ValueError('Invalid guess mask.')
+            board._load_guesses(mask)
+            for pos in _CRD.iter_unpack(data[offset:]):
+                board.resolve_attack(Crd(*pos))
+        except struct.error as e:
+            raise ValueError(f'Invalid board encoding: {e}') from e
+        return board
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The attributes of boards before the class had slots, so that
+        # earlier releases can unpickle boards sent by this one.
+        return {
+            'size': self.size,
+            'ships': self.ships,
+            'guesses': set(self.guesses),
+        }
+
+    def __setstate__(self, state: Any) -> None:
+        # Boards pickled before the class had slots carry their __dict__,
+        # without the occupied and remaining cells.
+        if isinstance(state, tuple):
+            _, state = state
+        self.size = state['size']
+        self.ships = state['ships']
+        self.guesses = set(state['guesses'])
+        if 'occupied' in state:
+            self.occupied = state['occupied']
+            self.remaining = state['remaining']
+            return
+        self.occupied = 0
+        self.remaining = 0
+        for ship in self.ships:
+            for row, col in ship.positions:
+                if 0 <= row < self.size and 0 <= col < self.size:
+                    self.occupied |= 1 << (row * self.size + col)
+            self.remaining += ship.length - len(ship.hits)
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> str | tuple[Any, ...]:
+        # Academy pickles action arguments and results, so boards are sent
+        # with the compact encoding once wire_codec is set. Boards that can
+        # not be encoded fall back to pickling their attributes.
+        return _reduce_wire(self) or super().__reduce_ex__(protocol)
 
     def __repr__(self) -> str:
         grid = [
@@ -153,30 +668,269 @@ class Board:
         return result
 
 
+class BitBoard(Board):
+    """Battleship game board backed by integer bitmasks.
+
+    Drop-in replacement for :class:`Board` intended for engines that play
+    many games at once. Cell ``(row, col)`` maps to bit ``row * size + col``
+    of the occupancy and guess masks, and a flat cell to ship index table
+    resolves hits, so attacks and sunk checks do not scan the ships.
+    A bitmask board is unpickled as a :class:`Board`.
+    """
+
+    __slots__ = (
+        '_offsets',
+        '_ship_of',
+        '_stray',
+        'guessed',
+        'ship_masks',
+    )
+
+    _NO_SHIP: ClassVar[int] = 0xFFFF
+
+    def __init__(self, size: int = 10):
+        """Initialize an empty board of size.
+
+        Args:
+            size: The number of slots in one dimension of board.
+        """
+        self.size = size
+        self.ships: list[Ship] = []
+        self.ship_masks: list[int] = []
+        self.occupied = 0  # bitmask of cells covered by a ship
+        self.guessed = 0  # bitmask of cells that have been attacked
+        self.remaining = 0  # ship cells that have not been hit
+        # ship index of each cell and the offset of the cell in that ship
+        self._ship_of = array('H', [self._NO_SHIP]) * (size * size)
+        self._offsets = array('H', [0]) * (size * size)
+        self._stray: set[Crd] | None = None  # guesses outside of the board
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> str | tuple[Any, ...]:
+        # Pickled as a plain Board, which clients that do not know about
+        # BitBoard can read, rather than with the lookup tables, which are
+        # larger and follow from the ships. BitBoard.from_board rebuilds
+        # them on the receiving side if needed.
+        return _reduce_wire(self) or (
+            Board,
+            (self.size,),
+            Board.__getstate__(self),
+        )
+
+    @classmethod
+    def from_board(cls, board: Board) -> BitBoard:
+        """Build a bitmask board with the same ships and guesses as board.
+
+        Raises:
+            ValueError: If a ship is off the board or overlaps another ship.
+        """
+        if isinstance(board, cls):
+            return board
+        new = cls(board.size)
+        for ship in board.ships:
+            mask = new._mask(ship.positions)
+            if mask is None or mask & new.occupied:
+                raise ValueError(f'Invalid ship placement: {ship.positions}.')
+            new._add_ship(ship, mask)
+        for pos in board.guesses:
+            new.receive_attack(pos)
+        return new
+
+    def _index(self, pos: Crd) -> int | None:
+        row, col = pos
+        if 0 <= row < self.size and 0 <= col < self.size:
+            return row * self.size + col
+        return None
+
+    def _mask(self, positions: Sequence[Crd]) -> int | None:
+        mask = 0
+        for pos in positions:
+            index = self._index(pos)
+            if index is None:
+                return None
+            mask |= 1 << index
+        return mask
+
+    def _add_ship(self, ship: Ship, mask: int) -> Ship:
+        index = len(self.ships)
+        if index >= self._NO_SHIP:
+            raise ValueError('Too many ships on the board.')
+        for offset, pos in enumerate(ship.positions):
+            cell = pos[0] * self.size + pos[1]
+            self._ship_of[cell] = index
+            self._offsets[cell] = offset
+        self.ship_masks.append(mask)
+        return super()._add_ship(ship, mask)
+
+    def _guess_state(self) -> tuple[int, list[Crd]]:
+        return self.guessed, sorted(self._stray or ())
+
+    def _load_guesses(self, mask: int) -> None:
+        mask &= ~self.guessed
+        self.guessed |= mask
+        hits = mask & self.occupied
+        self.remaining -= hits.bit_count()
+        for ship, ship_mask in zip(self.ships, self.ship_masks):
+            if hits & ship_mask:
+                for offset, pos in enumerate(ship.positions):
+                    if hits >> (pos[0] * self.size + pos[1]) & 1:
+                        ship.register_hit_index(offset)
+
+    @property
+    def guesses(self) -> frozenset[Crd]:  # type: ignore[override]
+        """All shots made on this board.
+
+        A read-only snapshot, use :meth:`receive_attack` to add a shot.
+        """
+        table = crd_table(self.size)
+        return frozenset(
+            (
+                *(self._stray or ()),
+                *(table[cell] for cell in _mask_cells(self.guessed)),
+            ),
+        )
+
+    def resolve_attack(self, pos: Crd) -> AttackResult:
+        """Mark an attack on the board.
+
+        Args:
+            pos: Coordinate of attack.
+
+        Returns:
+            The result of the attack, and the ship if the attack sunk it.
+        """
+        index = self._index(pos)
+        if index is None:
+            if self._stray is None:
+                self._stray = set()
+            elif pos in self._stray:
+                return AttackResult('guessed')
+            self._stray.add(pos)
+            return AttackResult('miss')
+
+        bit = 1 << index
+        if self.guessed & bit:
+            return AttackResult('guessed')
+        self.guessed |= bit
+
+        if self._ship_of[index] == self._NO_SHIP:
+            return AttackResult('miss')
+        ship = self.ships[self._ship_of[index]]
+        ship.register_hit_index(self._offsets[index])
+        self.remaining -= 1
+        return AttackResult('hit', ship if ship.is_sunk else None)
+
+
 class Game:
-    """Structure for battleship game."""
+    """Structure for battleship game.
 
-    def __init__(self, player_1: Board, player_2: Board):
+    The version of a game counts the moves played. A game created with
+    record_events keeps its moves in order as events, so that the moves
+    after a version can be sent to another copy of the game. Other games,
+    including decoded copies, do not keep them, which saves an event per
+    move on every game that is only played.
+    """
+
+    __slots__ = ('boards', 'current_turn', 'events', 'version', 'winner')
+
+    # version of the compact encoding sent when games are pickled, as for
+    # Board.wire_codec
+    wire_codec: ClassVar[int | None] = None
+
+    def __init__(
+        self,
+        player_1: Board,
+        player_2: Board,
+        *,
+        record_events: bool = False,
+    ):
         """Initialize a game.
 
         Args:
             player_1: The board of the first player.
             player_2: The board of the second player.
+            record_events: Keep the moves played as events.
         """
         self.boards = [player_1, player_2]  # 2 boards, index 0 and 1
         self.current_turn = 0  # 0 or 1
+        self.winner = -1
+        self.version = 0
+        # moves played since the game was created, or None if not recorded
+        self.events: list[MoveEvent] | None = [] if record_events else None
+        if self.boards[0].all_ships_sunk():
+            self.winner = 1
+        elif self.boards[1].all_ships_sunk():
+            self.winner = 0
 
-    def attack(self, player: int, pos: Crd) -> str:
+    def attack(self, player: int, pos: Crd) -> AttackResult:
         """Send attack to opposing player.
 
-        player: Index of attacking player (0 or 1).
-        pos: Coordinate to attack.
+        Args:
+            player: Index of attacking player (0 or 1).
+            pos: Coordinate to attack.
+
+        Returns:
+            The result of the attack, and the ship if the attack sunk it.
         """
         opponent = 1 - player
-        result = self.boards[opponent].receive_attack(pos)
-        if result in ('hit', 'miss'):
+        attack = self.boards[opponent].resolve_attack(pos)
+        if attack.result in ('hit', 'miss'):
             self.current_turn = opponent  # swap turn on valid move
-        return result
+        if (
+            attack.sunk is not None
+            and self.winner < 0
+            and self.boards[opponent].all_ships_sunk()
+        ):
+            self.winner = player
+        self.version += 1
+        if self.events is not None:
+            self.events.append(
+                MoveEvent(
+                    self.version,
+                    player,
+                    pos,
+                    attack.result,
+                    attack.sunk is not None,
+                ),
+            )
+        return attack
+
+    def events_since(self, version: int) -> list[MoveEvent] | None:
+        """The moves played after version.
+
+        Returns:
+            The events in order, or None if the game does not record events
+            or moves after version were played before it was created.
+        """
+        if self.events is None:
+            return None
+        first = self.version - len(self.events)
+        if version < first:
+            return None
+        return self.events[version - first :]
+
+    def apply(self, events: Iterable[MoveEvent]) -> None:
+        """Play moves received from another copy of the game.
+
+        Events at or before the version of this game are skipped.
+
+        Raises:
+            ValueError: If an event does not follow the version of this
+                game, or its move has a different result on this game.
+        """
+        for event in events:
+            if event.version <= self.version:
+                continue
+            if event.version != self.version + 1:
+                raise ValueError(
+                    f'Event at version {event.version} does not follow '
+                    f'version {self.version}.',
+                )
+            attack = self.attack(event.player, event.pos)
+            if attack.result != event.result:
+                raise ValueError(
+                    f'Move at version {event.version} was a {event.result}, '
+                    f'but is a {attack.result} on this game.',
+                )
 
     def check_winner(self) -> int:
         """Check if there is a winner on the board.
@@ -186,11 +940,89 @@ class Game:
           - 1 if player 1 wins
           - -1 if no winner yet
         """
-        if self.boards[0].all_ships_sunk():
-            return 1
-        elif self.boards[1].all_ships_sunk():
-            return 0
-        return -1
+        return self.winner
+
+    def to_bytes(self) -> bytes:
+        """Encode the game in a compact binary format.
+
+        The encoding holds the turn, the winner, the version and both boards
+        as encoded by :meth:`Board.to_bytes`. The events are not encoded.
+
+        Raises:
+            ValueError: If a board can not be encoded.
+        """
+        board_0 = self.boards[0].to_bytes()
+        flags = sum(
+            1 << i
+            for i, board in enumerate(self.boards)
+            if isinstance(board, BitBoard)
+        )
+        header = _GAME.pack(
+            self.current_turn,
+            self.winner,
+            flags,
+            len(board_0),
+            self.version,
+        )
+        return b''.join((header, board_0, self.boards[1].to_bytes()))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Game:
+        """Decode a game encoded with :meth:`to_bytes`.
+
+        Each board is decoded as a :class:`BitBoard` if it was one when
+        encoded, and as a :class:`Board` otherwise.
+
+        Raises:
+            ValueError: If data is not a valid encoding of a game.
+        """
+        try:
+            turn, winner, flags, length, version = _GAME.unpack_from(data)
+        except struct.error as e:
+            raise ValueError(f'Invalid game encoding: {e}') from e
+        start = _GAME.size
+        boards = [
+            (BitBoard if flags >> i & 1 else Board).from_bytes(part)
+            for i, part in enumerate(
+                (data[start : start + length], data[start + length :]),
+            )
+        ]
+        game = cls(boards[0], boards[1])
+        game.current_turn = turn
+        game.winner = winner
+        game.version = version
+        return game
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The attributes of games before the class had slots, with the
+        # winner and the version. The events are not sent, as for
+        # to_bytes, since earlier releases do not have MoveEvent.
+        return {
+            'boards': self.boards,
+            'current_turn': self.current_turn,
+            'winner': self.winner,
+            'version': self.version,
+        }
+
+    def __setstate__(self, state: Any) -> None:
+        # Games pickled before the class had slots carry their __dict__,
+        # with only the boards and the turn.
+        if isinstance(state, tuple):
+            _, state = state
+        self.boards = state['boards']
+        self.current_turn = state['current_turn']
+        self.version = state.get('version', 0)
+        self.events = None
+        self.winner = state.get('winner', -1)
+        if 'winner' not in state:
+            if self.boards[0].all_ships_sunk():
+                self.winner = 1
+            elif self.boards[1].all_ships_sunk():
+                self.winner = 0
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> str | tuple[Any, ...]:
+        # Send the compact encoding once wire_codec is set, as for boards.
+        return _reduce_wire(self) or super().__reduce_ex__(protocol)
 
     def __repr__(self) -> str:
         """Show both players' boards side by side with labels."""
@@ -207,3 +1039,199 @@ class Game:
 
         result += f'\nCurrent turn: Player {self.current_turn}'
         return result
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one step of a :class:`BatchGame`.
+
+    Each field is indexed by game. Finished games report False for every
+    outcome and keep their winner.
+    """
+
+    hit: npt.NDArray[np.bool_]
+    miss: npt.NDArray[np.bool_]
+    guessed: npt.NDArray[np.bool_]
+    sunk: npt.NDArray[np.bool_]
+    winner: npt.NDArray[np.int8]
+
+
+class BatchGame:
+    """Many battleship games played in lockstep with NumPy.
+
+    Game ``i`` is played between ``boards_0[i]`` and ``boards_1[i]``. The
+    boards are stacked into arrays indexed by ``[game, player]`` so that
+    both boards of a game are adjacent in memory, and every call to
+    :meth:`attack` applies one move for the player whose turn it is in each
+    game.
+
+    Each cell of :attr:`state` holds the index of the ship on it, or
+    :attr:`WATER`, with the :attr:`ATTACKED` bit set once it has been shot
+    at, so a move needs a single read and write of the board.
+
+    Args:
+        boards_0: The boards of the first player of each game.
+        boards_1: The boards of the second player of each game.
+
+    Raises:
+        ValueError: If the boards do not describe valid, equally sized
+            games.
+    """
+
+    WATER: ClassVar[int] = 0x7F
+    ATTACKED: ClassVar[int] = 0x80
+
+    def __init__(self, boards_0: Sequence[Board], boards_1: Sequence[Board]):
+        if len(boards_0) != len(boards_1) or len(boards_0) == 0:
+            raise ValueError('Expected the same, non-zero number of boards.')
+        sizes = {board.size for board in [*boards_0, *boards_1]}
+        if len(sizes) != 1:
+            raise ValueError('All boards must have the same size.')
+
+        self.size = sizes.pop()
+        self.n_games = len(boards_0)
+        n_ships = [len(board.ships) for board in [*boards_0, *boards_1]]
+        self.max_ships = max(1, *n_ships)
+        if self.max_ships >= self.WATER:
+            raise ValueError('Too many ships on a board.')
+
+        shape = (self.n_games, 2)
+        self.state = np.full(
+            (*shape, self.size * self.size),
+            self.WATER,
+            dtype=np.uint8,
+        )
+        # unhit cells of each ship
+        self.ship_cells = np.zeros((*shape, self.max_ships), dtype=np.int16)
+        for game, boards in enumerate(zip(boards_0, boards_1)):
+            for player, board in enumerate(boards):
+                self._load_board(game, player, board)
+        # unhit cells of each board
+        self.remaining = self.ship_cells.sum(axis=2, dtype=np.int32)
+
+        self.current_turn = np.zeros(self.n_games, dtype=np.int8)
+        self.winner = np.full(self.n_games, -1, dtype=np.int8)
+        self.winner[self.remaining[:, 1] == 0] = 0
+        self.winner[self.remaining[:, 0] == 0] = 1
+
+        # flat index of the first cell of the board under attack in each
+        # game, and the sum of the indices of both boards so that a turn
+        # swap is one subtraction
+        cells = self.size * self.size
+        games = np.arange(self.n_games, dtype=np.int64)
+        self._offset = (2 * games + 1) * cells
+        self._pair_sum = (4 * games + 1) * cells
+        self._state_flat = self.state.reshape(-1)
+        self._ship_cells_flat = self.ship_cells.reshape(-1)
+        self._remaining_flat = self.remaining.reshape(-1)
+
+    def _load_board(self, game: int, player: int, board: Board) -> None:
+        state = self.state[game, player]
+        for s, ship in enumerate(board.ships):
+            for row, col in ship.positions:
+                if not (0 <= row < self.size and 0 <= col < self.size):
+                    raise ValueError(f'Invalid ship placement: {ship}.')
+                cell = row * self.size + col
+                if state[cell] != self.WATER:
+                    raise ValueError(f'Invalid ship placement: {ship}.')
+                state[cell] = s
+            self.ship_cells[game, player, s] = ship.length
+
+        for row, col in board.guesses:
+            if 0 <= row < self.size and 0 <= col < self.size:
+                cell = row * self.size + col
+                if state[cell] < self.WATER:
+                    self.ship_cells[game, player, state[cell]] -= 1
+                state[cell] |= self.ATTACKED
+
+    @property
+    def guessed(self) -> npt.NDArray[np.bool_]:
+        """Cells of each board that have been attacked."""
+        return self.state >= self.ATTACKED
+
+    def attack(self, moves: npt.ArrayLike) -> BatchResult:
+        """Attack the opponent of the current player in every game.
+
+        Args:
+            moves: Array of shape ``(n_games, 2)`` with the ``(row, col)``
+                coordinate attacked in each game. Moves for finished games
+                are ignored.
+
+        Returns:
+            The result of the attack in each game. As with
+            :meth:`Game.attack`, the turn only passes to the opponent on a
+            hit or a miss.
+
+        Raises:
+            ValueError: If moves has the wrong shape or is off the board.
+        """
+        moves = np.asarray(moves, dtype=np.int64)
+        if moves.shape != (self.n_games, 2):
+            raise ValueError(
+                f'Expected moves of shape ({self.n_games}, 2), '
+                f'got {moves.shape}.',
+            )
+        if moves.min() < 0 or moves.max() >= self.size:
+            raise ValueError('Attack is outside of the board.')
+        return self.attack_cells(moves[:, 0] * self.size + moves[:, 1])
+
+    def attack_cells(self, cells: npt.ArrayLike) -> BatchResult:
+        """Attack the opponent of the current player in every game.
+
+        Same as :meth:`attack` but each move is given as the flat cell
+        index ``row * size + col``, which avoids building coordinate pairs
+        when moves come from a flattened probability grid.
+
+        Raises:
+            ValueError: If cells has the wrong shape or is off the board.
+        """
+        cells = np.asarray(cells)
+        if cells.shape != (self.n_games,) or cells.dtype.kind not in 'iu':
+            raise ValueError(
+                f'Expected integer cells of shape ({self.n_games},), '
+                f'got {cells.dtype} of shape {cells.shape}.',
+            )
+        # unsigned cells can not be negative, which saves a pass
+        if (cells.dtype.kind == 'i' and cells.min() < 0) or cells.max() >= (
+            self.size * self.size
+        ):
+            raise ValueError('Attack is outside of the board.')
+
+        cell = self._offset + cells
+        value = self._state_flat[cell]
+        active = self.winner < 0
+        # attacked cells are at least ATTACKED, so a ship cell is fresh
+        hit = value < self.WATER
+        hit &= active
+        fresh = value < self.ATTACKED
+        fresh &= active
+        miss = fresh ^ hit
+        guessed = active ^ fresh
+        self._state_flat[cell] = value | active.view(np.uint8) * self.ATTACKED
+
+        # only the games with a hit update the ships, which is a fraction of
+        # the games on most moves
+        games = np.flatnonzero(hit)
+        target = self._offset[games] // (self.size * self.size)
+        slot = target * self.max_ships + value[games]
+        ship_cells = self._ship_cells_flat[slot] - 1
+        self._ship_cells_flat[slot] = ship_cells
+        remaining = self._remaining_flat[target] - 1
+        self._remaining_flat[target] = remaining
+        sunk = np.zeros(self.n_games, dtype=np.bool_)
+        sunk[games[ship_cells == 0]] = True
+        won = games[remaining == 0]
+        self.winner[won] = self.current_turn[won]
+
+        self.current_turn ^= fresh.view(np.int8)
+        np.subtract(
+            self._pair_sum,
+            self._offset,
+            out=self._offset,
+            where=fresh,
+        )
+
+        return BatchResult(hit, miss, guessed, sunk, self.winner.copy())
+
+    def check_winner(self) -> npt.NDArray[np.int8]:
+        """Return the winner of each game, or -1 if it is still going."""
+        return self.winner.copy()
@@ -0,0 +1,72 @@
+"""Chess clock time control of the players of a game.
+
+Instead of a fixed timeout on every call, each player of a game can be
+given a :class:`TimeBank`: a budget of seconds that every call to the
+player spends, topped up by an increment after each of its moves. A player
+may take longer over a hard move as long as it saves the time elsewhere,
+and forfeits once its bank is empty.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable
+from typing import TypeVar
+
+T = TypeVar('T')
+
+
+class ClockExpiredError(TimeoutError):
+    """A player has used all of the time in its bank."""
+
+
+async def _wait_for(call: Awaitable[T], seconds: float) -> T:
+    return await asyncio.wait_for(call, seconds)
+
+
+if sys.version_info >= (3, 11):
+
+    async def _timeout(call: Awaitable[T], seconds: float) -> T:
+        # cancels the call in place, without wrapping it in another task
+        async with asyncio.timeout(seconds):
+            return await call
+
+else:
+    _timeout = _wait_for
+
+
+class TimeBank:
+    """Seconds a player may still spend on the calls of a game.
+
+    Args:
+        budget: Seconds in the bank at the start of the game.
+        increment: Seconds added to the bank after each move.
+    """
+
+    def __init__(self, budget: float, increment: float = 0.0) -> None:
+        self.remaining = budget
+        self.increment = increment
+
+    async def spend(self, call: Awaitable[T]) -> T:
+        """Await a call to the player and charge its duration to the bank.
+
+        Raises:
+            ClockExpiredError: If the bank runs out before the call
+                returns, which cancels the call.
+        """
+        start = time.perf_counter()
+        try:
+            return await _timeout(call, self.remaining)
+        except asyncio.TimeoutError:
+            # wait_for raises asyncio.TimeoutError, which is only the
+            # builtin TimeoutError from Python 3.11
+            raise ClockExpiredError('The time bank ran out.') from None
+        finally:
+            elapsed = time.perf_counter() - start
+            self.remaining = max(self.remaining - elapsed, 0.0)
+
+    def add_increment(self) -> None:
+        """Top up the bank after a move."""
+        self.remaining += self.increment
@@ -1,20 +1,54 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
+import os
+import time
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any
 from typing import ClassVar
+from typing import NamedTuple
 
 from academy.agent import action
 from academy.agent import Agent
 from academy.agent import loop
 from academy.handle import Handle
 
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Crd
 from academy_tutorial.battleship import Game
+from academy_tutorial.battleship import MoveEvent
+from academy_tutorial.latency import LatencyHistogram
+from academy_tutorial.latency import LatencyStats
 from academy_tutorial.player import BattleshipPlayer
+from academy_tutorial.player import check_game_limit
+from academy_tutorial.player import game_kwargs
+from academy_tutorial.player import TurnClient
+from academy_tutorial.referee import DEFAULT_MAX_REPEATS
+from academy_tutorial.referee import IllegalMoveError
+from academy_tutorial.referee import Referee
+from academy_tutorial.replay import GameRecorder
+from academy_tutorial.replay import ReplayWriter
+from academy_tutorial.subscription import GameSubscriber
+from academy_tutorial.subscription import Subscription
 
 logger = logging.getLogger()
 
 
+class GameDelta(NamedTuple):
+    """Changes to the current game of a :class:`Coordinator`.
+
+    Apply the events to the snapshot of the game with :meth:`Game.apply`.
+    """
+
+    game: int  # number of the game, counting from zero
+    version: int  # version of the game after the events
+    events: list[MoveEvent]
+    snapshot: Game | None  # the whole game, when the caller needs it
+
+
 class Coordinator(Agent):
     """Simple coordinator of battleship games.
 
@@ -24,73 +58,462 @@ class Coordinator(Agent):
         size: Size of board.
         ships: The ships that each player uses. Defaults to
             self._default_ships
+        replay_path: Append a record of every game to the replay log at
+            this path.
+        concurrent_games: Number of games played between the players at
+            once. When it is more than one, every game gets an id that is
+            passed to the player actions, so the players must keep
+            separate state for each game.
+        max_moves: Number of moves after which a game ends without a
+            winner. Defaults to the cap of :class:`Referee`.
+        max_repeats: Number of repeated shots a player may make in a game
+            before it forfeits. A shot outside of the board always
+            forfeits.
+
+    Raises:
+        ValueError: If concurrent_games is more than the games whose state
+            a :class:`MultiplexedPlayer` keeps.
     """
 
     _default_ships: ClassVar[list[int]] = [5, 5, 4, 3, 2]
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         player_0: Handle[BattleshipPlayer],
         player_1: Handle[BattleshipPlayer],
         *,
         size: int = 10,
         ships: list[int] | None = None,
+        replay_path: str | os.PathLike[str] | None = None,
+        concurrent_games: int = 1,
+        max_moves: int | None = None,
+        max_repeats: int = DEFAULT_MAX_REPEATS,
     ) -> None:
+        check_game_limit(concurrent_games)
         super().__init__()
         self.player_0 = player_0
         self.player_1 = player_1
         self.game_state: Game | None = None
+        self.game_number = -1  # number of the current game
         self.ships = ships or self._default_ships
         self.stats = [0, 0]
+        self.replay_path = replay_path
+        self._replay: ReplayWriter | None = None
+        self.concurrent_games = concurrent_games
+        self._game_ids = itertools.count()
+        self.subscriptions: dict[int, Subscription] = {}
+        self._subscription_ids = itertools.count()
+        self.latency = LatencyStats()
+        self.max_moves = max_moves
+        self.max_repeats = max_repeats
+        # durations of the games that ended by an illegal move or the cap
+        self.stalls = LatencyHistogram()
+
+    async def agent_on_shutdown(self) -> None:
+        """Close the replay log and stop the subscriptions."""
+        if self._replay is not None:
+            self._replay.close()
+            self._replay = None
+        for subscription in self.subscriptions.values():
+            await subscription.stop()
+        self.subscriptions.clear()
+
+    def _publish(self, game: int, update: MoveEvent | Game) -> None:
+        for subscription_id, subscription in list(self.subscriptions.items()):
+            if subscription.active:
+                subscription.publish(game, update)
+            else:
+                del self.subscriptions[subscription_id]
 
-    async def game(self, shutdown: asyncio.Event) -> int:
-        """Play a single game between the players."""
+    def _record(self, recorder: GameRecorder, winner: int) -> None:
+        record = recorder.finish(winner)
+        if self.replay_path is None or record is None:
+            return
+        if self._replay is None:
+            self._replay = ReplayWriter(self.replay_path)
+        self._replay.write(record)
+
+    async def game(
+        self,
+        shutdown: asyncio.Event,
+        game_id: int | None = None,
+    ) -> int:
+        """Play a single game between the players.
+
+        Args:
+            shutdown: Event that stops the game.
+            game_id: Id of the game passed to the players, if any.
+        """
+        # the moves are only collected when there is a log to write them to
+        recorder = None if self.replay_path is None else GameRecorder()
+        winner = await self._game(shutdown, recorder, game_id)
+        if recorder is not None:
+            self._record(recorder, winner)
+        return winner
+
+    async def _start(self, game_id: int | None) -> Game | int:
+        """Start a game, or return the winner if a board is invalid."""
+        kwargs = game_kwargs(game_id)
+        player_0_board, player_1_board = await asyncio.gather(
+            self.latency.time(
+                'player_0',
+                'new_game',
+                self.player_0.new_game(self.ships, **kwargs),
+            ),
+            self.latency.time(
+                'player_1',
+                'new_game',
+                self.player_1.new_game(self.ships, **kwargs),
+            ),
+        )
+        boards = []
+        for i, board in enumerate((player_0_board, player_1_board)):
+            try:
+                # raises for a ship that is not a straight line, which the
+                # moves are played on but can not be recorded
+                board.fleet()
+                boards.append(BitBoard.from_board(board))
+            except ValueError as e:
+                logger.warning(
+                    f'Player {i} returned an invalid board: {e} '
+                    f'Player {1 - i} wins.',
+                )
+                return 1 - i
+        # the events of the game are served by get_game_delta
+        return Game(boards[0], boards[1], record_events=True)
+
+    async def _game(
+        self,
+        shutdown: asyncio.Event,
+        recorder: GameRecorder | None,
+        game_id: int | None,
+    ) -> int:
         logger.info('Initializing game.')
-        player_0_board = await self.player_0.new_game(self.ships)
-        player_1_board = await self.player_1.new_game(self.ships)
-        self.game_state = Game(player_0_board, player_1_board)
+        started = time.perf_counter()
+        game = await self._start(game_id)
+        if isinstance(game, int):
+            return game
+        # BitBoards pickle as plain Boards, so clients of earlier releases
+        # can still read the state returned by get_game_state
+        self.game_state = game
+        self.game_number += 1
+        number = self.game_number
+        self._publish(number, game)
 
         logger.info('Starting game.')
-        assert self.game_state is not None
+        if recorder is not None:
+            recorder.start(game)
+        referee = Referee(
+            game.boards[0].size,
+            self.max_moves,
+            self.max_repeats,
+        )
 
-        while not shutdown.is_set():
-            attack = await self.player_0.get_move()
-            logger.info(f'Recieved move {attack}')
-            result = self.game_state.attack(0, attack)
-            await self.player_0.notify_result(attack, result)
-            await self.player_1.notify_move(attack)
-            if self.game_state.check_winner() >= 0:
-                return self.game_state.check_winner()
-
-            attack = await self.player_1.get_move()
-            logger.info(f'Recieved move {attack}')
-            result = self.game_state.attack(1, attack)
-            await self.player_1.notify_result(attack, result)
-            await self.player_0.notify_move(attack)
-            if self.game_state.check_winner() >= 0:
-                return self.game_state.check_winner()
+        turns = (
+            TurnClient(
+                self.player_0,
+                game_id=game_id,
+                latency=self.latency,
+                name='player_0',
+            ),
+            TurnClient(
+                self.player_1,
+                game_id=game_id,
+                latency=self.latency,
+                name='player_1',
+            ),
+        )
+        last_move: Crd | None = None
+        mover = 0
+        try:
+            while not shutdown.is_set() and not referee.exhausted:
+                start = time.perf_counter()
+                attack = await turns[mover].take_turn(last_move)
+                latency = time.perf_counter() - start
+                logger.info(f'Recieved move {attack}')
+                try:
+                    attack = referee.check_move(mover, attack)
+                    outcome = game.attack(mover, attack)
+                    if recorder is not None:
+                        recorder.move(mover, attack, outcome, latency)
+                    assert game.events is not None
+                    self._publish(number, game.events[-1])
+                    referee.check_result(mover, outcome.result)
+                except IllegalMoveError as e:
+                    logger.warning(f'{e} Player {1 - mover} wins.')
+                    self.stalls.record(time.perf_counter() - started)
+                    return 1 - mover
+                turns[mover].notify_result((attack, outcome.result))
+                last_move = attack
+                winner = game.check_winner()
+                if winner >= 0:
+                    await turns[mover].finish()
+                    return winner
+                mover = 1 - mover
+        finally:
+            for turn in turns:
+                turn.cancel()
 
+        if referee.exhausted:
+            logger.warning(
+                f'Game ended after {referee.moves} moves without a winner.',
+            )
+            self.stalls.record(time.perf_counter() - started)
         return -1
 
     @loop
     async def play_games(self, shutdown: asyncio.Event) -> None:
-        """Play a games until the agent is shutdown."""
+        """Play games until the agent is shutdown.
+
+        Runs concurrent_games games at once, each starting a new game as
+        soon as it finishes.
+        """
+        await asyncio.gather(
+            *(
+                self._play_games(shutdown)
+                for _ in range(self.concurrent_games)
+            ),
+        )
+
+    async def _play_games(self, shutdown: asyncio.Event) -> None:
         while not shutdown.is_set():
-            winner = await self.game(shutdown)
+            game_id = (
+                next(self._game_ids) if self.concurrent_games > 1 else None
+            )
+            winner = await self.game(shutdown, game_id)
 
             if winner >= 0:
                 self.stats[winner] += 1
-            else:
+            elif shutdown.is_set():
                 break
 
             await asyncio.sleep(0.0)
 
     @action
     async def get_game_state(self) -> Game | None:
-        """Return the state of the current game being played."""
+        """Return the state of the most recently started game.
+
+        Use :meth:`get_game_delta` to follow a game as it is played.
+        """
         return self.game_state
 
+    @action
+    async def get_game_delta(
+        self,
+        since_version: int = 0,
+        game: int = -1,
+    ) -> GameDelta | None:
+        """Return the moves of the current game after since_version.
+
+        Polling with the game and version of the previous delta costs
+        one event per new move. A snapshot of the game is only sent when
+        a new game has started since.
+
+        Args:
+            since_version: Version of the game known to the caller.
+            game: Number of the game known to the caller, or -1 for none.
+
+        Returns:
+            The delta, or None if no game has started yet.
+        """
+        state = self.game_state
+        if state is None:
+            return None
+        events = state.events_since(since_version)
+        if game != self.game_number or events is None:
+            return GameDelta(self.game_number, state.version, [], state)
+        return GameDelta(self.game_number, state.version, events, None)
+
+    @action
+    async def subscribe(
+        self,
+        subscriber: Handle[GameSubscriber],
+        window: float = 0.1,
+        max_updates: int = 1024,
+    ) -> int:
+        """Push the moves of every game from now on to subscriber.
+
+        Updates are sent in batches to the ``receive_events`` action of
+        the subscriber, one batch at a time. The games never wait for a
+        subscriber: if more than max_updates are waiting to be sent, the
+        oldest are dropped and the next batch counts them.
+
+        Args:
+            subscriber: Handle to the subscriber.
+            window: Seconds over which updates are collected into a batch.
+            max_updates: Number of updates waiting to be sent to the
+                subscriber before the oldest are dropped.
+
+        Returns:
+            Id of the subscription, to pass to :meth:`unsubscribe`.
+        """
+        subscription = Subscription(subscriber, window, max_updates)
+        subscription_id = next(self._subscription_ids)
+        self.subscriptions[subscription_id] = subscription
+        subscription.start()
+        return subscription_id
+
+    @action
+    async def unsubscribe(self, subscription_id: int) -> None:
+        """Stop pushing moves to a subscriber."""
+        subscription = self.subscriptions.pop(subscription_id, None)
+        if subscription is not None:
+            await subscription.stop()
+
     @action
     async def get_player_stats(self) -> list[int]:
         """Get the number of wins of each player."""
         return self.stats
+
+    @action
+    async def get_latency_stats(
+        self,
+    ) -> dict[str, dict[str, dict[str, float]]]:
+        """Get the latency of the actions of each player.
+
+        Returns:
+            For ``'player_0'`` and ``'player_1'``, the count, mean, min,
+            p50, p90, p99 and max of the seconds taken by each action
+            called on the player, as seen by the coordinator.
+        """
+        return self.latency.summary()
+
+    @action
+    async def get_stall_stats(self) -> dict[str, float]:
+        """Get the time spent on games that stalled.
+
+        A game stalls when a player forfeits it by attacking outside of
+        the board or repeating shots, or when it reaches the cap on its
+        number of moves.
+
+        Returns:
+            The count, mean, min, p50, p90, p99 and max of the seconds
+            each stalled game lasted, and their ``'total'``.
+        """
+        return {**self.stalls.summary(), 'total': self.stalls.total}
+
+
+class CoordinatorPool(Agent):
+    """Coordinator of the games of many pairs of players.
+
+    Plays the games of every pairing as tasks of this one agent, instead of
+    launching a :class:`Coordinator` agent per pairing. Each pairing plays
+    one game at a time, and at most max_concurrent_games games are played
+    at once across all of them.
+
+    Players in more than one pairing are in several games at once, so if
+    any player is, every game gets an id that is passed to the player
+    actions and the players must keep separate state for each game.
+
+    Args:
+        pairings: Pairs of players that play each other.
+        games_per_pair: Number of games each pair plays, or None to play
+            until the agent is shutdown.
+        max_concurrent_games: Number of games played at once.
+        size: Size of board.
+        ships: The ships that each player uses. Defaults to the ships of
+            :class:`Coordinator`.
+        max_moves: Number of moves after which a game ends without a
+            winner. Defaults to the cap of :class:`Referee`.
+        max_repeats: Number of repeated shots a player may make in a game
+            before it forfeits.
+
+    Raises:
+        ValueError: If a player would be in more games at once than the
+            games whose state a :class:`MultiplexedPlayer` keeps.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        pairings: Sequence[
+            tuple[Handle[BattleshipPlayer], Handle[BattleshipPlayer]]
+        ],
+        *,
+        games_per_pair: int | None = 1,
+        max_concurrent_games: int = 64,
+        size: int = 10,
+        ships: list[int] | None = None,
+        max_moves: int | None = None,
+        max_repeats: int = DEFAULT_MAX_REPEATS,
+    ) -> None:
+        super().__init__()
+        # a coordinator per pairing, which is not launched as an agent
+        self.coordinators = [
+            Coordinator(
+                player_0,
+                player_1,
+                size=size,
+                ships=ships,
+                max_moves=max_moves,
+                max_repeats=max_repeats,
+            )
+            for player_0, player_1 in pairings
+        ]
+        self.games_per_pair = games_per_pair
+        self.max_concurrent_games = max_concurrent_games
+        self._slots = asyncio.Semaphore(max_concurrent_games)
+        players = Counter(
+            player.agent_id for pair in pairings for player in pair
+        )
+        self.multiplexed = any(count > 1 for count in players.values())
+        if self.multiplexed:
+            # a player is in a game of each of its pairings at most
+            check_game_limit(
+                min(max_concurrent_games, max(players.values())),
+            )
+        self._game_ids = itertools.count()
+
+    async def _play_pair(
+        self,
+        coordinator: Coordinator,
+        shutdown: asyncio.Event,
+    ) -> None:
+        played = 0
+        while not shutdown.is_set() and (
+            self.games_per_pair is None or played < self.games_per_pair
+        ):
+            game_id = next(self._game_ids) if self.multiplexed else None
+            async with self._slots:
+                winner = await coordinator.game(shutdown, game_id)
+
+            if winner >= 0:
+                coordinator.stats[winner] += 1
+            elif shutdown.is_set():
+                break
+            played += 1
+
+    @loop
+    async def play_games(self, shutdown: asyncio.Event) -> None:
+        """Play the games of every pairing.
+
+        Returns once every pair has played games_per_pair games.
+        """
+        await asyncio.gather(
+            *(
+                self._play_pair(coordinator, shutdown)
+                for coordinator in self.coordinators
+            ),
+        )
+
+    @action
+    async def get_pair_stats(self) -> list[dict[str, Any]]:
+        """Get the results of each pairing, in the order of the pairings.
+
+        Returns:
+            For each pairing, the number of ``'games'`` started, the
+            ``'wins'`` of each player, the ``'latency'`` of the actions of
+            each player, as returned by
+            :meth:`Coordinator.get_latency_stats`, and the number of
+            games that ``'stalled'`` and the ``'stalled_seconds'`` spent
+            on them, as returned by :meth:`Coordinator.get_stall_stats`.
+        """
+        return [
+            {
+                'games': coordinator.game_number + 1,
+                'wins': list(coordinator.stats),
+                'latency': coordinator.latency.summary(),
+                'stalled': coordinator.stalls.count,
+                'stalled_seconds': coordinator.stalls.total,
+            }
+            for coordinator in self.coordinators
+        ]
@@ -0,0 +1,131 @@
+"""Latency histograms of the actions invoked on players.
+
+A :class:`LatencyHistogram` counts durations in logarithmic buckets, eight
+per doubling, so that recording a duration is a dictionary increment and
+any percentile is known to within about 9%. Histograms with the same
+buckets merge by adding counts, so the histograms of many games, players
+or coordinators combine into one without keeping the durations.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Awaitable
+from typing import TypeVar
+
+T = TypeVar('T')
+
+SUB_BUCKETS = 8  # buckets per doubling of the duration
+_QUANTILES = {'p50': 0.5, 'p90': 0.9, 'p99': 0.99}
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in seconds."""
+
+    __slots__ = ('buckets', 'count', 'max', 'min', 'total')
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Count a duration."""
+        bucket = math.floor(math.log2(max(seconds, 1e-9)) * SUB_BUCKETS)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add the durations counted by other."""
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Estimate the duration below which a fraction q of them fall.
+
+        The estimate is the upper bound of the bucket of the quantile,
+        clamped to the smallest and largest durations counted, and is 0
+        for an empty histogram.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                upper = 2 ** ((bucket + 1) / SUB_BUCKETS)
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """Mean duration, or 0 for an empty histogram."""
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> dict[str, float]:
+        """Count, mean, extremes and percentiles of the durations."""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            **{name: self.percentile(q) for name, q in _QUANTILES.items()},
+            'max': self.max,
+        }
+
+
+class LatencyStats:
+    """Latency histograms of each action of each player."""
+
+    def __init__(self) -> None:
+        self.histograms: dict[str, dict[str, LatencyHistogram]] = {}
+
+    def record(self, player: str, action: str, seconds: float) -> None:
+        """Count the duration of a call to an action of player."""
+        actions = self.histograms.setdefault(player, {})
+        if action not in actions:
+            actions[action] = LatencyHistogram()
+        actions[action].record(seconds)
+
+    async def time(
+        self,
+        player: str,
+        action: str,
+        call: Awaitable[T],
+    ) -> T:
+        """Await a call to an action of player and record its duration.
+
+        Calls that raise, including ones that time out, are recorded too.
+        """
+        start = time.perf_counter()
+        try:
+            return await call
+        finally:
+            self.record(player, action, time.perf_counter() - start)
+
+    def merge(self, other: LatencyStats) -> None:
+        """Add the durations recorded by other."""
+        for player, actions in other.histograms.items():
+            for action, histogram in actions.items():
+                mine = self.histograms.setdefault(player, {})
+                mine.setdefault(action, LatencyHistogram()).merge(histogram)
+
+    def summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Summary of the histogram of each player and action."""
+        return {
+            player: {
+                action: histogram.summary()
+                for action, histogram in actions.items()
+            }
+            for player, actions in self.histograms.items()
+        }
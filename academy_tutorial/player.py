@@ -1,14 +1,85 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC
 from abc import abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable
+from typing import Any
+from typing import ClassVar
+from typing import Generic
 from typing import Literal
+from typing import TypeVar
 
 from academy.agent import action
 from academy.agent import Agent
+from academy.handle import Handle
 
 from academy_tutorial.battleship import Board
 from academy_tutorial.battleship import Crd
+from academy_tutorial.clock import TimeBank
+from academy_tutorial.latency import LatencyStats
+
+T = TypeVar('T')
+S = TypeVar('S')
+
+LastResult = tuple[Crd, Literal['hit', 'miss', 'guessed']]
+
+
+def game_kwargs(game_id: int | None) -> dict[str, Any]:
+    """Keyword arguments that pass game_id to a player action.
+
+    No argument is passed for None, so that players which do not take a
+    game_id keep working when only one game is played at a time.
+    """
+    return {} if game_id is None else {'game_id': game_id}
+
+
+class GameStates(Generic[S]):
+    """State of a player in each of the games it is playing.
+
+    Holds the state of at most max_games games. Starting another game
+    forgets the game whose state was used least recently, so the states of
+    games that were abandoned, or whose end the player was never told
+    about, do not build up, while the games in progress are kept as long
+    as fewer than max_games are played at once. The state of a single game
+    at a time is kept under None.
+
+    Args:
+        max_games: Number of games whose state is kept.
+    """
+
+    def __init__(self, max_games: int = 64) -> None:
+        self.max_games = max_games
+        # states by the order they were last used, oldest first
+        self._states: OrderedDict[int | None, S] = OrderedDict()
+
+    def start(self, game_id: int | None, state: S) -> S:
+        """Keep the state of a game that is starting, and return it."""
+        self._states.pop(game_id, None)
+        self._states[game_id] = state
+        while len(self._states) > self.max_games:
+            del self._states[next(iter(self._states))]
+        return state
+
+    def finish(self, game_id: int | None) -> S | None:
+        """Forget the state of a game, and return it if it was kept."""
+        return self._states.pop(game_id, None)
+
+    def __getitem__(self, game_id: int | None) -> S:
+        try:
+            self._states.move_to_end(game_id)
+        except KeyError:
+            raise KeyError(
+                f'Game {game_id} has not started or was forgotten.',
+            ) from None
+        return self._states[game_id]
+
+    def __contains__(self, game_id: object) -> bool:
+        return game_id in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
 
 
 class BattleshipPlayer(Agent, ABC):
@@ -39,6 +110,30 @@ class BattleshipPlayer(Agent, ABC):
         """Called to notify player of opponents guess."""
         return
 
+    @action
+    async def take_turn(
+        self,
+        last_result: LastResult | None,
+        opponent_last_move: Crd | None,
+    ) -> Crd:
+        """Learn what happened since the last turn and return a guess.
+
+        Combines :meth:`notify_result`, :meth:`notify_move` and
+        :meth:`get_move` so that a turn takes a single message to the
+        player. Override it to handle the whole turn at once.
+
+        Args:
+            last_result: Location and result of the previous attack of this
+                player, or None on its first turn.
+            opponent_last_move: Location of the attack of the opponent
+                since the previous turn, or None if there was none.
+        """
+        if last_result is not None:
+            await self.notify_result(*last_result)
+        if opponent_last_move is not None:
+            await self.notify_move(opponent_last_move)
+        return await self.get_move()
+
     @action
     @abstractmethod
     async def new_game(self, ships: list[int], size: int = 10) -> Board:
@@ -52,3 +147,247 @@ class BattleshipPlayer(Agent, ABC):
             A board with all of the ships placed.
         """
         ...
+
+
+class MultiplexedPlayer(BattleshipPlayer):
+    """Base class of players that can be in several games at once.
+
+    Every action takes an optional game_id. It is only passed when the
+    player is in several games at once, and identifies the game so that
+    the player can keep separate state for each one, for example in a
+    :class:`GameStates` of at most :attr:`max_games` games.
+    """
+
+    max_games: ClassVar[int] = 64
+
+    @action
+    @abstractmethod
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        """Return a guess of where an opposing ship is."""
+        ...
+
+    @action
+    async def notify_result(
+        self,
+        loc: Crd,
+        result: Literal['hit', 'miss', 'guessed'],
+        *,
+        game_id: int | None = None,
+    ) -> None:
+        """Called to notify player of result of last move."""
+        return
+
+    @action
+    async def notify_move(
+        self,
+        loc: Crd,
+        *,
+        game_id: int | None = None,
+    ) -> None:
+        """Called to notify player of opponents guess."""
+        return
+
+    @action
+    async def take_turn(
+        self,
+        last_result: LastResult | None,
+        opponent_last_move: Crd | None,
+        *,
+        game_id: int | None = None,
+    ) -> Crd:
+        """Learn what happened since the last turn and return a guess.
+
+        See :meth:`BattleshipPlayer.take_turn`, game_id is passed on to
+        every action.
+        """
+        kwargs = game_kwargs(game_id)
+        if last_result is not None:
+            await self.notify_result(*last_result, **kwargs)
+        if opponent_last_move is not None:
+            await self.notify_move(opponent_last_move, **kwargs)
+        return await self.get_move(**kwargs)
+
+    @action
+    @abstractmethod
+    async def new_game(
+        self,
+        ships: list[int],
+        size: int = 10,
+        *,
+        game_id: int | None = None,
+    ) -> Board:
+        """Reset state of player.
+
+        Args:
+            ships: List of lengths of ships to place.
+            size: Size of board to return.
+            game_id: Game that is starting.
+
+        Returns:
+            A board with all of the ships placed.
+        """
+        ...
+
+
+def check_game_limit(games: int) -> None:
+    """Check that players can keep the state of games played at once.
+
+    Args:
+        games: Number of games a player is in at once.
+
+    Raises:
+        ValueError: If games is more than :attr:`MultiplexedPlayer.max_games`,
+            as the player would forget the state of games in progress.
+    """
+    if games > MultiplexedPlayer.max_games:
+        raise ValueError(
+            f'Players keep the state of at most '
+            f'{MultiplexedPlayer.max_games} games, but would be in {games} '
+            'games at once.',
+        )
+
+
+class TurnClient:
+    """Plays the turns of a player through its handle.
+
+    Turns are played with the single :meth:`BattleshipPlayer.take_turn`
+    action, which also delivers the result of the previous attack of the
+    player and the last move of the opponent. Players that do not have it,
+    such as players built against an older version of this package, are
+    sent the separate notify and get_move actions instead. Their result
+    notification is dispatched in the background as soon as it is known,
+    so that it overlaps with the turn of the opponent.
+
+    Args:
+        player: Handle to the player.
+        timeout: Seconds to wait for each action, or None to wait forever.
+        game_id: Game passed to every action, if any.
+        latency: Record the duration of every action under name.
+        name: Name of the player in latency.
+        bank: Time bank that every action spends, and that gets its
+            increment after every turn. Replaces timeout.
+        calls: Limit on the actions in flight to the player at once,
+            which may be shared by the clients of several games. Waiting
+            for it is not charged to the timeout or the bank.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        player: Handle[BattleshipPlayer],
+        timeout: float | None = None,
+        *,
+        game_id: int | None = None,
+        latency: LatencyStats | None = None,
+        name: str = '',
+        bank: TimeBank | None = None,
+        calls: asyncio.Semaphore | None = None,
+    ) -> None:
+        self.player = player
+        self.timeout = timeout
+        self.bank = bank
+        self.calls = calls
+        self.game_id = game_id
+        self.latency = latency
+        self.name = name
+        self._kwargs = game_kwargs(game_id)
+        self.single_message = True
+        self._last_result: LastResult | None = None
+        self._pending: asyncio.Task[None] | None = None
+
+    async def _call(self, action: str, call: Awaitable[T]) -> T:
+        if self.calls is None:
+            return await self._timed_call(action, call)
+        async with self.calls:
+            return await self._timed_call(action, call)
+
+    async def _timed_call(self, action: str, call: Awaitable[T]) -> T:
+        if self.bank is not None:
+            call = self.bank.spend(call)
+        else:
+            call = asyncio.wait_for(call, self.timeout)
+        if self.latency is None:
+            return await call
+        return await self.latency.time(self.name, action, call)
+
+    async def _flush(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            await pending
+
+    async def _notify(self, last_result: LastResult) -> None:
+        await self._call(
+            'notify_result',
+            self.player.notify_result(*last_result, **self._kwargs),
+        )
+
+    def notify_result(self, last_result: LastResult) -> None:
+        """Deliver the result of the last attack of the player.
+
+        The result is sent with the next turn, or starts sending right
+        away if the player does not have the take_turn action. An error
+        sending it is raised by the next call to :meth:`take_turn` or
+        :meth:`finish`.
+        """
+        if self.single_message:
+            self._last_result = last_result
+        else:
+            self._pending = asyncio.create_task(self._notify(last_result))
+
+    async def take_turn(self, opponent_last_move: Crd | None) -> Crd:
+        """Play one turn of the player and return its guess.
+
+        Args:
+            opponent_last_move: Location of the attack of the opponent since
+                the previous turn, or None if there was none.
+        """
+        move = await self._take_turn(opponent_last_move)
+        if self.bank is not None:
+            self.bank.add_increment()
+        return move
+
+    async def _take_turn(self, opponent_last_move: Crd | None) -> Crd:
+        if self.single_message:
+            last_result, self._last_result = self._last_result, None
+            try:
+                return await self._call(
+                    'take_turn',
+                    self.player.take_turn(
+                        last_result,
+                        opponent_last_move,
+                        **self._kwargs,
+                    ),
+                )
+            except AttributeError as e:
+                if 'take_turn' not in str(e):
+                    raise
+                self.single_message = False
+                if last_result is not None:
+                    await self._notify(last_result)
+
+        await self._flush()
+        if opponent_last_move is not None:
+            await self._call(
+                'notify_move',
+                self.player.notify_move(opponent_last_move, **self._kwargs),
+            )
+        return await self._call(
+            'get_move',
+            self.player.get_move(**self._kwargs),
+        )
+
+    async def finish(self) -> None:
+        """Wait until the player knows the result of its last attack."""
+        last_result, self._last_result = self._last_result, None
+        if last_result is not None:
+            await self._notify(last_result)
+        await self._flush()
+
+    def cancel(self) -> None:
+        """Stop sending a result notification still in flight."""
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        if pending.done() and not pending.cancelled():
+            # the game is over, so a failure no longer matters
+            pending.exception()
+        pending.cancel()
@@ -0,0 +1,94 @@
+"""Rules that keep games between untrusted players from stalling.
+
+A repeated shot is answered with ``'guessed'`` and a shot outside of the
+board with a miss, so a player that keeps making them would keep a game
+going forever. The :class:`Referee` of a game makes a player that attacks
+outside of the board, or repeats too many shots, forfeit, and ends the
+game without a winner once it reaches a cap on the number of moves.
+"""
+
+from __future__ import annotations
+
+import operator
+from typing import Any
+
+from academy_tutorial.battleship import Crd
+
+# repeated shots a player may make in a game by default, so that a player
+# that occasionally repeats a shot by mistake does not forfeit, but one
+# that keeps repeating it does within a few moves
+DEFAULT_MAX_REPEATS = 3
+
+
+class IllegalMoveError(Exception):
+    """A player made a move that forfeits the game."""
+
+
+class Referee:
+    """Enforces the limits on the moves of one game.
+
+    Args:
+        size: Size of the board.
+        max_moves: Number of moves after which the game ends without a
+            winner. Defaults to every cell of both boards plus the repeated
+            shots allowed, which a game can only reach if no player wins.
+        max_repeats: Number of ``'guessed'`` results each player may get
+            before it forfeits. Defaults to :data:`DEFAULT_MAX_REPEATS`.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_moves: int | None = None,
+        max_repeats: int = DEFAULT_MAX_REPEATS,
+    ) -> None:
+        self.size = size
+        self.max_repeats = max_repeats
+        self.max_moves = (
+            max_moves
+            if max_moves is not None
+            else 2 * (size * size + max_repeats)
+        )
+        self.moves = 0
+        self.repeats = [0, 0]
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the game has reached the cap on its number of moves."""
+        return self.moves >= self.max_moves
+
+    def check_move(self, player: int, pos: Any) -> Crd:
+        """Count a move of player before it is played.
+
+        Returns:
+            The attacked cell.
+
+        Raises:
+            IllegalMoveError: If pos is not a cell of the board.
+        """
+        self.moves += 1
+        try:
+            row, col = map(operator.index, pos)
+            on_board = 0 <= row < self.size and 0 <= col < self.size
+        except (TypeError, ValueError):
+            on_board = False
+        if not on_board:
+            raise IllegalMoveError(
+                f'Player {player} attacked {pos!r}, off the board.',
+            )
+        return Crd(row, col)
+
+    def check_result(self, player: int, result: str) -> None:
+        """Count the result of a move of player.
+
+        Raises:
+            IllegalMoveError: If player has repeated more than max_repeats
+                shots.
+        """
+        if result != 'guessed':
+            return
+        self.repeats[player] += 1
+        if self.repeats[player] > self.max_repeats:
+            raise IllegalMoveError(
+                f'Player {player} repeated {self.repeats[player]} shots.',
+            )
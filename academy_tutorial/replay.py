@@ -0,0 +1,376 @@
+"""Append-only binary log of played games.
+
+Each game is written as one length-prefixed record holding both fleets,
+the cell, result and latency of every move, and the outcome. Moves are
+stored column by column so that a record decodes into a few NumPy arrays.
+A log of 100 move games takes under a kilobyte per game.
+
+The :class:`ReplayReader` memory-maps the log and decodes one record at a
+time, so iterating over a log of tens of millions of games only keeps the
+current game in memory.
+
+Usage:
+    with ReplayWriter('games.replay') as log:
+        log.write(record)
+
+    for record in ReplayReader('games.replay'):
+        game = record.replay()
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+from typing import BinaryIO
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from academy_tutorial.battleship import AttackResult
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import crd_table
+from academy_tutorial.battleship import Game
+from academy_tutorial.battleship import Placement
+
+MAGIC = b'BSRL\x01'
+
+_LENGTH = struct.Struct('<I')  # bytes of the record after the length
+_HEADER = struct.Struct('<BbBBBI')  # size, winner, flags, ships, ships, moves
+_SHIP = struct.Struct('<HB')  # start cell, length with the vertical flag
+_VERTICAL = 0x80
+_FORFEIT = 0x01
+_PLAYER = 3  # bit of the player in the result code of a move
+
+OFF_BOARD = 0xFFFF  # cell of a move outside of the board
+
+# result codes of a move, with SUNK set when the attack sunk a ship
+MISS = 0
+HIT = 1
+GUESSED = 2
+SUNK = 4
+_RESULTS: dict[str, int] = {'miss': MISS, 'hit': HIT, 'guessed': GUESSED}
+
+
+@dataclass
+class GameRecord:
+    """Record of a single game.
+
+    Attributes:
+        size: Size of the boards.
+        fleets: Placement of the ships of player 0 and of player 1.
+        players: Player that made each move.
+        cells: Flat cell ``row * size + col`` attacked by each move, or
+            :data:`OFF_BOARD`.
+        results: Result code of each move, :data:`MISS`, :data:`HIT` or
+            :data:`GUESSED`, with :data:`SUNK` set on sinking hits.
+        latencies: Seconds each player took to choose each move.
+        winner: Winner of the game, or -1 if it was not finished.
+        forfeit: Whether the game ended because a player failed.
+    """
+
+    size: int
+    fleets: tuple[list[Placement], list[Placement]]
+    players: npt.NDArray[np.uint8]
+    cells: npt.NDArray[np.uint16]
+    results: npt.NDArray[np.uint8]
+    latencies: npt.NDArray[np.float32]
+    winner: int
+    forfeit: bool = False
+
+    def moves(self) -> list[Crd | None]:
+        """Coordinate of each move, or None for moves off the board."""
+        table = crd_table(self.size)
+        return [
+            None if cell == OFF_BOARD else table[cell]
+            for cell in self.cells.tolist()
+        ]
+
+    def boards(self) -> tuple[BitBoard, BitBoard]:
+        """Fresh boards with the fleets of both players."""
+        boards = []
+        for fleet in self.fleets:
+            board = BitBoard(self.size)
+            for placement in fleet:
+                if board.place_ship(*placement) is None:
+                    raise ValueError(f'Invalid ship placement: {placement}.')
+            boards.append(board)
+        return boards[0], boards[1]
+
+    def replay(self) -> Game:
+        """Play the moves again on fresh boards.
+
+        Moves off the board are skipped, as the coordinate of the shot is
+        not recorded.
+
+        Returns:
+            The game after the last move.
+
+        Raises:
+            ValueError: If a move does not have the recorded result.
+        """
+        game = Game(*self.boards())
+        for i, (move, player, code) in enumerate(
+            zip(
+                self.moves(),
+                self.players.tolist(),
+                self.results.tolist(),
+            ),
+        ):
+            if move is None:
+                continue
+            result, sunk = game.attack(player, move)
+            if _code(result, sunk is not None) != code:
+                raise ValueError(
+                    f'Move {i} of player {player} at {move} was a {result}, '
+                    f'but the record has result code {code}.',
+                )
+        return game
+
+    def to_bytes(self) -> bytes:
+        """Encode the record without its length prefix."""
+        parts = [
+            _HEADER.pack(
+                self.size,
+                self.winner,
+                _FORFEIT if self.forfeit else 0,
+                len(self.fleets[0]),
+                len(self.fleets[1]),
+                len(self.cells),
+            ),
+        ]
+        for fleet in self.fleets:
+            for (row, col), length, direction in fleet:
+                vertical = _VERTICAL if direction == 'vertical' else 0
+                parts.append(
+                    _SHIP.pack(row * self.size + col, length | vertical),
+                )
+        parts.append(self.cells.astype('<u2').tobytes())
+        # the player is packed above the result code and the sunk flag
+        moves = self.results | (self.players.astype(np.uint8) << _PLAYER)
+        parts.append(moves.astype(np.uint8).tobytes())
+        parts.append(self.latencies.astype('<f4').tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> GameRecord:
+        """Decode a record encoded with :meth:`to_bytes`.
+
+        The cells and latencies are read-only views of data.
+        """
+        size, winner, flags, ships_0, ships_1, n_moves = _HEADER.unpack_from(
+            data,
+        )
+        offset = _HEADER.size
+        table = crd_table(size)
+        fleets: tuple[list[Placement], list[Placement]] = ([], [])
+        for fleet, n_ships in zip(fleets, (ships_0, ships_1)):
+            for cell, code in _SHIP.iter_unpack(
+                data[offset : offset + n_ships * _SHIP.size],
+            ):
+                direction: Literal['horizontal', 'vertical'] = (
+                    'vertical' if code & _VERTICAL else 'horizontal'
+                )
+                fleet.append(
+                    Placement(table[cell], code & ~_VERTICAL, direction),
+                )
+            offset += n_ships * _SHIP.size
+
+        cells = np.frombuffer(data, '<u2', n_moves, offset)
+        offset += cells.nbytes
+        moves = np.frombuffer(data, np.uint8, n_moves, offset)
+        offset += moves.nbytes
+        latencies = np.frombuffer(data, '<f4', n_moves, offset)
+        return cls(
+            size,
+            fleets,
+            (moves >> _PLAYER).astype(np.uint8),
+            cells,
+            (moves & (1 << _PLAYER) - 1).astype(np.uint8),
+            latencies,
+            winner,
+            bool(flags & _FORFEIT),
+        )
+
+
+def _code(result: str, sunk: bool) -> int:
+    return _RESULTS[result] | (SUNK if sunk else 0)
+
+
+class GameRecorder:
+    """Collects the moves of a game as it is played.
+
+    Call :meth:`start` once both boards are known, :meth:`move` after each
+    attack, and :meth:`finish` with the winner to get the record.
+    """
+
+    def __init__(self) -> None:
+        self.game: Game | None = None
+        self.fleets: tuple[list[Placement], list[Placement]] = ([], [])
+        self.players = array('B')
+        self.cells = array('H')
+        self.results = array('B')
+        self.latencies = array('f')
+
+    def start(self, game: Game) -> None:
+        """Record the fleets of a game that has not started yet."""
+        self.game = game
+        self.fleets = (game.boards[0].fleet(), game.boards[1].fleet())
+
+    def move(
+        self,
+        player: int,
+        pos: Any,
+        attack: AttackResult,
+        latency: float,
+    ) -> None:
+        """Record an attack of player at pos and the seconds it took."""
+        assert self.game is not None
+        size = self.game.boards[0].size
+        try:
+            row, col = pos
+            on_board = 0 <= row < size and 0 <= col < size
+        except (TypeError, ValueError):
+            on_board = False
+        self.players.append(player)
+        self.cells.append(row * size + col if on_board else OFF_BOARD)
+        self.results.append(_code(attack.result, attack.sunk is not None))
+        self.latencies.append(latency)
+
+    def finish(self, winner: int) -> GameRecord | None:
+        """Build the record of the game, or None if it never started.
+
+        The game is a forfeit if winner is not the winner on the board.
+        """
+        if self.game is None:
+            return None
+        return GameRecord(
+            size=self.game.boards[0].size,
+            fleets=self.fleets,
+            players=np.array(self.players, dtype=np.uint8),
+            cells=np.array(self.cells, dtype=np.uint16),
+            results=np.array(self.results, dtype=np.uint8),
+            latencies=np.array(self.latencies, dtype=np.float32),
+            winner=winner,
+            forfeit=winner >= 0 and winner != self.game.check_winner(),
+        )
+
+
+class ReplayWriter:
+    """Appends game records to a log file.
+
+    Each record is written with a single call so that the log only ever
+    grows by whole records, and is flushed unless flush is False.
+
+    Args:
+        path: Path of the log. It is created if it does not exist.
+        flush: Flush the file after every record.
+
+    Raises:
+        ValueError: If path exists and is not a replay log.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], flush: bool = True):
+        self.path = path
+        self.flush = flush
+        self._file: BinaryIO = open(path, 'ab')  # noqa: SIM115
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        else:
+            with open(path, 'rb') as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    self._file.close()
+                    raise ValueError(f'{path} is not a replay log.')
+
+    def write(self, record: GameRecord) -> None:
+        """Append record to the log."""
+        data = record.to_bytes()
+        self._file.write(_LENGTH.pack(len(data)) + data)
+        if self.flush:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the log."""
+        self._file.close()
+
+    def __enter__(self) -> ReplayWriter:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class ReplayReader:
+    """Iterates over the records of a log without loading it into memory.
+
+    The log is memory-mapped and each record is copied out of the map as
+    it is decoded. A partially written record at the end of the log, as
+    left by a crash, is ignored.
+
+    Args:
+        path: Path of the log.
+
+    Raises:
+        ValueError: If path is not a replay log.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a replay log.')
+            size = os.fstat(f.fileno()).st_size
+            self._map = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if size > len(MAGIC)
+                else None
+            )
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for _, record in self.records():
+            yield record
+
+    def records(
+        self,
+        start: int = len(MAGIC),
+    ) -> Iterator[tuple[int, GameRecord]]:
+        """Yield the offset and record of each game from offset start.
+
+        The offsets can be passed to :meth:`read` to return to a game.
+        """
+        data = self._map
+        if data is None:
+            return
+        offset = start
+        end = len(data)
+        while offset + _LENGTH.size <= end:
+            (length,) = _LENGTH.unpack_from(data, offset)
+            body = offset + _LENGTH.size
+            if body + length > end:
+                break
+            yield offset, GameRecord.from_bytes(data[body : body + length])
+            offset = body + length
+
+    def read(self, offset: int) -> GameRecord:
+        """Read the record at offset."""
+        for _, record in self.records(offset):
+            return record
+        raise IndexError(f'No record at offset {offset}.')
+
+    def close(self) -> None:
+        """Unmap the log."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> ReplayReader:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,431 @@
+"""Monte Carlo fleet inference for battleship players.
+
+The :class:`FleetSampler` estimates the probability that each cell holds a
+ship by drawing fleets that agree with the shots observed so far. Fleets
+are drawn with Metropolis Markov chains: a step moves one ship to a random
+placement, and a fleet is penalized for every ship cell on a miss, every
+hit that no ship covers and every overlapping cell, so chains find their
+way back to consistent fleets after each new observation, and fleets with
+no penalty are exactly the uniform posterior over consistent fleets.
+
+The chains run on a process pool for a wall-clock budget per move. Chain
+states and the fleets sampled on earlier turns are kept, and samples that
+contradict a new shot are dropped, which conditions them on the new shot,
+so every turn starts from the posterior of the previous one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import random
+import time
+from collections.abc import Sequence
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+from academy.agent import action
+
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import crd_table
+from academy_tutorial.battleship import placement_index
+from academy_tutorial.player import GameStates
+from academy_tutorial.player import MultiplexedPlayer
+
+Chain = list[int]  # placement index of each ship
+
+
+@dataclass
+class _Task:
+    size: int
+    ships: tuple[int, ...]
+    hits: int
+    blocked: int
+    chains: list[Chain]
+    budget: float
+    seed: int
+    beta: float
+
+
+def _penalty(union: int, overlap: int, hits: int, blocked: int) -> int:
+    return (
+        (hits & ~union).bit_count() + (blocked & union).bit_count() + overlap
+    )
+
+
+def run_chains(task: _Task) -> tuple[npt.NDArray[np.int32], list[Chain]]:
+    """Advance the chains of a task until its budget runs out.
+
+    Returns:
+        The placement index of each ship in each consistent fleet visited
+        after a sweep over the ships, as an array of shape
+        ``(n_samples, n_ships)``, and the final state of the chains.
+    """
+    deadline = time.perf_counter() + task.budget
+    rng = random.Random(task.seed)
+    tables = [placement_index(task.size, n).masks for n in task.ships]
+    samples: list[int] = []
+    if not tables or not all(tables):
+        return _as_samples(samples, len(tables)), task.chains
+    cells = sum(task.ships)
+    fleets = [[table[p] for table, p in zip(tables, c)] for c in task.chains]
+    while time.perf_counter() < deadline:
+        for chain, fleet in zip(task.chains, fleets):
+            union = 0
+            for mask in fleet:
+                union |= mask
+            penalty = _penalty(
+                union,
+                cells - union.bit_count(),
+                task.hits,
+                task.blocked,
+            )
+            for _ in range(len(fleet)):
+                ship = rng.randrange(len(fleet))
+                placement = rng.randrange(len(tables[ship]))
+                old = fleet[ship]
+                fleet[ship] = tables[ship][placement]
+                new_union = 0
+                for mask in fleet:
+                    new_union |= mask
+                new_penalty = _penalty(
+                    new_union,
+                    cells - new_union.bit_count(),
+                    task.hits,
+                    task.blocked,
+                )
+                if new_penalty <= penalty or rng.random() < math.exp(
+                    task.beta * (penalty - new_penalty),
+                ):
+                    chain[ship] = placement
+                    union = new_union
+                    penalty = new_penalty
+                else:
+                    fleet[ship] = old
+            if penalty == 0:
+                samples.extend(chain)
+    return _as_samples(samples, len(tables)), task.chains
+
+
+def _as_samples(flat: list[int], n_ships: int) -> npt.NDArray[np.int32]:
+    samples = np.array(flat, dtype=np.int32)
+    return samples.reshape(len(flat) // max(n_ships, 1), n_ships)
+
+
+class FleetSampler:
+    """Samples opposing fleets that agree with the shots observed so far.
+
+    Args:
+        ships: Lengths of the opposing ships.
+        size: Size of the board.
+        budget: Wall-clock seconds to spend sampling in each call to
+            :meth:`heatmap`, which should leave room for the rest of the
+            move within the tournament timeout.
+        workers: Number of processes. Defaults to the number of CPUs, and
+            a value of 1 samples in the current process.
+        chains: Number of Markov chains per worker.
+        max_samples: Number of fleets kept across turns.
+        beta: Inverse temperature of the penalty of inconsistent fleets.
+        seed: Seed of the chains.
+        pool: Process pool shared with other samplers, which :meth:`close`
+            leaves running. Defaults to a pool of this sampler.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        ships: Sequence[int],
+        size: int = 10,
+        *,
+        budget: float = 0.15,
+        workers: int | None = None,
+        chains: int = 2,
+        max_samples: int = 20_000,
+        beta: float = 3.0,
+        seed: int | None = None,
+        pool: ProcessPoolExecutor | None = None,
+    ):
+        self.budget = budget
+        self.workers = workers or os.cpu_count() or 1
+        self.chains_per_worker = chains
+        self.max_samples = max_samples
+        self.beta = beta
+        self._rng = random.Random(seed)
+        self._pool = pool
+        self._owns_pool = pool is None
+        self.reset(ships, size)
+
+    def reset(self, ships: Sequence[int], size: int = 10) -> None:
+        """Forget every observation and start inferring a new fleet.
+
+        The process pool is kept, and started if this is the first game.
+        """
+        self.size = size
+        self.ships = tuple(ships)
+        self.hits = 0  # cells hit by a ship that is not known to be sunk
+        self.misses = 0
+        self.sunk = 0  # cells of the ships known to be sunk
+        self.attacked = np.zeros(size * size, dtype=np.bool_)
+        self._indices = [placement_index(size, n) for n in self.ships]
+        # placement index of each ship in every fleet kept across turns
+        self.samples = _as_samples([], len(self.ships))
+        self._chains = [
+            [self._random_chain() for _ in range(self.chains_per_worker)]
+            for _ in range(self.workers)
+        ]
+        if self.workers > 1 and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            self._owns_pool = True
+            # fork the workers now rather than during the first move
+            for _ in range(self.workers):
+                self._pool.submit(int)
+
+    def _random_chain(self) -> Chain:
+        return [
+            self._rng.randrange(max(len(index), 1)) for index in self._indices
+        ]
+
+    def _covers(self, cell: int) -> npt.NDArray[np.bool_]:
+        """Whether each sampled fleet has a ship on cell."""
+        covers = np.zeros(len(self.samples), dtype=np.bool_)
+        for ship, index in enumerate(self._indices):
+            covers |= np.isin(self.samples[:, ship], index.covering(cell))
+        return covers
+
+    def spawn(self, ships: Sequence[int], size: int = 10) -> FleetSampler:
+        """Start a sampler for another game that shares this process pool.
+
+        The new sampler has the same settings as this one, and closing it
+        leaves the pool running.
+        """
+        return FleetSampler(
+            ships,
+            size,
+            budget=self.budget,
+            workers=self.workers,
+            chains=self.chains_per_worker,
+            max_samples=self.max_samples,
+            beta=self.beta,
+            seed=self._rng.getrandbits(64),
+            pool=self._pool,
+        )
+
+    def close(self) -> None:
+        """Shut down the process pool, unless it is shared."""
+        if self._pool is not None and self._owns_pool:
+            self._pool.shutdown(cancel_futures=True)
+        self._pool = None
+
+    def __enter__(self) -> FleetSampler:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _cell(self, pos: Crd) -> int | None:
+        row, col = pos
+        if 0 <= row < self.size and 0 <= col < self.size:
+            return row * self.size + col
+        return None
+
+    def record(
+        self,
+        pos: Crd,
+        result: Literal['hit', 'miss', 'guessed'],
+    ) -> None:
+        """Condition on the result of an attack on pos.
+
+        Attacks off the board and 'guessed' results are ignored.
+        """
+        cell = self._cell(pos)
+        if cell is None or result == 'guessed':
+            return
+        self.attacked[cell] = True
+        if result == 'miss':
+            self.misses |= 1 << cell
+            self.samples = self.samples[~self._covers(cell)]
+        elif result == 'hit':
+            self.hits |= 1 << cell
+            self.samples = self.samples[self._covers(cell)]
+
+    def record_sunk(self, positions: Sequence[Crd]) -> None:
+        """Fix the ship at positions, when it is known to be sunk.
+
+        The ship is no longer sampled and its cells are treated as misses
+        for the rest of the fleet. Earlier samples do not record which
+        ship is where, so they are dropped.
+        """
+        length = len(positions)
+        if length not in self.ships:
+            return
+        ship = self.ships.index(length)
+        self.ships = self.ships[:ship] + self.ships[ship + 1 :]
+        del self._indices[ship]
+        for chains in self._chains:
+            for chain in chains:
+                del chain[ship]
+        for pos in positions:
+            cell = self._cell(pos)
+            if cell is not None:
+                self.sunk |= 1 << cell
+                self.hits &= ~(1 << cell)
+                self.attacked[cell] = True
+        self.samples = _as_samples([], len(self.ships))
+
+    def _tasks(self, budget: float) -> list[_Task]:
+        return [
+            _Task(
+                size=self.size,
+                ships=self.ships,
+                hits=self.hits,
+                blocked=self.misses | self.sunk,
+                chains=chains,
+                budget=budget,
+                seed=self._rng.getrandbits(64),
+                beta=self.beta,
+            )
+            for chains in self._chains
+        ]
+
+    def sample(self, budget: float | None = None) -> int:
+        """Draw more fleets for up to budget seconds.
+
+        Returns:
+            The number of new fleets.
+        """
+        budget = self.budget if budget is None else budget
+        if self._pool is None:
+            results = [run_chains(task) for task in self._tasks(budget)]
+        else:
+            # leave time to send the tasks and collect the results
+            futures: list[
+                Future[tuple[npt.NDArray[np.int32], list[Chain]]]
+            ] = [
+                self._pool.submit(run_chains, task)
+                for task in self._tasks(0.8 * budget)
+            ]
+            results = [future.result() for future in futures]
+
+        for worker, (_, chains) in enumerate(results):
+            self._chains[worker] = chains
+        new = [samples for samples, _ in results]
+        self.samples = np.concatenate((self.samples, *new))
+        self.samples = self.samples[-self.max_samples :]
+        return sum(len(samples) for samples in new)
+
+    def heatmap(self, budget: float | None = None) -> npt.NDArray[np.float64]:
+        """Sample for up to budget seconds and estimate ship probabilities.
+
+        Returns:
+            Array of shape ``(size, size)`` with the fraction of sampled
+            fleets with a ship on each cell, including the sunk ships. It
+            is all zeros if no consistent fleet has been found yet.
+        """
+        self.sample(budget)
+        n_cells = self.size * self.size
+        density = np.zeros(n_cells)
+        for ship, index in enumerate(self._indices):
+            cells = index.cells_of(self.samples[:, ship])
+            density += np.bincount(cells.ravel(), minlength=n_cells)
+        density /= max(len(self.samples), 1)
+        sunk = self.sunk
+        while sunk:
+            low = sunk & -sunk
+            density[low.bit_length() - 1] = 1
+            sunk ^= low
+        return density.reshape(self.size, self.size)
+
+    def next_move(self, budget: float | None = None) -> Crd:
+        """The unattacked cell most likely to hold a ship.
+
+        Ties, including the case where no fleet was sampled, are broken
+        at random.
+
+        Raises:
+            ValueError: If every cell has been attacked.
+        """
+        density = self.heatmap(budget).ravel()
+        if self.attacked.all():
+            raise ValueError('Every cell has been attacked.')
+        density[self.attacked] = -1
+        candidates = np.flatnonzero(density == density.max())
+        cell = int(candidates[self._rng.randrange(len(candidates))])
+        return crd_table(self.size)[cell]
+
+
+class SamplingPlayer(MultiplexedPlayer):
+    """Player that places a random fleet and targets by fleet sampling.
+
+    It keeps a sampler for each game it is in. The samplers share one pool
+    of processes, so the moves of games played at once wait for each other
+    and budget should be divided by the number of such games. The pool is
+    started with the agent, so constructing the player is cheap.
+    """
+
+    def __init__(
+        self,
+        budget: float = 0.15,
+        workers: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.budget = budget
+        self.workers = workers
+        # owns the process pool that the sampler of every game shares, from
+        # the startup of the agent until its shutdown
+        self.sampler: FleetSampler | None = None
+        self.samplers: GameStates[FleetSampler] = GameStates(self.max_games)
+
+    async def agent_on_startup(self) -> None:
+        """Start the sampling processes."""
+        if self.sampler is None:
+            self.sampler = FleetSampler(
+                [],
+                budget=self.budget,
+                workers=self.workers,
+            )
+
+    async def agent_on_shutdown(self) -> None:
+        """Shut down the sampling processes."""
+        if self.sampler is not None:
+            self.sampler.close()
+            self.sampler = None
+
+    @action
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        """Attack the cell most likely to hold a ship."""
+        return await asyncio.to_thread(self.samplers[game_id].next_move)
+
+    @action
+    async def notify_result(
+        self,
+        loc: Crd,
+        result: Literal['hit', 'miss', 'guessed'],
+        *,
+        game_id: int | None = None,
+    ) -> None:
+        """Condition the sampler on the result of the last attack."""
+        self.samplers[game_id].record(loc, result)
+
+    @action
+    async def new_game(
+        self,
+        ships: list[int],
+        size: int = 10,
+        *,
+        game_id: int | None = None,
+    ) -> Board:
+        """Place a uniformly random fleet and start a sampler.
+
+        Raises:
+            RuntimeError: If the agent has not started.
+        """
+        if self.sampler is None:
+            raise RuntimeError('The sampling player has not started.')
+        self.samplers.start(game_id, self.sampler.spawn(ships, size))
+        return Board.from_random_fleet(ships, size)
@@ -0,0 +1,133 @@
+"""Push the moves of games to subscribed agents.
+
+A :class:`Coordinator <academy_tutorial.coordinator.Coordinator>` keeps a
+:class:`Subscription` for every subscriber. The game loop only appends to
+the bounded queue of each subscription, which never waits, and a task per
+subscription sends the queued updates to the subscriber in batches. A
+subscriber that falls behind loses its oldest updates rather than slowing
+down the games, and is told how many it lost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from abc import ABC
+from abc import abstractmethod
+from collections import deque
+from typing import NamedTuple
+
+from academy.agent import action
+from academy.agent import Agent
+from academy.handle import Handle
+
+from academy_tutorial.battleship import Game
+from academy_tutorial.battleship import MoveEvent
+
+logger = logging.getLogger(__name__)
+
+
+class EventBatch(NamedTuple):
+    """Updates to the games of a coordinator since the previous batch.
+
+    Apply the events of each game to the snapshot of its start with
+    :meth:`Game.apply <academy_tutorial.battleship.Game.apply>`. If updates
+    were dropped, the copies of the games may be missing moves, and should
+    be replaced with a snapshot from ``get_game_delta``.
+    """
+
+    started: list[tuple[int, Game]]  # number and snapshot of new games
+    events: list[tuple[int, MoveEvent]]  # game number and move, in order
+    dropped: int  # updates dropped since the previous batch
+
+
+class GameSubscriber(Agent, ABC):
+    """Abstract base class of agents that subscribe to games."""
+
+    @action
+    @abstractmethod
+    async def receive_events(self, batch: EventBatch) -> None:
+        """Called with each batch of updates to the games."""
+        ...
+
+
+class Subscription:
+    """Bounded queue of updates for one subscriber, and its sender.
+
+    Args:
+        subscriber: Handle to the subscriber.
+        window: Seconds to wait after an update before sending it, so that
+            the updates in that time are sent in one batch.
+        max_updates: Number of updates queued before the oldest ones are
+            dropped.
+    """
+
+    def __init__(
+        self,
+        subscriber: Handle[GameSubscriber],
+        window: float = 0.1,
+        max_updates: int = 1024,
+    ) -> None:
+        self.subscriber = subscriber
+        self.window = window
+        self.queue: deque[tuple[int, MoveEvent | Game]] = deque(
+            maxlen=max_updates,
+        )
+        self.dropped = 0
+        self.sent = 0
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start sending batches to the subscriber."""
+        self._task = asyncio.create_task(self._send_batches())
+
+    async def stop(self) -> None:
+        """Stop sending batches, discarding the queued updates."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    @property
+    def active(self) -> bool:
+        """Whether batches are being sent, which stops if sending fails."""
+        return self._task is not None and not self._task.done()
+
+    def publish(self, game: int, update: MoveEvent | Game) -> None:
+        """Queue a move of a game, or the snapshot of a new game."""
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append((game, update))
+        self._ready.set()
+
+    def _batch(self) -> EventBatch:
+        started: list[tuple[int, Game]] = []
+        events: list[tuple[int, MoveEvent]] = []
+        while self.queue:
+            game, update = self.queue.popleft()
+            if isinstance(update, Game):
+                started.append((game, update))
+            else:
+                events.append((game, update))
+        batch = EventBatch(started, events, self.dropped)
+        self.dropped = 0
+        return batch
+
+    async def _send_batches(self) -> None:
+        while True:
+            await self._ready.wait()
+            await asyncio.sleep(self.window)
+            self._ready.clear()
+            batch = self._batch()
+            try:
+                await self.subscriber.receive_events(batch)
+            except Exception:
+                logger.exception(
+                    'Failed to send events to subscriber %s.',
+                    self.subscriber,
+                )
+                return
+            self.sent += 1
@@ -0,0 +1,226 @@
+"""Probability density targeting for battleship players.
+
+The :class:`DensityTargeter` attacks the cell covered by the most ship
+placements that are still consistent with the shots observed so far,
+which is the cell most likely to hold a ship. It keeps, for each ship
+length, which placements are still possible and how many of them cover
+each cell, so that recording a shot only touches the placements through
+that cell and choosing a move is a handful of array operations, even on
+large boards.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from collections.abc import Sequence
+from typing import ClassVar
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+from academy.agent import action
+
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import crd_table
+from academy_tutorial.battleship import placement_index
+from academy_tutorial.player import GameStates
+from academy_tutorial.player import MultiplexedPlayer
+
+
+class DensityTargeter:
+    """Chooses attacks from the density of possible ship placements.
+
+    A placement is possible while none of its cells is a miss or belongs
+    to a sunk ship. The density of a cell is the number of possible
+    placements covering it, summed over the ships still afloat. Possible
+    placements through cells that were hit but not sunk are weighted by
+    hit_weight for every such cell they cover, so the targeter finishes off
+    a ship once it has found it.
+
+    Args:
+        ships: Lengths of the opposing ships.
+        size: Size of the board.
+        hit_weight: Extra weight of placements through each unsunk hit.
+        rng: Random number generator used to break ties. Defaults to the
+            one of the :mod:`random` module.
+    """
+
+    UNKNOWN: ClassVar[int] = 0
+    MISS: ClassVar[int] = 1
+    HIT: ClassVar[int] = 2
+    SUNK: ClassVar[int] = 3
+
+    def __init__(
+        self,
+        ships: Sequence[int],
+        size: int = 10,
+        hit_weight: float = 50.0,
+        rng: random.Random | None = None,
+    ):
+        self.size = size
+        self.hit_weight = hit_weight
+        self._randrange = random.randrange if rng is None else rng.randrange
+        # state of each flat cell, row * size + col
+        self.state = np.full(size * size, self.UNKNOWN, dtype=np.int8)
+        # number of ships of each length that are not known to be sunk
+        self.afloat = Counter(ships)
+        self._hits: set[int] = set()
+
+        self._indices = {}
+        self._possible = {}
+        self._coverage = {}
+        for length in self.afloat:
+            index = placement_index(size, length)
+            self._indices[length] = index
+            self._possible[length] = np.ones(len(index), dtype=np.bool_)
+            cells = index.cells_of(np.arange(len(index)))
+            self._coverage[length] = np.bincount(
+                cells.ravel(),
+                minlength=size * size,
+            ).astype(np.float64)
+
+    @property
+    def grid(self) -> npt.NDArray[np.int8]:
+        """State of each cell as an array of shape ``(size, size)``."""
+        return self.state.reshape(self.size, self.size)
+
+    def _cell(self, pos: Crd) -> int | None:
+        row, col = pos
+        if 0 <= row < self.size and 0 <= col < self.size:
+            return row * self.size + col
+        return None
+
+    def _block(self, cell: int) -> None:
+        """Rule out every placement through cell."""
+        for length, index in self._indices.items():
+            covering = index.covering(cell)
+            covering = covering[self._possible[length][covering]]
+            if covering.size > 0:
+                self._possible[length][covering] = False
+                np.subtract.at(
+                    self._coverage[length],
+                    index.cells_of(covering).ravel(),
+                    1,
+                )
+
+    def record(
+        self,
+        pos: Crd,
+        result: Literal['hit', 'miss', 'guessed'],
+    ) -> None:
+        """Update the state with the result of an attack on pos.
+
+        Attacks off the board and 'guessed' results are ignored.
+        """
+        cell = self._cell(pos)
+        if cell is None or self.state[cell] != self.UNKNOWN:
+            return
+        if result == 'miss':
+            self.state[cell] = self.MISS
+            self._block(cell)
+        elif result == 'hit':
+            self.state[cell] = self.HIT
+            self._hits.add(cell)
+
+    def record_sunk(self, positions: Sequence[Crd]) -> None:
+        """Mark the ship at positions as sunk, when that is known."""
+        length = len(positions)
+        if self.afloat[length] > 0:
+            self.afloat[length] -= 1
+        for pos in positions:
+            cell = self._cell(pos)
+            if cell is not None and self.state[cell] != self.SUNK:
+                self.state[cell] = self.SUNK
+                self._hits.discard(cell)
+                self._block(cell)
+
+    def density(self) -> npt.NDArray[np.float64]:
+        """Weighted number of possible placements covering each cell.
+
+        Returns:
+            Array of shape ``(size, size)`` that is zero on attacked cells.
+        """
+        n_cells = self.size * self.size
+        density = np.zeros(n_cells)
+        hits = np.fromiter(self._hits, dtype=np.intp, count=len(self._hits))
+        for length, count in self.afloat.items():
+            if count == 0:
+                continue
+            density += count * self._coverage[length]
+            if hits.size == 0:
+                continue
+            index = self._indices[length]
+            through = np.concatenate([index.covering(hit) for hit in hits])
+            through = through[self._possible[length][through]]
+            placements, n_hits = np.unique(through, return_counts=True)
+            density += np.bincount(
+                index.cells_of(placements).ravel(),
+                weights=np.repeat(
+                    count * self.hit_weight * n_hits.astype(np.float64),
+                    length,
+                ),
+                minlength=n_cells,
+            )
+        density[self.state != self.UNKNOWN] = 0
+        return density.reshape(self.size, self.size)
+
+    def next_move(self) -> Crd:
+        """The unattacked cell with the highest density.
+
+        Ties are broken at random.
+
+        Raises:
+            ValueError: If every cell has been attacked.
+        """
+        density = self.density().ravel()
+        density[self.state != self.UNKNOWN] = -1
+        candidates = np.flatnonzero(density == density.max())
+        cell = int(candidates[self._randrange(len(candidates))])
+        if self.state[cell] != self.UNKNOWN:
+            raise ValueError('Every cell has been attacked.')
+        return crd_table(self.size)[cell]
+
+
+class DensityPlayer(MultiplexedPlayer):
+    """Player that places a random fleet and targets by density.
+
+    It keeps a targeter for each game it is in.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        super().__init__()
+        self.targeters: GameStates[DensityTargeter] = GameStates(
+            self.max_games,
+        )
+
+    @action
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        """Attack the cell most likely to hold a ship."""
+        return self.targeters[game_id].next_move()
+
+    @action
+    async def notify_result(
+        self,
+        loc: Crd,
+        result: Literal['hit', 'miss', 'guessed'],
+        *,
+        game_id: int | None = None,
+    ) -> None:
+        """Record the result of the last attack."""
+        self.targeters[game_id].record(loc, result)
+
+    @action
+    async def new_game(
+        self,
+        ships: list[int],
+        size: int = 10,
+        *,
+        game_id: int | None = None,
+    ) -> Board:
+        """Place a uniformly random fleet and start a targeter."""
+        self.targeters.start(game_id, DensityTargeter(ships, size))
+        return Board.from_random_fleet(ships, size)
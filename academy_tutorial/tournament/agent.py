@@ -1,22 +1,46 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import heapq
+import itertools
+import os
 import time
 import warnings
 from asyncio.log import logger
-from collections.abc import Iterable
+from collections import Counter
+from collections import deque
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 from typing import ClassVar
+from typing import Literal
+from typing import NamedTuple
 
 from academy.agent import action
 from academy.agent import Agent
 from academy.agent import loop
 from academy.handle import Handle
 
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Crd
 from academy_tutorial.battleship import Game
+from academy_tutorial.clock import TimeBank
+from academy_tutorial.latency import LatencyHistogram
+from academy_tutorial.latency import LatencyStats
 from academy_tutorial.player import BattleshipPlayer
+from academy_tutorial.player import check_game_limit
+from academy_tutorial.player import game_kwargs
+from academy_tutorial.player import TurnClient
+from academy_tutorial.referee import DEFAULT_MAX_REPEATS
+from academy_tutorial.referee import IllegalMoveError
+from academy_tutorial.referee import Referee
+from academy_tutorial.replay import GameRecorder
+from academy_tutorial.replay import ReplayWriter
+from academy_tutorial.tournament.rating import DEFAULT_RATING
+from academy_tutorial.tournament.rating import elo_update
+from academy_tutorial.tournament.rating import Ranking
+from academy_tutorial.tournament.swiss import swiss_pairs
 
 
 @dataclass
@@ -27,27 +51,167 @@ class PlayerInfo:
     wins: int = 0
     losses: int = 0
     games: int = 0
+    byes: int = 0
+    rating: float = DEFAULT_RATING
     previous_matchups: list[tuple[str, int]] = field(default_factory=list)
+    registered: float = field(default_factory=time.monotonic)
+    # seconds spent in finished matchups, and start of the current one
+    busy_seconds: float = 0.0
+    busy_since: float | None = None
 
     @property
     def win_rate(self) -> float:
         """Proportion of games won."""
         return self.wins / self.games if self.games > 0 else 0
 
+    @property
+    def score(self) -> int:
+        """Swiss score, a point for each win and for each bye."""
+        return self.wins + self.byes
+
+    def utilization(self, now: float) -> float:
+        """Proportion of the time since registration spent in games."""
+        busy = self.busy_seconds
+        if self.busy_since is not None:
+            busy += now - self.busy_since
+        elapsed = now - self.registered
+        return busy / elapsed if elapsed > 0 else 0.0
+
+
+class GameResult(NamedTuple):
+    """Result of a game of the tournament."""
+
+    players: tuple[str, str]
+    winner: int  # index of the winner, or -1 for none
+    clock: tuple[float, float] | None  # seconds left in each time bank
+
+
+def _circle_round(
+    players: list[str],
+    round_num: int,
+) -> list[tuple[str, str]]:
+    """Pairs of a round of the circle method of round robin scheduling.
+
+    The first player stays in place while the others rotate by round_num,
+    and the players are paired from the ends of the circle inwards. With
+    an odd number of players, the player paired with the empty seat sits
+    the round out.
+    """
+    seats: list[str | None] = list(players)
+    if len(seats) % 2 == 1:
+        seats.append(None)
+    rest = seats[1:]
+    shift = round_num % len(rest) if rest else 0
+    seats = seats[:1] + rest[-shift:] + rest[:-shift] if shift else seats
+    return [
+        (a, b)
+        for a, b in zip(seats[: len(seats) // 2], reversed(seats))
+        if a is not None and b is not None
+    ]
+
 
 class TournamentAgent(Agent):
-    """Play battleship agents against one another."""
+    """Play battleship agents against one another.
+
+    Args:
+        replay_path: Append a record of every game to the replay log at
+            this path.
+        concurrent_games: Number of games each matchup plays at once.
+            When it is more than one, every game gets an id that is
+            passed to the player actions, so the players must keep
+            separate state for each game.
+        time_budget: Give each player of a game a time bank of this many
+            seconds, which all the calls to the player spend, instead of
+            a timeout on every call. A player whose bank runs out
+            forfeits.
+        time_increment: Seconds added to the bank of a player after each
+            of its moves.
+        pairing: How the players of a round are matched. A round robin
+            plays every pair once, so n players play n (n - 1) / 2 games,
+            and players that register late play the pairs they missed
+            alongside the pairs that are left. A Swiss system pairs
+            players with similar scores every round without rematches,
+            and ranks n players in about log2(n) rounds.
+        max_concurrent_games: Limit on the games in progress at once.
+            Matchups that would go over it wait in a backlog, where the
+            matchups of the players with the fewest games go first.
+        max_player_calls: Limit on the actions in flight to each player
+            at once, across all of its games.
+
+    Raises:
+        ValueError: If concurrent_games is more than the games whose state
+            a :class:`MultiplexedPlayer` keeps.
+    """
 
     timeout: ClassVar[float] = 0.25
     ships: ClassVar[list[int]] = [5, 5, 4, 3, 2]
-
-    def __init__(self) -> None:
+    # cap on the moves of a game, defaulting to the cap of Referee
+    max_moves: ClassVar[int | None] = None
+    # repeated shots a player may make in a game before it forfeits
+    max_repeats: ClassVar[int] = DEFAULT_MAX_REPEATS
+    # largest change of Elo rating a game can make
+    elo_k: ClassVar[float] = 32.0
+
+    def __init__(  # noqa: PLR0913
+        self,
+        replay_path: str | os.PathLike[str] | None = None,
+        concurrent_games: int = 1,
+        time_budget: float | None = None,
+        time_increment: float = 0.0,
+        pairing: Literal['round_robin', 'swiss'] = 'round_robin',
+        *,
+        max_concurrent_games: int | None = None,
+        max_player_calls: int | None = None,
+    ) -> None:
+        # a player is in the games of one matchup at a time
+        check_game_limit(concurrent_games)
         super().__init__()
         self.registered_players: dict[str, PlayerInfo] = {}
+        # players by Elo rating
+        self.ranking = Ranking()
         self.matchups: list[tuple[str, str]] = []
         self.round_num = 1
         self.round_lock = asyncio.Lock()
         self.new_players = asyncio.Condition()
+        # set by every registration, to wake the scheduler
+        self._registered = asyncio.Event()
+        self.replay_path = replay_path
+        self._replay: ReplayWriter | None = None
+        self.latency = LatencyStats()
+        # durations of the games that ended by an illegal move or the cap
+        self.stalls = LatencyHistogram()
+        self.concurrent_games = concurrent_games
+        self._game_ids = itertools.count()
+        self.time_budget = time_budget
+        self.time_increment = time_increment
+        self.results: deque[GameResult] = deque(maxlen=1024)
+        # games in progress of each matchup
+        self._running: Counter[tuple[str, str]] = Counter()
+        self.games_played = 0
+        self.first_game: float | None = None
+        self.max_concurrent_games = max_concurrent_games
+        self.max_player_calls = max_player_calls
+        self._call_limits: dict[str, asyncio.Semaphore] = {}
+        # heap of matchups waiting to start, by the games of their players
+        self._backlog: list[tuple[int, int, int, float, tuple[str, str]]] = []
+        self._backlog_order = itertools.count()
+        # players of the matchups in the backlog
+        self._queued: set[str] = set()
+        self.max_queue_depth = 0
+        # seconds matchups waited in the backlog
+        self.queue_wait = LatencyHistogram()
+        self.pairing = pairing
+        # opponents each player has been matched with
+        self.opponents: dict[str, set[str]] = {}
+        # opponents each player is yet to be matched with in a round robin,
+        # in the order they registered
+        self.unmatched: dict[str, dict[str, None]] = {}
+
+    async def agent_on_shutdown(self) -> None:
+        """Close the replay log."""
+        if self._replay is not None:
+            self._replay.close()
+            self._replay = None
 
     async def test_player(self, player: Handle[BattleshipPlayer]) -> None:
         """Test if player completes necessary methods.
@@ -76,25 +240,132 @@ class TournamentAgent(Agent):
         logger.info('Locking condition variable.')
         async with self.new_players:
             self.registered_players[name] = PlayerInfo(player)
-            self.round_num = 1  # Reset round num so everyone plays everyone
+            self.ranking.update(name, DEFAULT_RATING)
+            if self.max_player_calls is not None:
+                self._call_limits[name] = asyncio.Semaphore(
+                    self.max_player_calls,
+                )
             self.new_players.notify()
+            self._registered.set()
 
         logger.info('Registered player.')
 
+    def _player_summary(self, name: str, rank: int) -> dict[str, Any]:
+        info = self.registered_players[name]
+        return {
+            'name': name,
+            'rank': rank,
+            'rating': info.rating,
+            'wins': info.wins,
+            'games': info.games,
+            'byes': info.byes,
+            'win_rate': info.win_rate,
+            'record': info.previous_matchups,
+        }
+
     @action
-    async def get_players(self) -> list[dict[str, Any]]:
-        """Return a ranked list of the players."""
-        players = [
-            {
-                'name': name,
-                'wins': info.wins,
-                'games': info.games,
-                'win_rate': info.win_rate,
-                'record': info.previous_matchups,
-            }
-            for name, info in self.registered_players.items()
+    async def get_players(
+        self,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[dict[str, Any]]:
+        """Return a page of the players, ranked by Elo rating.
+
+        Args:
+            offset: Number of higher ranked players to skip.
+            limit: Number of players returned at most.
+        """
+        return [
+            self._player_summary(name, rank)
+            for rank, (name, _) in enumerate(
+                self.ranking.page(offset, max(limit, 0)),
+                start=offset + 1,
+            )
         ]
-        return sorted(players, key=lambda x: x['win_rate'], reverse=True)
+
+    @action
+    async def get_player(self, name: str) -> dict[str, Any]:
+        """Return the rank, from 1, and the record of a player.
+
+        Raises:
+            KeyError: If no player is registered under name.
+        """
+        return self._player_summary(name, self.ranking.rank(name) + 1)
+
+    @action
+    async def get_latency_stats(
+        self,
+    ) -> dict[str, dict[str, dict[str, float]]]:
+        """Get the latency of the actions of each player.
+
+        Returns:
+            For each player name, the count, mean, min, p50, p90, p99 and
+            max of the seconds taken by each action called on the player
+            during games, as seen by the tournament.
+        """
+        return self.latency.summary()
+
+    @action
+    async def get_game_results(self, limit: int = 100) -> list[GameResult]:
+        """Return the results of the most recent games, oldest first.
+
+        The clock of a result holds the seconds left in the time bank of
+        each player at the end of the game, if the games have time banks.
+        """
+        results = list(self.results)
+        return results[-limit:] if limit > 0 else []
+
+    @action
+    async def get_stall_stats(self) -> dict[str, float]:
+        """Get the time spent on games that stalled.
+
+        A game stalls when a player forfeits it by attacking outside of
+        the board or repeating shots, or when it reaches the cap on its
+        number of moves.
+
+        Returns:
+            The count, mean, min, p50, p90, p99 and max of the seconds
+            each stalled game lasted, and their ``'total'``.
+        """
+        return {**self.stalls.summary(), 'total': self.stalls.total}
+
+    @action
+    async def get_utilization(self) -> dict[str, Any]:
+        """Report how busy the tournament keeps its players.
+
+        Returns:
+            The ``'games_per_hour'`` with a winner since the first game
+            started, and in ``'players'``, the proportion of the time
+            since each player registered that it spent in games.
+        """
+        now = time.monotonic()
+        elapsed = now - self.first_game if self.first_game is not None else 0
+        return {
+            'games_per_hour': (
+                3600 * self.games_played / elapsed if elapsed > 0 else 0.0
+            ),
+            'players': {
+                name: info.utilization(now)
+                for name, info in self.registered_players.items()
+            },
+        }
+
+    @action
+    async def get_queue_stats(self) -> dict[str, Any]:
+        """Report on the backlog of matchups waiting to start.
+
+        Returns:
+            The current ``'depth'`` and ``'max_depth'`` of the backlog,
+            the ``'games'`` in progress, and the count, mean, min, p50,
+            p90, p99 and max of the seconds each matchup waited, in
+            ``'wait'``.
+        """
+        return {
+            'depth': len(self._backlog),
+            'max_depth': self.max_queue_depth,
+            'games': sum(self._running.values()),
+            'wait': self.queue_wait.summary(),
+        }
 
     @action
     async def get_current_matchups(self) -> list[tuple[str, str]]:
@@ -104,179 +375,476 @@ class TournamentAgent(Agent):
     def _matching(
         self,
         players: list[str],
-        round_num: int,
-    ) -> Iterable[tuple[str, str]]:
-        """Match players for next round.
-
-        Currently we use a round robin system. In the future we might
-        implement a swiss system.
+        *,
+        idle: bool = True,
+    ) -> list[tuple[str, str]]:
+        """Match free players for their next games.
+
+        Uses a round robin system, or a swiss system if the tournament
+        pairing is ``'swiss'``. Unless the tournament is idle, with no
+        games in progress, a swiss system leaves out the players that
+        would get a bye or a rematch, as the players still in games may
+        be new opponents for them.
         """
-        if round_num >= len(players):
-            return []
+        if self.pairing == 'swiss':
+            return self._swiss_matching(players, idle=idle)
+        return self._round_robin_matching(players)
 
-        players_rotated = players[1:]
-        players_rotated = (
-            players_rotated[-round_num:] + players_rotated[:-round_num]
+    def _round_robin_matching(
+        self,
+        players: list[str],
+    ) -> list[tuple[str, str]]:
+        """Match players that have not been matched with each other yet.
+
+        Every pair of players is matched once. A round starts from the
+        round of the circle method, which plays n players in n - 1 rounds,
+        that has the most pairs left, so a tournament whose players all
+        registered up front keeps to n - 1 rounds. The free players are
+        then matched greedily, those with the most pairs left first, so
+        that a player that registered late plays a game every round until
+        it catches up, while the others play the pairs they have left.
+        Returns no matchups once every pair has been matched.
+        """
+        for name in players:
+            if name not in self.unmatched:
+                self.unmatched[name] = dict.fromkeys(self.unmatched)
+                for opponents in self.unmatched.values():
+                    opponents[name] = None
+                del self.unmatched[name][name]
+
+        circle = max(
+            (
+                [
+                    (a, b)
+                    for a, b in _circle_round(players, round_num)
+                    if b in self.unmatched[a]
+                ]
+                for round_num in range(len(players))
+            ),
+            key=len,
+            default=[],
         )
-        players = players[:1] + players_rotated
+        matchups = max(
+            self._match_greedily(players, circle),
+            self._match_greedily(players, []),
+            key=lambda matchups: (
+                len(matchups),
+                sum(len(self.unmatched[name]) for name, _ in matchups)
+                + sum(len(self.unmatched[name]) for _, name in matchups),
+            ),
+        )
+        for name, opponent in matchups:
+            del self.unmatched[name][opponent]
+            del self.unmatched[opponent][name]
+        return matchups
 
-        n_games = len(players) // 2
-        matchups = zip(players[:n_games], players[n_games:])
+    def _match_greedily(
+        self,
+        players: list[str],
+        matchups: list[tuple[str, str]],
+    ) -> list[tuple[str, str]]:
+        """Add unmatched pairs of the players left free by matchups."""
+        matchups = list(matchups)
+        free = set(players).difference(*matchups)
+        for name in sorted(
+            free,
+            key=lambda name: len(self.unmatched[name]),
+            reverse=True,
+        ):
+            if name not in free:
+                continue
+            candidates = [o for o in self.unmatched[name] if o in free]
+            if candidates:
+                opponent = max(
+                    candidates,
+                    key=lambda o: len(self.unmatched[o]),
+                )
+                free.difference_update((name, opponent))
+                matchups.append((name, opponent))
         return matchups
 
-    async def play_game(  # noqa: C901, PLR0911
+    def _swiss_matching(
+        self,
+        players: list[str],
+        *,
+        idle: bool,
+    ) -> list[tuple[str, str]]:
+        """Match players with similar scores that have not met yet.
+
+        With an odd number of players, one of them gets a bye, which
+        scores like a win, if the tournament is idle.
+        """
+        if len(players) < 2:  # noqa: PLR2004
+            return []
+        ranking = sorted(
+            players,
+            key=lambda name: self.registered_players[name].score,
+            reverse=True,
+        )
+        byes = {name for name in players if self.registered_players[name].byes}
+        matchups, bye = swiss_pairs(
+            ranking,
+            self.opponents,
+            byes,
+            rematches=idle,
+        )
+        if bye is not None:
+            self.registered_players[bye].byes += 1
+        return matchups
+
+    async def play_game(
         self,
         shutdown: asyncio.Event,
         player_0: Handle[BattleshipPlayer],
         player_1: Handle[BattleshipPlayer],
+        names: tuple[str, str] = ('player_0', 'player_1'),
+        game_id: int | None = None,
     ) -> int:
-        """Play players against each other in single game."""
-        try:
-            player_0_board = await asyncio.wait_for(
-                player_0.new_game(self.ships),
-                self.timeout,
-            )
-            if sorted([s.length for s in player_0_board.ships]) != sorted(
-                self.ships,
-            ):
-                warnings.warn(
-                    'Player 0 returned an invalid board.',
-                    stacklevel=1,
-                )
-                return 1
-        except Exception as e:
-            warnings.warn(
-                f'Player 0 raised exception {e}, player 1 wins.',
-                stacklevel=1,
-            )
-            return 1
+        """Play players against each other in single game.
 
-        try:
-            player_1_board = await asyncio.wait_for(
-                player_1.new_game(self.ships),
-                self.timeout,
-            )
-            if sorted([s.length for s in player_1_board.ships]) != sorted(
-                self.ships,
-            ):
-                return 0
-        except Exception as e:
-            warnings.warn(
-                f'Player 1 raised exception {e}, player 0 wins.',
-                stacklevel=1,
+        The latency of the actions of the players is recorded under names,
+        and game_id, if any, is passed to every action.
+        """
+        # the moves are only collected when there is a log to write them to
+        recorder = None if self.replay_path is None else GameRecorder()
+        banks = (
+            None
+            if self.time_budget is None
+            else (
+                TimeBank(self.time_budget, self.time_increment),
+                TimeBank(self.time_budget, self.time_increment),
             )
-            return 0
-
-        game_state = Game(player_0_board, player_1_board)
-        while not shutdown.is_set():
-            try:
-                attack = await asyncio.wait_for(
-                    player_0.get_move(),
-                    timeout=self.timeout,
-                )
-                result = game_state.attack(0, attack)
-                await asyncio.wait_for(
-                    player_0.notify_result(attack, result),
-                    timeout=self.timeout,
-                )
-            except Exception as e:
-                warnings.warn(
-                    f'Player 0 raised exception {e}, player 1 wins.',
-                    stacklevel=1,
-                )
-                return 1
+        )
+        winner = await self._play_game(
+            shutdown,
+            (player_0, player_1),
+            names,
+            recorder=recorder,
+            game_id=game_id,
+            banks=banks,
+        )
+        record = None if recorder is None else recorder.finish(winner)
+        if self.replay_path is not None and record is not None:
+            if self._replay is None:
+                self._replay = ReplayWriter(self.replay_path)
+            self._replay.write(record)
+        clock = (
+            None if banks is None else (banks[0].remaining, banks[1].remaining)
+        )
+        self.results.append(GameResult(names, winner, clock))
+        return winner
 
-            if game_state.check_winner() >= 0:
-                return game_state.check_winner()
+    async def _new_board(
+        self,
+        player: Handle[BattleshipPlayer],
+        name: str,
+        game_id: int | None,
+        bank: TimeBank | None,
+    ) -> BitBoard | None:
+        """Start a game of player, or None if it returned an invalid board.
 
-            try:
-                await asyncio.wait_for(
-                    player_1.notify_move(attack),
-                    timeout=self.timeout,
-                )
-                attack = await asyncio.wait_for(
-                    player_1.get_move(),
-                    timeout=self.timeout,
-                )
-                result = game_state.attack(1, attack)
-                await asyncio.wait_for(
-                    player_1.notify_result(attack, result),
-                    timeout=self.timeout,
-                )
-            except Exception as e:
+        A board is invalid if its ships do not have the lengths of the
+        tournament, or a ship is not a straight line on the board.
+        """
+        call = player.new_game(self.ships, **game_kwargs(game_id))
+        limit = self._call_limits.get(name)
+        async with limit or contextlib.nullcontext():
+            board = await self.latency.time(
+                name,
+                'new_game',
+                asyncio.wait_for(call, self.timeout)
+                if bank is None
+                else bank.spend(call),
+            )
+        if sorted([s.length for s in board.ships]) != sorted(self.ships):
+            return None
+        try:
+            board.fleet()
+        except ValueError:
+            return None
+        return BitBoard.from_board(board)
+
+    @staticmethod
+    def _valid_boards(
+        boards: list[BitBoard | BaseException | None],
+    ) -> list[BitBoard] | int:
+        """The boards of both players, or the winner if a player forfeits.
+
+        A player forfeits if starting its game raised or returned an
+        invalid board.
+        """
+        valid: list[BitBoard] = []
+        for i, board in enumerate(boards):
+            if isinstance(board, BaseException):
                 warnings.warn(
-                    f'Player 1 raised exception {e}, player 0 wins.',
+                    f'Player {i} raised exception {board}, '
+                    f'player {1 - i} wins.',
                     stacklevel=1,
                 )
-                return 0
-
-            if game_state.check_winner() >= 0:
-                return game_state.check_winner()
-
-            try:
-                await asyncio.wait_for(
-                    player_0.notify_move(attack),
-                    timeout=self.timeout,
-                )
-            except Exception as e:
+                return 1 - i
+            if board is None:
                 warnings.warn(
-                    f'Player 0 raised exception {e}, player 1 wins.',
+                    f'Player {i} returned an invalid board.',
                     stacklevel=1,
                 )
-                return 1
-
-        return -1
+                return 1 - i
+            valid.append(board)
+        return valid
 
-    @loop
-    async def play_tournament(self, shutdown: asyncio.Event) -> None:
-        """Continuously play games in tournament."""
-        while not shutdown.is_set():
-            # Get the current players for the round
-            start = time.time()
-            async with self.new_players:
-                while True:
-                    cur_players = list(self.registered_players.keys())
-                    self.matchups = list(
-                        self._matching(cur_players, self.round_num),
+    async def _play_game(  # noqa: PLR0913
+        self,
+        shutdown: asyncio.Event,
+        players: tuple[Handle[BattleshipPlayer], Handle[BattleshipPlayer]],
+        names: tuple[str, str],
+        *,
+        recorder: GameRecorder | None,
+        game_id: int | None,
+        banks: tuple[TimeBank, TimeBank] | None,
+    ) -> int:
+        started = time.perf_counter()
+        banks_or_none = banks or (None, None)
+        boards = await asyncio.gather(
+            *(
+                self._new_board(player, name, game_id, bank)
+                for player, name, bank in zip(players, names, banks_or_none)
+            ),
+            return_exceptions=True,
+        )
+        valid = self._valid_boards(boards)
+        if isinstance(valid, int):
+            return valid
+
+        game_state = Game(*valid)
+        if recorder is not None:
+            recorder.start(game_state)
+        referee = Referee(
+            game_state.boards[0].size,
+            self.max_moves,
+            self.max_repeats,
+        )
+        turns = tuple(
+            TurnClient(
+                player,
+                self.timeout,
+                game_id=game_id,
+                latency=self.latency,
+                name=name,
+                bank=bank,
+                calls=self._call_limits.get(name),
+            )
+            for player, name, bank in zip(players, names, banks_or_none)
+        )
+        last_move: Crd | None = None
+        mover = 0
+        try:
+            while not shutdown.is_set() and not referee.exhausted:
+                try:
+                    start = time.perf_counter()
+                    attack = await turns[mover].take_turn(last_move)
+                    latency = time.perf_counter() - start
+                    attack = referee.check_move(mover, attack)
+                    outcome = game_state.attack(mover, attack)
+                    if recorder is not None:
+                        recorder.move(mover, attack, outcome, latency)
+                    referee.check_result(mover, outcome.result)
+                    turns[mover].notify_result((attack, outcome.result))
+                    last_move = attack
+                    winner = game_state.check_winner()
+                    if winner >= 0:
+                        await turns[mover].finish()
+                        return winner
+                except IllegalMoveError as e:
+                    warnings.warn(
+                        f'{e} Player {1 - mover} wins.',
+                        stacklevel=1,
                     )
-                    if len(self.matchups) > 0:
-                        break
-                    else:
-                        logger.info('Wating for condition variable')
-                        await self.new_players.wait()
-                        logger.info('Woke up!')
-
-                self.round_num += 1
-
-            task_map: dict[asyncio.Task[Any], tuple[str, str]] = {}
-            for matchup in self.matchups:
-                (player_1_name, player_2_name) = matchup
-                player_1 = self.registered_players[player_1_name].player
-                player_2 = self.registered_players[player_2_name].player
-                task = asyncio.create_task(
-                    self.play_game(shutdown, player_1, player_2),
-                )
-                task_map[task] = matchup
-
-            await asyncio.wait(task_map.keys())
+                    self.stalls.record(time.perf_counter() - started)
+                    return 1 - mover
+                except Exception as e:
+                    warnings.warn(
+                        f'Player {mover} raised exception {e}, '
+                        f'player {1 - mover} wins.',
+                        stacklevel=1,
+                    )
+                    return 1 - mover
+                mover = 1 - mover
+        finally:
+            for turn in turns:
+                turn.cancel()
 
-            for task, matchup in task_map.items():
-                if task.result() == -1:  # Game was skipped
-                    continue
+        if referee.exhausted:
+            warnings.warn(
+                f'Game ended after {referee.moves} moves without a winner.',
+                stacklevel=1,
+            )
+            self.stalls.record(time.perf_counter() - started)
+        return -1
 
-                winner_name = matchup[task.result()]
-                loser_name = matchup[1 - task.result()]
+    async def _match_free_players(
+        self,
+        *,
+        idle: bool,
+    ) -> list[tuple[str, str]]:
+        """Match the players that are not in a game or in the backlog."""
+        async with self.new_players:
+            free = [
+                name
+                for name, info in self.registered_players.items()
+                if info.busy_since is None and name not in self._queued
+            ]
+            return self._matching(free, idle=idle)
+
+    def _queue_matchups(self, matchups: list[tuple[str, str]]) -> None:
+        """Add matchups to the backlog, and reserve their players."""
+        now = time.monotonic()
+        for matchup in matchups:
+            games = [self.registered_players[name].games for name in matchup]
+            heapq.heappush(
+                self._backlog,
+                (
+                    min(games),
+                    sum(games),
+                    next(self._backlog_order),
+                    now,
+                    matchup,
+                ),
+            )
+            self._queued.update(matchup)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._backlog))
+
+    def _admit_matchups(self) -> list[tuple[str, str]]:
+        """Take the matchups whose games fit in the limit off the backlog."""
+        running = sum(self._running.values())
+        admitted = []
+        now = time.monotonic()
+        while self._backlog and (
+            self.max_concurrent_games is None
+            or running == 0
+            or running + self.concurrent_games <= self.max_concurrent_games
+        ):
+            *_, queued, matchup = heapq.heappop(self._backlog)
+            self._queued.difference_update(matchup)
+            self.queue_wait.record(now - queued)
+            admitted.append(matchup)
+            running += self.concurrent_games
+        return admitted
+
+    def _start_matchup(
+        self,
+        shutdown: asyncio.Event,
+        matchup: tuple[str, str],
+    ) -> list[asyncio.Task[int]]:
+        """Start the games of matchup, and mark its players busy."""
+        now = time.monotonic()
+        if self.first_game is None:
+            self.first_game = now
+        player_1_name, player_2_name = matchup
+        for name, opponent in (matchup, (player_2_name, player_1_name)):
+            self.registered_players[name].busy_since = now
+            self.opponents.setdefault(name, set()).add(opponent)
+        self.matchups.append(matchup)
+        self._running[matchup] += self.concurrent_games
+
+        player_1 = self.registered_players[player_1_name].player
+        player_2 = self.registered_players[player_2_name].player
+        return [
+            asyncio.create_task(
+                self.play_game(
+                    shutdown,
+                    player_1,
+                    player_2,
+                    matchup,
+                    next(self._game_ids)
+                    if self.concurrent_games > 1
+                    else None,
+                ),
+            )
+            for _ in range(self.concurrent_games)
+        ]
 
-                winner = self.registered_players[winner_name]
-                winner.wins += 1
-                winner.games += 1
-                winner.previous_matchups.append((loser_name, 1))
+    def _finish_game(self, matchup: tuple[str, str], winner: int) -> None:
+        """Commit the result of a game, and free the players of matchup."""
+        self._running[matchup] -= 1
+        if self._running[matchup] == 0:
+            del self._running[matchup]
+            self.matchups.remove(matchup)
+            now = time.monotonic()
+            for name in matchup:
+                info = self.registered_players[name]
+                assert info.busy_since is not None
+                info.busy_seconds += now - info.busy_since
+                info.busy_since = None
+
+        if winner != -1:  # Game was not skipped
+            self._record_result(matchup, winner)
+
+    def _record_result(self, matchup: tuple[str, str], winner: int) -> None:
+        """Count a game won by matchup[winner], and rate its players."""
+        self.games_played += 1
+
+        winner_name = matchup[winner]
+        loser_name = matchup[1 - winner]
+
+        winner_info = self.registered_players[winner_name]
+        winner_info.wins += 1
+        winner_info.games += 1
+        winner_info.previous_matchups.append((loser_name, 1))
+
+        loser_info = self.registered_players[loser_name]
+        loser_info.losses += 1
+        loser_info.games += 1
+        loser_info.previous_matchups.append((winner_name, 0))
+
+        winner_info.rating, loser_info.rating = elo_update(
+            winner_info.rating,
+            loser_info.rating,
+            self.elo_k,
+        )
+        self.ranking.update(winner_name, winner_info.rating)
+        self.ranking.update(loser_name, loser_info.rating)
 
-                loser = self.registered_players[loser_name]
-                loser.losses += 1
-                loser.games += 1
-                loser.previous_matchups.append((winner_name, 0))
+    @loop
+    async def play_tournament(self, shutdown: asyncio.Event) -> None:
+        """Continuously play games in tournament.
 
-            round_time = time.time() - start
-            logger.info(f'Round took {round_time} seconds')
-            await asyncio.sleep(0.1)  # Rate limit between rounds.
+        Games are not played in rounds that wait for the slowest game to
+        finish. Whenever a game finishes, or a player registers, the free
+        players are matched again and their games start at once, or wait
+        in the backlog if they would go over max_concurrent_games. Once
+        every pair has played, waits for players to register.
+        """
+        games: dict[asyncio.Future[Any], tuple[str, str]] = {}
+        stopping = asyncio.create_task(shutdown.wait())
+        try:
+            while not shutdown.is_set():
+                self._registered.clear()
+                matchups = await self._match_free_players(idle=not games)
+                if matchups:
+                    self.round_num += 1
+                self._queue_matchups(matchups)
+                for matchup in self._admit_matchups():
+                    for task in self._start_matchup(shutdown, matchup):
+                        games[task] = matchup
+
+                registered = asyncio.create_task(self._registered.wait())
+                done, _ = await asyncio.wait(
+                    [*games, registered, stopping],
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                registered.cancel()
+                for game in done:
+                    if game in games:
+                        self._finish_game(games.pop(game), game.result())
+
+            # let the games end on the shutdown
+            if games:
+                await asyncio.wait(games)
+            for game, matchup in games.items():
+                self._finish_game(matchup, game.result())
+            games.clear()
+            self._backlog.clear()
+            self._queued.clear()
+        finally:
+            stopping.cancel()
+            for game in games:
+                game.cancel()
@@ -0,0 +1,170 @@
+"""Elo ratings of the tournament players, and their ranking.
+
+A win rate ignores who a player has beaten. An Elo rating instead moves by
+the surprise of each result: beating a stronger player gains more than
+beating a weaker one. Ratings change a game at a time, so the players are
+kept sorted by rating in a :class:`Ranking`, where moving a player, finding
+its rank, and reading a page of the ranking take logarithmic time.
+"""
+
+from __future__ import annotations
+
+import random
+
+DEFAULT_RATING = 1500.0
+"""Rating of a player that has not played yet."""
+
+
+def expected_score(rating: float, opponent: float) -> float:
+    """Probability that a player beats an opponent, from their ratings."""
+    return 1 / (1 + 10 ** ((opponent - rating) / 400))
+
+
+def elo_update(
+    winner: float,
+    loser: float,
+    k: float = 32.0,
+) -> tuple[float, float]:
+    """Ratings of the winner and the loser of a game after the game.
+
+    Args:
+        winner: Rating of the winner before the game.
+        loser: Rating of the loser before the game.
+        k: Largest change of rating a game can make.
+    """
+    change = k * (1 - expected_score(winner, loser))
+    return winner + change, loser - change
+
+
+class _Node:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key: tuple[float, str], levels: int) -> None:
+        self.key = key
+        self.next: list[_Node | None] = [None] * levels
+        # number of positions each link skips
+        self.width = [1] * levels
+
+
+class Ranking:
+    """Players sorted by rating, highest first, ties broken by name.
+
+    The players are kept in an indexable skip list: each link of a node
+    knows how many positions it skips, so that reaching a position, or
+    counting the positions before a player, takes expected logarithmic
+    time, as does moving a player when its rating changes.
+
+    Args:
+        seed: Seed of the levels of the nodes.
+    """
+
+    max_levels = 32
+
+    def __init__(self, seed: int | None = 0) -> None:
+        self._rng = random.Random(seed)
+        self._head = _Node((float('-inf'), ''), self.max_levels)
+        self._keys: dict[str, tuple[float, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._keys
+
+    def _path(self, key: tuple[float, str]) -> tuple[list[_Node], list[int]]:
+        """Last node before key at every level, and its position."""
+        chain = [self._head] * self.max_levels
+        positions = [0] * self.max_levels
+        node, position = self._head, 0
+        for level in reversed(range(self.max_levels)):
+            while (nxt := node.next[level]) is not None and nxt.key < key:
+                position += node.width[level]
+                node = nxt
+            chain[level] = node
+            positions[level] = position
+        return chain, positions
+
+    def update(self, name: str, rating: float) -> None:
+        """Set the rating of a player, adding it if it is not ranked yet."""
+        if name in self._keys:
+            self.remove(name)
+        key = (-rating, name)
+        self._keys[name] = key
+        chain, positions = self._path(key)
+
+        levels = 1
+        # each level has half of the nodes of the level below
+        while levels < self.max_levels and self._rng.getrandbits(1):
+            levels += 1
+        node = _Node(key, levels)
+        position = positions[0] + 1
+        for level in range(levels):
+            before = chain[level]
+            node.next[level] = before.next[level]
+            before.next[level] = node
+            # the new node splits the link it is inserted in
+            skipped = position - positions[level]
+            node.width[level] = before.width[level] - skipped + 1
+            before.width[level] = skipped
+        for level in range(levels, self.max_levels):
+            chain[level].width[level] += 1
+
+    def remove(self, name: str) -> None:
+        """Remove a player from the ranking.
+
+        Raises:
+            KeyError: If the player is not ranked.
+        """
+        key = self._keys.pop(name)
+        chain, _ = self._path(key)
+        node = chain[0].next[0]
+        assert node is not None
+        for level in range(self.max_levels):
+            before = chain[level]
+            if level < len(node.next):
+                before.width[level] += node.width[level] - 1
+                before.next[level] = node.next[level]
+            else:
+                before.width[level] -= 1
+
+    def rating(self, name: str) -> float:
+        """Rating of a ranked player."""
+        return -self._keys[name][0]
+
+    def rank(self, name: str) -> int:
+        """Position of a player in the ranking, from 0 for the highest.
+
+        Raises:
+            KeyError: If the player is not ranked.
+        """
+        _, positions = self._path(self._keys[name])
+        return positions[0]
+
+    def page(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[tuple[str, float]]:
+        """Names and ratings of the players from position offset on.
+
+        Args:
+            offset: Position of the first player returned.
+            limit: Number of players returned at most, or None for all.
+        """
+        if offset < 0 or offset >= len(self):
+            return []
+        node, position = self._head, 0
+        for level in reversed(range(self.max_levels)):
+            while position + node.width[level] <= offset + 1:
+                position += node.width[level]
+                nxt = node.next[level]
+                assert nxt is not None
+                node = nxt
+
+        page: list[tuple[str, float]] = []
+        current: _Node | None = node
+        while current is not None and (limit is None or len(page) < limit):
+            rating, name = current.key
+            page.append((name, -rating))
+            current = current.next[0]
+        return page
@@ -19,9 +19,11 @@ from academy_tutorial.tournament.agent import TournamentAgent
 
 
 async def handle_rankings(request: web.Request) -> web.Response:
-    """Handler for retrieving tournament rankings."""
+    """Handler for retrieving a page of the tournament rankings."""
     tournament = request.app['tournament_agent']
-    return web.json_response(await tournament.get_players())
+    offset = int(request.query.get('offset', 0))
+    limit = int(request.query.get('limit', 100))
+    return web.json_response(await tournament.get_players(offset, limit))
 
 
 async def handle_matchups(request: web.Request) -> web.Response:
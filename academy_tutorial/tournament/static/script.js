@@ -12,11 +12,12 @@ async function fetchRankings() {
   const tbody = document.querySelector("#rankings-table tbody");
   tbody.innerHTML = "";
 
-  rankings.forEach((player, index) => {
+  rankings.forEach((player) => {
     const tr = document.createElement("tr");
     tr.innerHTML = `
-      <td>${index + 1}</td>
+      <td>${player.rank}</td>
       <td>${player.name}</td>
+      <td>${Math.round(player.rating)}</td>
       <td>${player.wins}</td>
       <td>${player.games}</td>
       <td>${(player.win_rate * 100).toFixed(1)}%</td>
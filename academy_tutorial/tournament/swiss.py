@@ -0,0 +1,84 @@
+"""Swiss-system pairing of tournament rounds.
+
+Every round of a Swiss tournament pairs players with similar scores that
+have not played each other yet, so that the ranking of n players settles
+in about log2(n) rounds instead of the n - 1 rounds of a round robin.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from collections.abc import Mapping
+from collections.abc import Sequence
+
+
+def swiss_pairs(
+    ranking: Sequence[str],
+    opponents: Mapping[str, Collection[str]],
+    byes: Collection[str] = (),
+    *,
+    rematches: bool = True,
+) -> tuple[list[tuple[str, str]], str | None]:
+    """Pair the players of a Swiss round.
+
+    Going down the ranking, each player that is not paired yet is paired
+    with the next player below it that it has not played. A player that
+    has played everyone below it gets a rematch with the next player below
+    it instead. Skipping the players that are already paired costs
+    amortized constant time, so a round takes time linear in the number of
+    players and of the rematches that are avoided.
+
+    Args:
+        ranking: Players from the highest score to the lowest.
+        opponents: Players that each player has already played, ideally
+            as sets.
+        byes: Players that have already had a bye.
+        rematches: Whether to allow rematches and byes. Otherwise, the
+            players that have played everyone below them are left
+            unpaired, and so is the last player of an odd number.
+
+    Returns:
+        The pairs, each with the higher ranked player first, and the player
+        that sits out the round, or None if the number of players is even.
+        The bye goes to the lowest ranked player that has not had one, or
+        to the lowest ranked player if they all have.
+    """
+    order = list(ranking)
+    bye = None
+    if len(order) % 2 == 1 and rematches:
+        index = next(
+            (i for i in reversed(range(len(order))) if order[i] not in byes),
+            len(order) - 1,
+        )
+        bye = order.pop(index)
+
+    n = len(order)
+    # after[i] leads to the first unpaired index from i, or to n
+    after = list(range(n + 1))
+
+    def unpaired(i: int) -> int:
+        root = i
+        while after[root] != root:
+            root = after[root]
+        while after[i] != root:
+            after[i], i = root, after[i]
+        return root
+
+    pairs: list[tuple[str, str]] = []
+    i = unpaired(0)
+    while i < n:
+        after[i] = i + 1
+        player = order[i]
+        played = opponents.get(player, ())
+        first = j = unpaired(i + 1)
+        while j < n and order[j] in played:
+            j = unpaired(j + 1)
+        if j == n:
+            if not rematches:
+                i = unpaired(i + 1)
+                continue
+            j = first
+        after[j] = j + 1
+        pairs.append((player, order[j]))
+        i = unpaired(i + 1)
+    return pairs, bye
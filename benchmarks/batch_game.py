@@ -0,0 +1,142 @@
+"""Compare moves per second of BatchGame against looping Game.attack.
+
+Usage:
+    python benchmarks/batch_game.py --games 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from academy_tutorial.battleship import BatchGame
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import Game
+
+SHIPS = (5, 5, 4, 3, 2)
+
+
+def make_board(size: int) -> Board:
+    """Board with the default fleet stacked in the top rows."""
+    board = Board(size)
+    for i, length in enumerate(SHIPS):
+        board.place_ship(Crd(2 * i, 0), length, 'horizontal')
+    return board
+
+
+def shot_orders(
+    n_games: int,
+    size: int,
+    seed: int,
+) -> npt.NDArray[np.unsignedinteger[Any]]:
+    """Random permutation of the cells for each game and player."""
+    rng = np.random.default_rng(seed)
+    keys = rng.random((n_games, 2, size * size))
+    order = np.argsort(keys, axis=2)
+    return order.astype(np.min_scalar_type(size * size - 1))
+
+
+def bench_game(
+    orders: npt.NDArray[np.unsignedinteger[Any]],
+    size: int,
+) -> float:
+    """Moves per second playing each game with Game.attack."""
+    games = [Game(make_board(size), make_board(size)) for _ in orders]
+    shots = [
+        [[Crd(*divmod(cell, size)) for cell in player] for player in game]
+        for game in orders.tolist()
+    ]
+
+    moves = 0
+    start = time.perf_counter()
+    for game, (shots_0, shots_1) in zip(games, shots):
+        players = [iter(shots_0), iter(shots_1)]
+        while game.check_winner() < 0:
+            player = game.current_turn
+            game.attack(player, next(players[player]))
+            moves += 1
+    return moves / (time.perf_counter() - start)
+
+
+def bench_batch(
+    orders: npt.NDArray[np.unsignedinteger[Any]],
+    size: int,
+    batch_size: int,
+) -> tuple[float, float]:
+    """Moves per second playing the games in batches with BatchGame.
+
+    Batches are kept small enough for the board state to stay in cache.
+
+    Returns:
+        Moves per second counting only the time spent in
+        ``BatchGame.attack_cells``, and counting the time spent choosing
+        the next move of every game as well.
+    """
+    moves = 0
+    attack_time = 0.0
+    total_time = 0.0
+    for batch_orders in np.array_split(
+        orders,
+        max(1, len(orders) // batch_size),
+    ):
+        n_games = len(batch_orders)
+        boards = [make_board(size) for _ in range(n_games)]
+        batch = BatchGame(boards, boards)
+        # the shots never repeat, so the players alternate and the shots
+        # of each game can be interleaved into the order they are played
+        flat_moves = batch_orders.transpose(0, 2, 1).reshape(-1)
+        # index of the next move of each game in flat_moves
+        first_move = np.arange(n_games, dtype=np.int64) * 2 * size * size
+        next_move = first_move.copy()
+
+        start = time.perf_counter()
+        while (batch.winner < 0).any():
+            cells = flat_moves[next_move]
+            attack_start = time.perf_counter()
+            result = batch.attack_cells(cells)
+            attack_time += time.perf_counter() - attack_start
+            next_move += result.hit
+            next_move += result.miss
+        total_time += time.perf_counter() - start
+        moves += int((next_move - first_move).sum())
+    return moves / attack_time, moves / total_time
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--loop-games', type=int, default=2_000)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    loop_rate = bench_game(
+        shot_orders(args.loop_games, args.size, args.seed),
+        args.size,
+    )
+    attack_rate, batch_rate = bench_batch(
+        shot_orders(args.games, args.size, args.seed),
+        args.size,
+        args.batch_size,
+    )
+    print(f'Game.attack loop:         {loop_rate:>14,.0f} moves/s')
+    print(
+        f'BatchGame.attack_cells:   {attack_rate:>14,.0f} moves/s '
+        f'({attack_rate / loop_rate:.1f}x)',
+    )
+    print(
+        f'BatchGame with selection: {batch_rate:>14,.0f} moves/s '
+        f'({batch_rate / loop_rate:.1f}x)',
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+"""Compare the compact wire encoding of games against plain pickle.
+
+Plays part of many games so that boards carry guesses and hits, then
+reports the payload size and the encode and decode time per object for
+``to_bytes``/``from_bytes``, for pickle with the compact encoding, which
+academy sends over the exchange once ``wire_codec`` is set, and for the
+default pickle of the object attributes, which every release can read.
+
+Usage:
+    python benchmarks/codec.py --games 2000 --moves 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import CODEC_VERSION
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import Game
+
+SHIPS = (5, 5, 4, 3, 2)
+
+
+def make_game(rng: random.Random, moves: int, bitboard: bool) -> Game:
+    """Game with random fleets and moves played."""
+    board_type = BitBoard if bitboard else Board
+    boards = [board_type.from_random_fleet(SHIPS, rng=rng) for _ in range(2)]
+    game = Game(boards[0], boards[1])
+    for _ in range(moves):
+        if game.check_winner() >= 0:
+            break
+        pos = Crd(rng.randrange(10), rng.randrange(10))
+        game.attack(game.current_turn, pos)
+    return game
+
+
+def wire_dumps(obj: Any) -> bytes:
+    """Pickle obj with the compact encoding."""
+    Board.wire_codec = Game.wire_codec = CODEC_VERSION
+    try:
+        return pickle.dumps(obj)
+    finally:
+        Board.wire_codec = Game.wire_codec = None
+
+
+def measure(
+    objs: list[Any],
+    encode: Callable[[Any], bytes],
+    decode: Callable[[bytes], Any],
+) -> tuple[float, float, float]:
+    """Mean payload size and encode and decode time in microseconds."""
+    start = time.perf_counter()
+    payloads = [encode(obj) for obj in objs]
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for payload in payloads:
+        decode(payload)
+    decode_time = time.perf_counter() - start
+
+    size = sum(len(payload) for payload in payloads) / len(objs)
+    return size, 1e6 * encode_time / len(objs), 1e6 * decode_time / len(objs)
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--moves', type=int, default=60)
+    args = parser.parse_args()
+
+    print(
+        f'{"object":>8} {"codec":>10} {"bytes":>8} '
+        f'{"encode us":>10} {"decode us":>10}',
+    )
+    for bitboard in (False, True):
+        rng = random.Random(0)
+        games = [
+            make_game(rng, args.moves, bitboard) for _ in range(args.games)
+        ]
+        board_type = BitBoard if bitboard else Board
+        cases: list[tuple[str, list[Any], type[Board] | type[Game]]] = [
+            (board_type.__name__, [g.boards[0] for g in games], board_type),
+            ('Game', games, Game),
+        ]
+        for name, objs, cls in cases:
+            for codec, encode, decode in (
+                ('to_bytes', cls.to_bytes, cls.from_bytes),
+                ('wire', wire_dumps, pickle.loads),
+                ('attributes', pickle.dumps, pickle.loads),
+            ):
+                size, enc, dec = measure(objs, encode, decode)
+                print(
+                    f'{name:>8} {codec:>10} {size:>8.0f} '
+                    f'{enc:>10.1f} {dec:>10.1f}',
+                )
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+"""Measure coordinator throughput with several games at once.
+
+Spawns a local HTTP exchange, launches two players on a thread pool, and
+times how long a coordinator takes to finish a number of games between
+them with each number of concurrent games.
+
+Usage:
+    python benchmarks/concurrent_games.py --concurrent 1 4 16 --games 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from academy.agent import action
+from academy.exchange.cloud.client import spawn_http_exchange
+from academy.handle import Handle
+from academy.manager import Manager
+
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import crd_table
+from academy_tutorial.coordinator import Coordinator
+from academy_tutorial.player import BattleshipPlayer
+from academy_tutorial.player import MultiplexedPlayer
+from academy_tutorial.replay import ReplayReader
+
+
+class RandomPlayer(MultiplexedPlayer):
+    """Random player that keeps separate state for each game."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.not_guessed: dict[int | None, list[Crd]] = {}
+
+    @action
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        """Guess a random cell that was not guessed yet."""
+        not_guessed = self.not_guessed[game_id]
+        guess = not_guessed.pop()
+        if not not_guessed:
+            del self.not_guessed[game_id]
+        return guess
+
+    @action
+    async def new_game(
+        self,
+        ships: list[int],
+        size: int = 10,
+        *,
+        game_id: int | None = None,
+    ) -> Board:
+        """Place a random fleet."""
+        self.not_guessed[game_id] = list(crd_table(size))
+        random.shuffle(self.not_guessed[game_id])
+        return Board.from_random_fleet(ships, size)
+
+
+async def run(port: int, concurrency: list[int], games: int) -> None:
+    """Time the coordinator on an exchange at port."""
+    with (
+        spawn_http_exchange('localhost', port) as factory,
+        ThreadPoolExecutor(max_workers=4) as executor,
+    ):
+        async with await Manager.from_exchange_factory(
+            factory=factory,
+            executors=executor,
+        ) as manager:
+            path = os.path.join(tempfile.mkdtemp(), 'games.replay')
+            players: tuple[Handle[BattleshipPlayer], ...] = (
+                await manager.launch(RandomPlayer),
+                await manager.launch(RandomPlayer),
+            )
+            print(f'{"concurrent":>10} {"games/min":>10} {"moves/s":>8}')
+            for concurrent in concurrency:
+                coordinator = Coordinator(
+                    *players,
+                    concurrent_games=concurrent,
+                    replay_path=path,
+                )
+                shutdown = asyncio.Event()
+                start = time.perf_counter()
+                task = asyncio.create_task(coordinator.play_games(shutdown))
+                while sum(coordinator.stats) < games:
+                    await asyncio.sleep(0.01)
+                elapsed = time.perf_counter() - start
+                shutdown.set()
+                await task
+                await coordinator.agent_on_shutdown()
+
+                with ReplayReader(path) as reader:
+                    moves = sorted(len(record.cells) for record in reader)
+                os.remove(path)
+                # games cut short by the shutdown are the shortest records
+                rate = sum(moves[-games:]) / elapsed
+                print(
+                    f'{concurrent:>10} {60 * games / elapsed:>10.1f} '
+                    f'{rate:>8.1f}',
+                )
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--concurrent',
+        type=int,
+        nargs='+',
+        default=[1, 4, 16],
+    )
+    parser.add_argument('--games', type=int, default=32)
+    parser.add_argument('--port', type=int, default=5463)
+    args = parser.parse_args()
+    asyncio.run(run(args.port, args.concurrent, args.games))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
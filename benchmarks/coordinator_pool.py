@@ -0,0 +1,130 @@
+"""Compare a coordinator agent per pair of players with a coordinator pool.
+
+Spawns a local HTTP exchange, launches pairs of players on a thread pool,
+and times how long the pairs take to play a number of games each, first
+with a :class:`Coordinator` agent launched for every pair, then with one
+:class:`CoordinatorPool` agent for all of them.
+
+Usage:
+    python benchmarks/coordinator_pool.py --pairs 8 --games 2 --port 5463
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from academy.agent import action
+from academy.exchange.cloud.client import spawn_http_exchange
+from academy.handle import Handle
+from academy.manager import Manager
+
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import crd_table
+from academy_tutorial.coordinator import Coordinator
+from academy_tutorial.coordinator import CoordinatorPool
+from academy_tutorial.player import BattleshipPlayer
+
+Pairing = tuple[Handle[BattleshipPlayer], Handle[BattleshipPlayer]]
+
+
+class RandomPlayer(BattleshipPlayer):
+    """Random player that plays one game at a time."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.not_guessed: list[Crd] = []
+
+    @action
+    async def get_move(self) -> Crd:
+        """Guess a random cell that was not guessed yet."""
+        return self.not_guessed.pop()
+
+    @action
+    async def new_game(self, ships: list[int], size: int = 10) -> Board:
+        """Place a random fleet."""
+        self.not_guessed = list(crd_table(size))
+        random.shuffle(self.not_guessed)
+        return Board.from_random_fleet(ships, size)
+
+
+async def per_pair(
+    manager: Manager[Any],
+    pairings: list[Pairing],
+    games: int,
+) -> int:
+    """Play games with a coordinator agent per pair, and return the agents."""
+    coordinators = [
+        await manager.launch(Coordinator, args=pairing) for pairing in pairings
+    ]
+    for coordinator in coordinators:
+        while sum(await coordinator.get_player_stats()) < games:
+            await asyncio.sleep(0.05)
+    for coordinator in coordinators:
+        await manager.shutdown(coordinator)
+    return len(coordinators)
+
+
+async def pooled(
+    manager: Manager[Any],
+    pairings: list[Pairing],
+    games: int,
+) -> int:
+    """Play games with one coordinator pool, and return the agents."""
+    pool = await manager.launch(
+        CoordinatorPool,
+        args=(pairings,),
+        kwargs={'games_per_pair': games},
+    )
+    while any(
+        sum(pair['wins']) < games for pair in await pool.get_pair_stats()
+    ):
+        await asyncio.sleep(0.05)
+    await manager.shutdown(pool)
+    return 1
+
+
+async def run(port: int, pairs: int, games: int) -> None:
+    """Time both ways of coordinating on an exchange at port."""
+    with (
+        spawn_http_exchange('localhost', port) as factory,
+        # every agent runs on a thread of its own
+        ThreadPoolExecutor(max_workers=3 * pairs + 1) as executor,
+    ):
+        async with await Manager.from_exchange_factory(
+            factory=factory,
+            executors=executor,
+        ) as manager:
+            pairings: list[Pairing] = [
+                (
+                    await manager.launch(RandomPlayer),
+                    await manager.launch(RandomPlayer),
+                )
+                for _ in range(pairs)
+            ]
+            print(f'{"coordinator":>11} {"agents":>7} {"seconds":>8}')
+            for name, play in (('per-pair', per_pair), ('pool', pooled)):
+                start = time.perf_counter()
+                agents = await play(manager, pairings, games)
+                elapsed = time.perf_counter() - start
+                print(f'{name:>11} {agents:>7} {elapsed:>8.2f}')
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pairs', type=int, default=8)
+    parser.add_argument('--games', type=int, default=2)
+    parser.add_argument('--port', type=int, default=5463)
+    args = parser.parse_args()
+    asyncio.run(run(args.port, args.pairs, args.games))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+"""Compare the cost of polling a game state against polling game deltas.
+
+Plays a game on boards of growing size and, after every move, measures the
+pickled size and pickling time of the whole game, as returned by
+``Coordinator.get_game_state``, and of the delta since the previous poll,
+as returned by ``Coordinator.get_game_delta``.
+
+Usage:
+    python benchmarks/game_delta.py --sizes 10 50 100 --moves 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import random
+import time
+
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import Game
+from academy_tutorial.coordinator import GameDelta
+
+SHIPS = (5, 5, 4, 3, 2)
+
+
+def poll(size: int, moves: int, rng: random.Random) -> tuple[float, ...]:
+    """Mean bytes and microseconds per poll of the state and the delta."""
+    game = Game(
+        BitBoard.from_random_fleet(SHIPS, size, rng),
+        BitBoard.from_random_fleet(SHIPS, size, rng),
+        record_events=True,
+    )
+    cells = [Crd(i // size, i % size) for i in range(size * size)]
+    rng.shuffle(cells)
+    totals = [0.0, 0.0, 0.0, 0.0]
+    version = 0
+    for pos in cells[:moves]:
+        game.attack(game.current_turn, pos)
+
+        start = time.perf_counter()
+        data = pickle.dumps(game)
+        totals[1] += time.perf_counter() - start
+        totals[0] += len(data)
+
+        start = time.perf_counter()
+        events = game.events_since(version)
+        assert events is not None
+        data = pickle.dumps(GameDelta(0, game.version, events, None))
+        totals[3] += time.perf_counter() - start
+        totals[2] += len(data)
+        version = game.version
+    return tuple(
+        total * (1e6 if i % 2 else 1) / moves for i, total in enumerate(totals)
+    )
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--moves', type=int, default=80)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(
+        f'{"size":>6} {"state B":>9} {"state us":>9} '
+        f'{"delta B":>9} {"delta us":>9}',
+    )
+    for size in args.sizes:
+        moves = min(args.moves, size * size)
+        state, state_us, delta, delta_us = poll(size, moves, rng)
+        print(
+            f'{size:>6} {state:>9.0f} {state_us:>9.1f} '
+            f'{delta:>9.0f} {delta_us:>9.1f}',
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
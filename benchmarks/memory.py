@@ -0,0 +1,90 @@
+"""Measure the memory held by each live game.
+
+Builds many games, plays part of each so that boards carry guesses and
+hits, and reports the bytes allocated per game as traced by tracemalloc.
+
+Usage:
+    python benchmarks/memory.py --games 10000 --moves 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import tracemalloc
+from collections.abc import Callable
+
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import Game
+
+SHIPS = (5, 5, 4, 3, 2)
+
+
+def make_board(size: int) -> Board:
+    """Board with the default fleet stacked in the top rows."""
+    board = Board(size)
+    for i, length in enumerate(SHIPS):
+        board.place_ship(Crd(2 * i, 0), length, 'horizontal')
+    return board
+
+
+def make_games(
+    n_games: int,
+    moves: int,
+    size: int,
+    convert: Callable[[Board], Board],
+) -> list[Game]:
+    """Create games and play random moves in each."""
+    rng = random.Random(0)
+    games = []
+    for _ in range(n_games):
+        game = Game(convert(make_board(size)), convert(make_board(size)))
+        for _ in range(moves):
+            if game.check_winner() >= 0:
+                break
+            row, col = rng.randrange(size), rng.randrange(size)
+            game.attack(game.current_turn, Crd(row, col))
+        games.append(game)
+    return games
+
+
+def bytes_per_game(
+    n_games: int,
+    moves: int,
+    size: int,
+    convert: Callable[[Board], Board],
+) -> float:
+    """Bytes allocated per live game."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = make_games(n_games, moves, size, convert)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(games) == n_games
+    return (after - before) / n_games
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=10_000)
+    parser.add_argument('--moves', type=int, default=60)
+    parser.add_argument('--size', type=int, default=10)
+    args = parser.parse_args()
+
+    for name, convert in (
+        ('Board', lambda board: board),
+        ('BitBoard', BitBoard.from_board),
+    ):
+        per_game = bytes_per_game(args.games, args.moves, args.size, convert)
+        print(f'{name:>8}: {per_game:>10,.0f} bytes per live game')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""Measure the cost of rating results and of reading the ranking.
+
+Rates a number of random games between players, keeping them sorted in a
+:class:`Ranking`, and times the updates, reading the top players, and
+finding the rank of a player, against sorting every player by rating for
+each query, as the tournament used to.
+
+Usage:
+    python benchmarks/rating.py --players 1000 10000 100000 --games 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from academy_tutorial.tournament.rating import DEFAULT_RATING
+from academy_tutorial.tournament.rating import elo_update
+from academy_tutorial.tournament.rating import Ranking
+
+
+def run(players: int, games: int, limit: int) -> None:
+    """Time the ranking of a number of players."""
+    rng = random.Random(0)
+    names = [f'player-{i}' for i in range(players)]
+    ratings = dict.fromkeys(names, DEFAULT_RATING)
+    ranking = Ranking()
+    for name in names:
+        ranking.update(name, DEFAULT_RATING)
+
+    start = time.perf_counter()
+    for _ in range(games):
+        winner, loser = rng.sample(names, 2)
+        ratings[winner], ratings[loser] = elo_update(
+            ratings[winner],
+            ratings[loser],
+        )
+        ranking.update(winner, ratings[winner])
+        ranking.update(loser, ratings[loser])
+    update = (time.perf_counter() - start) / games
+
+    queries = max(1, min(1000, 10**7 // players))
+    start = time.perf_counter()
+    for _ in range(queries):
+        ranking.page(0, limit)
+    page = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    for _ in range(queries):
+        ranking.rank(rng.choice(names))
+    rank = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    for _ in range(queries):
+        sorted(ratings, key=ratings.__getitem__, reverse=True)[:limit]
+    full_sort = (time.perf_counter() - start) / queries
+
+    print(
+        f'{players:>8} {1e6 * update:>10.1f} {1e6 * page:>8.1f} '
+        f'{1e6 * rank:>8.1f} {1e6 * full_sort:>10.1f}',
+    )
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--players',
+        type=int,
+        nargs='+',
+        default=[1000, 10_000, 100_000],
+    )
+    parser.add_argument('--games', type=int, default=10_000)
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+    print(
+        f'{"players":>8} {"update us":>10} {"page us":>8} {"rank us":>8} '
+        f'{"sort us":>10}',
+    )
+    for players in args.players:
+        run(players, args.games, args.limit)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
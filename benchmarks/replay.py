@@ -0,0 +1,87 @@
+"""Measure the write and read throughput of the replay log.
+
+Plays random games, writes their records to a log, and reports the games
+per second written and read back through the memory-mapped reader, and
+the bytes per game on disk.
+
+Usage:
+    python benchmarks/replay.py --games 10000 --path /tmp/games.replay
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import Game
+from academy_tutorial.replay import GameRecord
+from academy_tutorial.replay import GameRecorder
+from academy_tutorial.replay import ReplayReader
+from academy_tutorial.replay import ReplayWriter
+
+SHIPS = (5, 5, 4, 3, 2)
+
+
+def play(rng: random.Random) -> GameRecord:
+    """Record a game between two players that shoot at random."""
+    game = Game(
+        BitBoard.from_random_fleet(SHIPS, rng=rng),
+        BitBoard.from_random_fleet(SHIPS, rng=rng),
+    )
+    recorder = GameRecorder()
+    recorder.start(game)
+    moves = [[Crd(i // 10, i % 10) for i in range(100)] for _ in range(2)]
+    for cells in moves:
+        rng.shuffle(cells)
+    player = 0
+    while game.check_winner() < 0:
+        move = moves[player].pop()
+        recorder.move(player, move, game.attack(player, move), 1e-3)
+        player = 1 - player
+    record = recorder.finish(game.check_winner())
+    assert record is not None
+    return record
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=10_000)
+    parser.add_argument('--unique', type=int, default=100)
+    parser.add_argument('--path', default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    records = [play(rng) for _ in range(args.unique)]
+    path = args.path or os.path.join(tempfile.mkdtemp(), 'games.replay')
+    if os.path.exists(path):
+        os.remove(path)
+
+    start = time.perf_counter()
+    with ReplayWriter(path, flush=False) as log:
+        for i in range(args.games):
+            log.write(records[i % len(records)])
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ReplayReader(path) as reader:
+        moves = sum(len(record.cells) for record in reader)
+    read = time.perf_counter() - start
+
+    size = os.path.getsize(path)
+    print(f'games:         {args.games}')
+    print(f'moves:         {moves}')
+    print(f'bytes/game:    {size / args.games:.1f}')
+    print(f'write games/s: {args.games / write:,.0f}')
+    print(f'read games/s:  {args.games / read:,.0f}')
+    os.remove(path)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
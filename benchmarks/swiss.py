@@ -0,0 +1,88 @@
+"""Measure the time to pair the rounds of a large Swiss tournament.
+
+Simulates a Swiss tournament in which the higher ranked player of a pair
+wins with some probability, and reports the time to pair each round, the
+rematches it had to allow, and how close the ranking is to the strength of
+the players.
+
+Usage:
+    python benchmarks/swiss.py --players 10000 --rounds 14
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+
+from academy_tutorial.tournament.swiss import swiss_pairs
+
+
+def kendall_distance(ranking: list[int]) -> float:
+    """Fraction of pairs of a ranking of range(n) that are out of order."""
+    inversions = 0
+    # count inversions with a Fenwick tree over the strengths
+    tree = [0] * (len(ranking) + 1)
+    for seen, strength in enumerate(ranking):
+        i = strength + 1
+        smaller = 0
+        while i > 0:
+            smaller += tree[i]
+            i -= i & -i
+        inversions += seen - smaller
+        i = strength + 1
+        while i <= len(ranking):
+            tree[i] += 1
+            i += i & -i
+    pairs = len(ranking) * (len(ranking) - 1) // 2
+    return inversions / pairs
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=10_000)
+    parser.add_argument('--rounds', type=int, default=0)
+    parser.add_argument('--upset', type=float, default=0.2)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rounds = args.rounds or math.ceil(math.log2(args.players)) + 1
+    # the name of a player is its strength, higher is stronger
+    names = [str(strength) for strength in range(args.players)]
+    rng.shuffle(names)
+    scores = dict.fromkeys(names, 0)
+    opponents: dict[str, set[str]] = {name: set() for name in names}
+    byes: set[str] = set()
+
+    print(f'{"round":>5} {"ms":>8} {"rematches":>9} {"disorder":>8}')
+    for round_num in range(1, rounds + 1):
+        ranking = sorted(names, key=scores.__getitem__, reverse=True)
+        start = time.perf_counter()
+        pairs, bye = swiss_pairs(ranking, opponents, byes)
+        elapsed = time.perf_counter() - start
+
+        rematches = 0
+        for a, b in pairs:
+            rematches += b in opponents[a]
+            opponents[a].add(b)
+            opponents[b].add(a)
+            stronger, weaker = (a, b) if int(a) > int(b) else (b, a)
+            winner = weaker if rng.random() < args.upset else stronger
+            scores[winner] += 1
+        if bye is not None:
+            byes.add(bye)
+            scores[bye] += 1
+
+        ranking = sorted(names, key=scores.__getitem__, reverse=True)
+        disorder = kendall_distance([int(name) for name in reversed(ranking)])
+        print(
+            f'{round_num:>5} {1e3 * elapsed:>8.2f} {rematches:>9} '
+            f'{disorder:>8.3f}',
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
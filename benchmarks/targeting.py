@@ -0,0 +1,60 @@
+"""Measure the move latency of the density targeter on growing boards.
+
+Plays the targeter against random fleets and reports the mean and worst
+time to record a result and choose the next move, and the mean number of
+moves needed to sink the fleet.
+
+Usage:
+    python benchmarks/targeting.py --sizes 10 50 100 --games 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.targeting import DensityTargeter
+
+SHIPS = (5, 5, 4, 3, 2)
+
+
+def play(size: int, rng: random.Random, max_moves: int) -> list[float]:
+    """Time every move of one game, up to max_moves."""
+    board = BitBoard.from_random_fleet(SHIPS, size, rng)
+    targeter = DensityTargeter(SHIPS, size, rng=rng)
+    times: list[float] = []
+    while not board.all_ships_sunk() and len(times) < max_moves:
+        start = time.perf_counter()
+        move = targeter.next_move()
+        times.append(time.perf_counter() - start)
+        result = board.receive_attack(move)
+        start = time.perf_counter()
+        targeter.record(move, result)
+        times[-1] += time.perf_counter() - start
+    return times
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--max-moves', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f'{"size":>6} {"moves":>8} {"mean ms":>9} {"worst ms":>9}')
+    for size in args.sizes:
+        games = [play(size, rng, args.max_moves) for _ in range(args.games)]
+        times = [t for game in games for t in game]
+        moves = len(times) / len(games)
+        mean = 1e3 * sum(times) / len(times)
+        worst = 1e3 * max(times)
+        print(f'{size:>6} {moves:>8.1f} {mean:>9.3f} {worst:>9.3f}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
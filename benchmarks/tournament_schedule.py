@@ -0,0 +1,113 @@
+"""Measure how busy the tournament keeps players of mixed speeds.
+
+Registers in-process players with the tournament agent, some of which take
+longer over every move, plays the tournament for a number of seconds, and
+reports the games per hour and the proportion of their time that the fast
+and slow players spent in games. With a limit on the games in progress, it
+also reports the deepest backlog of matchups and how long they waited.
+
+Usage:
+    python benchmarks/tournament_schedule.py --players 16 --slow 2 --seconds 10
+    python benchmarks/tournament_schedule.py --players 256 --max-games 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import warnings
+
+from academy.agent import action
+from academy.handle import ProxyHandle
+
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import crd_table
+from academy_tutorial.player import MultiplexedPlayer
+from academy_tutorial.tournament import TournamentAgent
+
+
+class RandomPlayer(MultiplexedPlayer):
+    """Random player that takes delay seconds over every move."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.not_guessed: dict[int | None, list[Crd]] = {}
+
+    @action
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        """Guess a random cell that was not guessed yet."""
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.not_guessed[game_id].pop()
+
+    @action
+    async def new_game(
+        self,
+        ships: list[int],
+        size: int = 10,
+        *,
+        game_id: int | None = None,
+    ) -> Board:
+        """Place a random fleet."""
+        self.not_guessed[game_id] = list(crd_table(size))
+        random.shuffle(self.not_guessed[game_id])
+        return Board.from_random_fleet(ships, size)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Play a tournament and report the utilization of its players."""
+    tournament = TournamentAgent(
+        pairing=args.pairing,
+        max_concurrent_games=args.max_games,
+    )
+    for i in range(args.players):
+        player = RandomPlayer(args.delay if i < args.slow else 0.0)
+        await tournament.register_player(ProxyHandle(player), f'player-{i}')
+
+    shutdown = asyncio.Event()
+    task = asyncio.create_task(tournament.play_tournament(shutdown))
+    await asyncio.sleep(args.seconds)
+    utilization = await tournament.get_utilization()
+    queue = await tournament.get_queue_stats()
+    shutdown.set()
+    await task
+
+    busy = list(utilization['players'].values())
+    print(
+        f'{"games/hour":>10} {"fast busy":>9} {"slow busy":>9} '
+        f'{"max depth":>9} {"p99 wait":>8}',
+    )
+    print(
+        f'{utilization["games_per_hour"]:>10.0f} '
+        f'{statistics.mean(busy[args.slow :]):>9.2f} '
+        f'{statistics.mean(busy[: args.slow]) if args.slow else 0:>9.2f} '
+        f'{queue["max_depth"]:>9} {queue["wait"]["p99"]:>8.3f}',
+    )
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=16)
+    parser.add_argument('--slow', type=int, default=2)
+    parser.add_argument('--delay', type=float, default=0.01)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--max-games', type=int, default=None)
+    parser.add_argument(
+        '--pairing',
+        choices=['round_robin', 'swiss'],
+        default='swiss',
+    )
+    args = parser.parse_args()
+    # forfeits and stalls are reported as warnings for every game
+    warnings.simplefilter('ignore')
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,212 @@
+"""Measure the time per move of the turn protocols over an HTTP exchange.
+
+Spawns a local HTTP exchange, launches two players on a thread pool, and
+plays games between them with three protocols:
+
+* ``sequential``: get_move, notify_result and notify_move awaited one after
+  the other, as the coordinator used to.
+* ``fan-out``: players without take_turn, whose result notification is
+  sent in the background during the turn of the opponent.
+* ``take-turn``: one take_turn message per move.
+
+It then compares the latency of each action called by the coordinator on
+players reached through the exchange with that of the same players called
+in-process, which is the contribution of the exchange to each turn.
+
+Usage:
+    python benchmarks/turn_latency.py --games 5 --port 5463
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal
+
+from academy.agent import action
+from academy.agent import Agent
+from academy.exchange.cloud.client import spawn_http_exchange
+from academy.handle import Handle
+from academy.handle import ProxyHandle
+from academy.manager import Manager
+
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import crd_table
+from academy_tutorial.battleship import Game
+from academy_tutorial.coordinator import Coordinator
+from academy_tutorial.latency import LatencyStats
+from academy_tutorial.player import BattleshipPlayer
+from academy_tutorial.player import MultiplexedPlayer
+
+SHIPS = [5, 5, 4, 3, 2]
+
+Players = tuple[Handle[BattleshipPlayer], Handle[BattleshipPlayer]]
+
+
+class LegacyPlayer(Agent):
+    """Random player without the take_turn action."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.not_guessed: list[Crd] = []
+
+    @action
+    async def get_move(self) -> Crd:
+        """Guess a random cell that was not guessed yet."""
+        return self.not_guessed.pop()
+
+    @action
+    async def notify_result(
+        self,
+        loc: Crd,
+        result: Literal['hit', 'miss', 'guessed'],
+    ) -> None:
+        """Ignore the result."""
+
+    @action
+    async def notify_move(self, loc: Crd) -> None:
+        """Ignore the move."""
+
+    @action
+    async def new_game(self, ships: list[int], size: int = 10) -> Board:
+        """Place a random fleet."""
+        self.not_guessed = list(crd_table(size))
+        random.shuffle(self.not_guessed)
+        return Board.from_random_fleet(ships, size)
+
+
+class RandomPlayer(MultiplexedPlayer):
+    """Random player with the default take_turn action."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.not_guessed: list[Crd] = []
+
+    @action
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        """Guess a random cell that was not guessed yet."""
+        return self.not_guessed.pop()
+
+    @action
+    async def new_game(
+        self,
+        ships: list[int],
+        size: int = 10,
+        *,
+        game_id: int | None = None,
+    ) -> Board:
+        """Place a random fleet."""
+        self.not_guessed = list(crd_table(size))
+        random.shuffle(self.not_guessed)
+        return Board.from_random_fleet(ships, size)
+
+
+async def sequential(
+    players: Players,
+) -> int:
+    """Play a game with one message at a time and return its moves."""
+    boards = [await player.new_game(SHIPS) for player in players]
+    game = Game(BitBoard.from_board(boards[0]), BitBoard.from_board(boards[1]))
+    mover = 0
+    moves = 0
+    while True:
+        attack = await players[mover].get_move()
+        result = game.attack(mover, attack).result
+        await players[mover].notify_result(attack, result)
+        moves += 1
+        if game.check_winner() >= 0:
+            return moves
+        await players[1 - mover].notify_move(attack)
+        mover = 1 - mover
+
+
+async def coordinated(
+    players: Players,
+) -> int:
+    """Play a game with the coordinator and return its moves."""
+    coordinator = Coordinator(*players)
+    await coordinator.game(asyncio.Event())
+    assert coordinator.game_state is not None
+    return sum(len(board.guesses) for board in coordinator.game_state.boards)
+
+
+async def latency(players: Players, games: int) -> LatencyStats:
+    """Latency of the actions of the players over coordinated games."""
+    stats = LatencyStats()
+    for _ in range(games):
+        coordinator = Coordinator(*players)
+        await coordinator.game(asyncio.Event())
+        stats.merge(coordinator.latency)
+    return stats
+
+
+async def run(port: int, games: int) -> None:
+    """Time games of every protocol on an exchange at port."""
+    with (
+        spawn_http_exchange('localhost', port) as factory,
+        ThreadPoolExecutor(max_workers=4) as executor,
+    ):
+        async with await Manager.from_exchange_factory(
+            factory=factory,
+            executors=executor,
+        ) as manager:
+            # legacy players only differ in the actions they have
+            legacy: Players = (
+                await manager.launch(LegacyPlayer),  # type: ignore[arg-type]
+                await manager.launch(LegacyPlayer),  # type: ignore[arg-type]
+            )
+            current: Players = (
+                await manager.launch(RandomPlayer),
+                await manager.launch(RandomPlayer),
+            )
+            cases = (
+                ('sequential', sequential, current),
+                ('fan-out', coordinated, legacy),
+                ('take-turn', coordinated, current),
+            )
+
+            print(f'{"protocol":>10} {"moves":>7} {"ms/move":>9}')
+            for name, play, players in cases:
+                moves = 0
+                start = time.perf_counter()
+                for _ in range(games):
+                    moves += await play(players)
+                elapsed = time.perf_counter() - start
+                print(f'{name:>10} {moves:>7} {1e3 * elapsed / moves:>9.3f}')
+
+            local: Players = (
+                ProxyHandle(RandomPlayer()),
+                ProxyHandle(RandomPlayer()),
+            )
+            print(
+                f'\n{"players":>10} {"action":>13} '
+                f'{"p50 ms":>9} {"p99 ms":>9}',
+            )
+            for name, players in (('local', local), ('exchange', current)):
+                stats = await latency(players, games)
+                actions = stats.histograms['player_0']
+                for action_name, histogram in actions.items():
+                    print(
+                        f'{name:>10} {action_name:>13} '
+                        f'{1e3 * histogram.percentile(0.5):>9.3f} '
+                        f'{1e3 * histogram.percentile(0.99):>9.3f}',
+                    )
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=5)
+    parser.add_argument('--port', type=int, default=5463)
+    args = parser.parse_args()
+    asyncio.run(run(args.port, args.games))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -7,20 +7,24 @@ from academy.agent import action
 
 from academy_tutorial.battleship import Board
 from academy_tutorial.battleship import Crd
-from academy_tutorial.player import BattleshipPlayer
+from academy_tutorial.battleship import crd_table
+from academy_tutorial.player import GameStates
+from academy_tutorial.player import MultiplexedPlayer
 
 
-class MyBattleshipPlayer(BattleshipPlayer):
+class MyBattleshipPlayer(MultiplexedPlayer):
     def __init__(
         self,
     ) -> None:
         super().__init__()
-        self.not_guessed: set[Crd] = set()
+        # cells not guessed yet in each game
+        self.not_guessed: GameStates[set[Crd]] = GameStates(self.max_games)
 
     @action
-    async def get_move(self) -> Crd:
-        guess = random.choice(list(self.not_guessed))
-        self.not_guessed.remove(guess)
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        not_guessed = self.not_guessed[game_id]
+        guess = random.choice(list(not_guessed))
+        not_guessed.remove(guess)
         return guess
 
     @action
@@ -28,18 +32,29 @@ class MyBattleshipPlayer(BattleshipPlayer):
         self,
         loc: Crd,
         result: Literal['hit', 'miss', 'guessed'],
+        *,
+        game_id: int | None = None,
     ):
         return
 
     @action
-    async def notify_move(self, loc: Crd) -> None:
+    async def notify_move(
+        self,
+        loc: Crd,
+        *,
+        game_id: int | None = None,
+    ) -> None:
         return
 
     @action
-    async def new_game(self, ships: list[int], size: int = 10) -> Board:
-        self.not_guessed = {
-            Crd(i, j) for i in range(size) for j in range(size)
-        }
+    async def new_game(
+        self,
+        ships: list[int],
+        size: int = 10,
+        *,
+        game_id: int | None = None,
+    ) -> Board:
+        self.not_guessed.start(game_id, set(crd_table(size)))
         my_board = Board(size)
         for i, ship in enumerate(ships):
             my_board.place_ship(Crd(i, 0), ship, 'horizontal')
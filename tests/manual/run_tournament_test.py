@@ -37,7 +37,7 @@ class MyBattleshipPlayer(BattleshipPlayer):
         self,
         loc: Crd,
         result: Literal['hit', 'miss', 'guessed'],
-    ):
+    ) -> None:
         return
 
     @action
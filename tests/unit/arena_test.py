@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import pytest
+from academy.agent import action
+
+from academy_tutorial.arena import ArenaResult
+from academy_tutorial.arena import load_player
+from academy_tutorial.arena import main
+from academy_tutorial.arena import play_game
+from academy_tutorial.arena import run_arena
+from academy_tutorial.battleship import Crd
+from academy_tutorial.referee import DEFAULT_MAX_REPEATS
+from testing.agents import MyBattleshipPlayer
+
+PLAYER = 'testing.agents:MyBattleshipPlayer'
+
+
+class ExceptionPlayer(MyBattleshipPlayer):
+    @action
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        raise ValueError('Mistake')
+
+
+class RepeatingPlayer(MyBattleshipPlayer):
+    @action
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        return Crd(0, 0)
+
+
+class OffBoardPlayer(MyBattleshipPlayer):
+    @action
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        return Crd(10, 0)
+
+
+def test_load_player():
+    assert load_player(PLAYER) is MyBattleshipPlayer
+    assert load_player('testing.agents.MyBattleshipPlayer') is (
+        MyBattleshipPlayer
+    )
+    assert load_player(MyBattleshipPlayer) is MyBattleshipPlayer
+
+    with pytest.raises(TypeError, match='not a BattleshipPlayer'):
+        load_player('academy_tutorial.battleship:Board')
+
+
+@pytest.mark.asyncio
+async def test_play_game():
+    winner, moves, forfeit = await play_game(
+        MyBattleshipPlayer(),
+        MyBattleshipPlayer(),
+    )
+    assert winner in {0, 1}
+    assert 0 < moves <= 200  # noqa: PLR2004
+    assert not forfeit
+
+
+@pytest.mark.asyncio
+async def test_play_game_forfeit():
+    winner, _, forfeit = await play_game(
+        MyBattleshipPlayer(),
+        ExceptionPlayer(),
+    )
+    assert winner == 0
+    assert forfeit
+
+    winner, moves, forfeit = await play_game(
+        ExceptionPlayer(),
+        MyBattleshipPlayer(),
+    )
+    assert winner == 1
+    assert moves == 0
+    assert forfeit
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('cheat', (RepeatingPlayer, OffBoardPlayer))
+async def test_play_game_illegal_move(cheat):
+    winner, moves, forfeit = await play_game(MyBattleshipPlayer(), cheat())
+    assert winner == 0
+    assert forfeit
+    # the repeated shots do not switch turns, so the game ends quickly
+    assert moves <= 3 + DEFAULT_MAX_REPEATS
+
+    winner, _, forfeit = await play_game(
+        MyBattleshipPlayer(),
+        RepeatingPlayer(),
+        max_repeats=100,
+        max_moves=50,
+    )
+    assert winner == -1
+    assert not forfeit
+
+
+@pytest.mark.asyncio
+async def test_play_game_draw():
+    winner, moves, forfeit = await play_game(
+        MyBattleshipPlayer(),
+        MyBattleshipPlayer(),
+        max_moves=10,
+    )
+    assert winner == -1
+    assert moves == 10  # noqa: PLR2004
+    assert not forfeit
+
+
+def test_arena_result():
+    result = ArenaResult(('a', 'b'), wins=[60, 40])
+    assert result.games == 100  # noqa: PLR2004
+    assert result.win_rate(0) == pytest.approx(0.6)
+
+    low, high = result.confidence_interval(0)
+    assert low < 0.6 < high  # noqa: PLR2004
+    wide_low, wide_high = result.confidence_interval(0, confidence=0.99)
+    assert wide_low < low
+    assert wide_high > high
+
+    result.merge(ArenaResult(('a', 'b'), wins=[1, 2], draws=3, moves=10))
+    assert result.wins == [61, 42]
+    assert result.games == 106  # noqa: PLR2004
+    assert 'Player 0 (a)' in result.summary()
+
+
+def test_run_arena_forfeits():
+    result = run_arena(MyBattleshipPlayer, ExceptionPlayer, 10, workers=1)
+    assert result.wins == [10, 0]
+    assert result.forfeits == [0, 10]
+
+
+def test_run_arena_deterministic():
+    serial = run_arena(PLAYER, PLAYER, 40, seed=1, workers=1, batch_size=8)
+    parallel = run_arena(PLAYER, PLAYER, 40, seed=1, workers=2, batch_size=8)
+    assert serial.games == 40  # noqa: PLR2004
+    assert serial == parallel
+
+    other = run_arena(PLAYER, PLAYER, 40, seed=2, workers=1, batch_size=8)
+    assert (serial.wins, serial.moves) != (other.wins, other.moves)
+
+
+def test_main(capsys):
+    assert main([PLAYER, PLAYER, '--games', '4', '--workers', '1']) == 0
+    captured = capsys.readouterr()
+    assert 'won' in captured.out
+    assert 'mean game length' in captured.out
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+import pickle
+import random
+
+import numpy as np
 import pytest
 
+from academy_tutorial.battleship import AttackResult
+from academy_tutorial.battleship import BatchGame
+from academy_tutorial.battleship import BitBoard
 from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import CODEC_VERSION
 from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import crd_table
 from academy_tutorial.battleship import Game
+from academy_tutorial.battleship import placement_index
+from academy_tutorial.battleship import random_fleet
 from academy_tutorial.battleship import Ship
 
 
@@ -16,12 +27,76 @@ def test_ship_sinks():
 
     ship.register_hit(Crd(1, 0))
     assert len(ship.hits) == 1
+    assert isinstance(ship.hits, frozenset)
 
     ship.register_hit(Crd(0, 0))
     ship.register_hit(Crd(2, 0))
     assert ship.is_sunk
 
 
+def test_crd_table():
+    table = crd_table(4)
+    assert len(table) == 16  # noqa: PLR2004
+    assert table[1 * 4 + 3] == Crd(1, 3)
+    assert crd_table(4) is table
+
+    board = Board(4)
+    ship = board.place_ship(Crd(1, 1), 2, 'vertical')
+    assert ship is not None
+    assert ship.positions[1] is table[2 * 4 + 1]
+
+
+def test_placement_index():
+    index = placement_index(10, 5)
+    assert placement_index(10, 5) is index
+    assert len(index) == 2 * 10 * 6
+    assert index.cells.shape == (len(index), 100)
+    assert (index.cells.sum(axis=1) == 5).all()  # noqa: PLR2004
+
+    for placement, mask in zip(index.placements, index.masks):
+        board = BitBoard()
+        ship = board.place_ship(*placement)
+        assert ship is not None
+        assert board.occupied == mask
+
+    occupied = index.masks[0]
+    available = index.available(occupied)
+    assert 0 not in available
+    assert all(not index.masks[i] & occupied for i in available)
+    assert len(placement_index(3, 4)) == 0
+
+
+def test_random_fleet_uniform():
+    rng = random.Random(0)
+    counts: dict[tuple[int, ...], int] = {}
+    for _ in range(4000):
+        fleet = random_fleet((2, 2), size=3, rng=rng)
+        key = tuple(placement_index(3, 2).placements.index(p) for p in fleet)
+        counts[key] = counts.get(key, 0) + 1
+
+    masks = placement_index(3, 2).masks
+    valid = [
+        (i, j) for i in range(12) for j in range(12) if not masks[i] & masks[j]
+    ]
+    assert sorted(counts) == valid
+    assert min(counts.values()) > 0.5 * 4000 / len(counts)
+    assert max(counts.values()) < 1.5 * 4000 / len(counts)
+
+
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_board_from_random_fleet(board_type):
+    board = board_type.from_random_fleet([5, 4, 3, 3, 2], rng=random.Random(1))
+    assert type(board) is board_type
+    assert [s.length for s in board.ships] == [5, 4, 3, 3, 2]
+    assert board.remaining == 17  # noqa: PLR2004
+    assert board.occupied.bit_count() == 17  # noqa: PLR2004
+
+    with pytest.raises(ValueError, match='Could not place'):
+        random_fleet([3, 3, 3, 3], size=3)
+    with pytest.raises(ValueError, match='Could not place'):
+        random_fleet([4], size=3)
+
+
 def test_ship_repr():
     crds = [Crd(i, 0) for i in range(3)]
     ship = Ship(crds)
@@ -29,8 +104,9 @@ def test_ship_repr():
     assert str(len(crds)) in str(ship)
 
 
-def test_board_place_and_sink():
-    board = Board()
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_board_place_and_sink(board_type):
+    board = board_type()
 
     ship = board.place_ship(Crd(0, 0), 2, 'horizontal')
     assert ship is not None
@@ -48,22 +124,25 @@ def test_board_place_and_sink():
     assert board.all_ships_sunk()
 
 
-def test_board_ship_overlap():
-    board = Board()
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_board_ship_overlap(board_type):
+    board = board_type()
     board.place_ship(Crd(0, 0), 2, 'vertical')
 
     ship = board.place_ship(Crd(1, 0), 2, 'horizontal')
     assert ship is None
 
 
-def test_board_ship_diagonal():
-    board = Board()
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_board_ship_diagonal(board_type):
+    board = board_type()
     with pytest.raises(ValueError, match='Invalid direction'):
-        board.place_ship(Crd(0, 0), 2, 'diagonal')  # type: ignore[arg-type]
+        board.place_ship(Crd(0, 0), 2, 'diagonal')
 
 
-def test_board_out_of_bounds():
-    board = Board()
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_board_out_of_bounds(board_type):
+    board = board_type()
     ship = board.place_ship(Crd(0, 9), 2, 'horizontal')
     assert ship is None
 
@@ -71,28 +150,414 @@ def test_board_out_of_bounds():
     assert ship is None
 
 
-def test_game():
-    board = Board()
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+@pytest.mark.parametrize('direction', ('horizontal', 'vertical'))
+@pytest.mark.parametrize('start', (Crd(10, 0), Crd(0, 12), Crd(-1, 0)))
+def test_board_start_off_board(board_type, direction, start):
+    board = board_type()
+    assert board.place_ship(start, 3, direction) is None
+    assert board.ships == []
+    assert board.occupied == 0
+
+
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_game(board_type):
+    board = board_type()
     board.place_ship(Crd(0, 0), 2, 'vertical')
 
-    board_2 = Board()
+    board_2 = board_type()
     board_2.place_ship(Crd(0, 0), 2, 'vertical')
 
     game = Game(board, board_2)
     assert game.current_turn == 0
 
-    result = game.attack(0, Crd(0, 0))
+    result, sunk = game.attack(0, Crd(0, 0))
     assert result == 'hit'
+    assert sunk is None
     assert game.current_turn == 1
     assert game.check_winner() == -1
 
-    result = game.attack(1, Crd(0, 0))
+    result, _ = game.attack(1, Crd(0, 0))
     assert result == 'hit'
     assert game.current_turn == 0
     assert game.check_winner() == -1
 
-    result = game.attack(0, Crd(0, 0))
+    result, _ = game.attack(0, Crd(0, 0))
     assert result == 'guessed'
     assert game.current_turn == 0
-    assert game.attack(0, Crd(1, 0))
+    result, sunk = game.attack(0, Crd(1, 0))
+    assert result == 'hit'
+    assert sunk is board_2.ships[0]
     assert game.check_winner() == 0
+
+
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_board_resolve_attack(board_type):
+    board = board_type()
+    board.place_ship(Crd(0, 0), 2, 'horizontal')
+    board.place_ship(Crd(2, 0), 3, 'horizontal')
+    assert board.remaining == 5  # noqa: PLR2004
+
+    assert board.resolve_attack(Crd(0, 0)) == ('hit', None)
+    assert board.resolve_attack(Crd(0, 0)) == ('guessed', None)
+    assert board.resolve_attack(Crd(5, 5)) == ('miss', None)
+    assert board.resolve_attack(Crd(0, 1)) == ('hit', board.ships[0])
+    assert board.remaining == 3  # noqa: PLR2004
+    assert not board.all_ships_sunk()
+
+
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_board_pickle(board_type):
+    board = board_type()
+    board.place_ship(Crd(0, 0), 2, 'horizontal')
+    board.receive_attack(Crd(0, 0))
+    game = Game(board, board_type())
+    assert not hasattr(board, '__dict__')
+    assert not hasattr(game, '__dict__')
+
+    game = pickle.loads(pickle.dumps(game))
+    board = game.boards[0]
+    assert board.guesses == {Crd(0, 0)}
+    assert board.ships[0].hits == {Crd(0, 0)}
+    assert board.receive_attack(Crd(0, 1)) == 'hit'
+    assert board.all_ships_sunk()
+
+
+def test_bitboard_pickles_as_board():
+    board = BitBoard()
+    board.place_ship(Crd(0, 0), 2, 'horizontal')
+    board.receive_attack(Crd(0, 1))
+    board.receive_attack(Crd(-1, 12))
+    data = pickle.dumps(board)
+    assert b'BitBoard' not in data
+    assert b'_ship_of' not in data
+
+    decoded = pickle.loads(data)
+    assert type(decoded) is Board
+    assert decoded.guesses == board.guesses
+    assert decoded.remaining == board.remaining == 1
+    assert decoded.occupied == board.occupied
+    assert BitBoard.from_board(decoded).to_bytes() == board.to_bytes()
+
+
+# Game of two 3x3 boards pickled with protocol 4 by the release before the
+# classes had slots, after player 0 hit at (1, 1) and player 1 missed.
+_LEGACY_GAME = (
+    b'\x80\x04\x954\x01\x00\x00\x00\x00\x00\x00\x8c\x1bacademy_tut'
+    b'orial.battleship\x94\x8c\x04Game\x94'
+    b'\x93\x94)\x81\x94}\x94(\x8c\x06boards\x94]\x94(h\x00\x8c\x05'
+    b'Board\x94\x93\x94)\x81\x94}\x94(\x8c\x04size\x94K\x03\x8c'
+    b'\x05ships\x94]\x94h\x00\x8c\x04Ship\x94\x93\x94)\x81\x94}'
+    b'\x94(\x8c\x06length\x94K\x02\x8c\tpositions'
+    b'\x94]\x94(h\x00\x8c\x03Crd\x94\x93\x94K\x00K\x00\x86\x94\x81\x94h\x16'
+    b'K\x00K\x01\x86\x94\x81\x94e\x8c\x04hits\x94\x8f\x94uba\x8c\x07g'
+    b'uesses\x94\x8f\x94(h\x16K\x02K\x02\x86\x94\x81\x94\x90ubh'
+    b'\x08)\x81\x94}\x94(h\x0bK\x03h\x0c]\x94h\x0f)\x81\x94}\x94(h'
+    b'\x12K\x02h\x13]\x94(h\x16K\x01K\x01\x86\x94\x81\x94h\x16K\x02K\x01'
+    b'\x86\x94\x81\x94eh\x1b\x8f\x94(h\x16K\x01K\x01\x86\x94\x81\x94\x90uba'
+    b'h\x1d\x8f\x94(h-\x90ube\x8c\x0ccurrent_tur'
+    b'n\x94K\x00ub.'
+)
+
+
+def test_game_legacy_pickle():
+    game = pickle.loads(_LEGACY_GAME)
+    assert game.current_turn == 0
+    assert game.winner == -1
+    assert game.version == 0
+    board = game.boards[1]
+    assert board.guesses == {Crd(1, 1)}
+    assert board.ships[0].positions == (Crd(1, 1), Crd(2, 1))
+    assert board.ships[0].hits == {Crd(1, 1)}
+    assert board.occupied == 1 << 4 | 1 << 7
+    assert board.remaining == 1
+    assert game.boards[0].guesses == {Crd(2, 2)}
+    assert game.boards[0].remaining == 2  # noqa: PLR2004
+
+    assert game.attack(0, Crd(2, 1)) == ('hit', board.ships[0])
+    assert game.check_winner() == 0
+    game = pickle.loads(pickle.dumps(game))
+    assert game.check_winner() == 0
+    assert game.boards[1].all_ships_sunk()
+
+
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_board_pickle_wire_codec(board_type, monkeypatch):
+    board = _full_fleet(board_type)
+    board.receive_attack(Crd(0, 0))
+    game = Game(board, _full_fleet(board_type))
+    assert Board().__getstate__().keys() == {'size', 'ships', 'guesses'}
+    assert Ship([Crd(0, 0)]).__getstate__()['hits'] == set()
+    plain = pickle.dumps(game)
+    assert b'_from_wire' not in plain
+    assert b'_hit_mask' not in plain
+
+    monkeypatch.setattr(Board, 'wire_codec', CODEC_VERSION)
+    monkeypatch.setattr(Game, 'wire_codec', CODEC_VERSION)
+    data = pickle.dumps(game)
+    assert len(data) < len(plain) // 4
+    decoded = pickle.loads(data)
+    assert decoded.to_bytes() == game.to_bytes()
+    assert type(decoded.boards[0]) is board_type
+
+    monkeypatch.setattr(
+        'academy_tutorial.battleship.CODEC_VERSION',
+        CODEC_VERSION + 1,
+    )
+    with pytest.raises(ValueError, match='Can not decode'):
+        pickle.loads(data)
+    with pytest.raises(ValueError, match='Unknown wire codec'):
+        pickle.dumps(board)
+
+
+def test_crd_codec():
+    assert Crd.from_bytes(Crd(3, -4).to_bytes()) == Crd(3, -4)
+
+
+def _full_fleet(board_type: type[Board]) -> Board:
+    board = board_type()
+    for i, length in enumerate((5, 5, 4, 3)):
+        board.place_ship(Crd(2 * i, 0), length, 'horizontal')
+    board.place_ship(Crd(2, 9), 2, 'vertical')
+    assert len(board.ships) == 5  # noqa: PLR2004
+    return board
+
+
+@pytest.mark.parametrize('board_type', (Board, BitBoard))
+def test_board_codec(board_type):
+    board = _full_fleet(board_type)
+    for pos in (Crd(0, 0), Crd(3, 3), Crd(2, 9), Crd(2, 7), Crd(-1, 12)):
+        board.receive_attack(pos)
+
+    data = board.to_bytes()
+    assert len(data) == 2 + 5 * 3 + 13 + 8
+    decoded = board_type.from_bytes(data)
+    assert type(decoded) is board_type
+    assert decoded.to_bytes() == data
+    assert decoded.guesses == board.guesses
+    assert decoded.remaining == board.remaining
+    for ship, expected in zip(decoded.ships, board.ships):
+        assert ship.positions == expected.positions
+        assert ship.hits == expected.hits
+    assert decoded.receive_attack(Crd(-1, 12)) == 'guessed'
+    assert decoded.receive_attack(Crd(3, 9)) == 'hit'
+    assert decoded.ships[4].is_sunk
+
+
+def test_board_codec_invalid():
+    data = _full_fleet(Board).to_bytes()
+    with pytest.raises(ValueError, match='Invalid board encoding'):
+        Board.from_bytes(data[:10])
+    with pytest.raises(ValueError, match='Invalid guess mask'):
+        Board.from_bytes(data[:-1])
+    with pytest.raises(ValueError, match='Invalid ship placement'):
+        Board.from_bytes(data[:2] + data[2:5] * 2 + data[8:])
+
+    board = Board()
+    board.ships.append(Ship([Crd(0, 0), Crd(1, 1)]))
+    with pytest.raises(ValueError, match='not a straight line'):
+        board.to_bytes()
+    board = pickle.loads(pickle.dumps(board))
+    assert board.ships[0].positions == (Crd(0, 0), Crd(1, 1))
+
+
+def test_game_codec():
+    game = Game(BitBoard.from_board(_fleet(0)), _fleet(1))
+    game.attack(0, Crd(1, 0))
+    game.attack(1, Crd(5, 5))
+
+    decoded = Game.from_bytes(game.to_bytes())
+    assert [type(board) for board in decoded.boards] == [BitBoard, Board]
+    assert decoded.current_turn == 0
+    assert decoded.version == 2  # noqa: PLR2004
+    assert decoded.boards[1].guesses == {Crd(1, 0)}
+
+    game.winner = 1
+    decoded = pickle.loads(pickle.dumps(game))
+    assert decoded.check_winner() == 1
+    with pytest.raises(ValueError, match='Invalid game encoding'):
+        Game.from_bytes(b'')
+
+
+def test_game_events():
+    game = Game(
+        BitBoard.from_board(_fleet(0)),
+        BitBoard.from_board(_fleet(1)),
+        record_events=True,
+    )
+    copy = Game.from_bytes(game.to_bytes())
+    for player, pos in ((0, Crd(1, 0)), (1, Crd(5, 5)), (1, Crd(5, 5))):
+        game.attack(player, pos)
+
+    assert game.version == 3  # noqa: PLR2004
+    assert game.events is not None
+    assert [event.result for event in game.events] == [
+        'hit',
+        'miss',
+        'guessed',
+    ]
+    assert game.events_since(3) == []
+    events = game.events_since(1)
+    assert events is not None
+    assert [event.version for event in events] == [2, 3]
+
+    copy.apply(game.events_since(0) or [])
+    copy.apply(events)
+    assert copy.version == game.version
+    assert copy.to_bytes() == game.to_bytes()
+    # copies only follow the events, without recording them
+    assert copy.events is None
+    assert copy.events_since(3) is None
+
+    for decoded in (
+        Game.from_bytes(game.to_bytes()),
+        pickle.loads(pickle.dumps(game)),
+    ):
+        assert decoded.version == game.version
+        assert decoded.events_since(3) is None
+    with pytest.raises(ValueError, match='does not follow'):
+        Game.from_bytes(copy.to_bytes()).apply(
+            [game.events[0]._replace(version=5)],
+        )
+    with pytest.raises(ValueError, match='on this game'):
+        Game(_fleet(0), _fleet(1)).apply(
+            [game.events[0]._replace(result='miss')],
+        )
+
+
+def test_game_already_won():
+    board = Board()
+    board.place_ship(Crd(0, 0), 2, 'horizontal')
+
+    assert Game(Board(), board).check_winner() == 1
+    assert Game(board, Board()).check_winner() == 0
+
+
+def test_bitboard_guesses():
+    board = BitBoard()
+    board.place_ship(Crd(2, 3), 3, 'vertical')
+
+    assert board.receive_attack(Crd(3, 3)) == 'hit'
+    assert board.receive_attack(Crd(9, 9)) == 'miss'
+    assert str(board) == Board.__repr__(board)
+    assert board.receive_attack(Crd(10, 0)) == 'miss'
+    assert board.receive_attack(Crd(10, 0)) == 'guessed'
+    assert board.guesses == {Crd(3, 3), Crd(9, 9), Crd(10, 0)}
+    assert board.ships[0].hits == {Crd(3, 3)}
+    assert isinstance(board.guesses, frozenset)
+
+
+def test_bitboard_from_board():
+    board = Board()
+    board.place_ship(Crd(0, 0), 5, 'horizontal')
+    board.place_ship(Crd(1, 0), 2, 'vertical')
+    board.receive_attack(Crd(0, 0))
+
+    bitboard = BitBoard.from_board(board)
+    assert BitBoard.from_board(bitboard) is bitboard
+    assert [s.length for s in bitboard.ships] == [5, 2]
+    assert bitboard.receive_attack(Crd(0, 0)) == 'guessed'
+    assert bitboard.receive_attack(Crd(2, 0)) == 'hit'
+    assert bitboard.receive_attack(Crd(1, 0)) == 'hit'
+    assert bitboard.ships[1].is_sunk
+    assert not bitboard.all_ships_sunk()
+
+
+def test_bitboard_from_board_invalid():
+    board = Board()
+    board.ships.append(Ship([Crd(0, 10), Crd(0, 11)]))
+    with pytest.raises(ValueError, match='Invalid ship placement'):
+        BitBoard.from_board(board)
+
+    board = Board()
+    board.ships.append(Ship([Crd(0, 0), Crd(0, 1)]))
+    board.ships.append(Ship([Crd(0, 1), Crd(1, 1)]))
+    with pytest.raises(ValueError, match='Invalid ship placement'):
+        BitBoard.from_board(board)
+
+
+def _fleet(row: int) -> Board:
+    board = Board()
+    board.place_ship(Crd(row, 0), 3, 'horizontal')
+    board.place_ship(Crd(0, 9), 2, 'vertical')
+    return board
+
+
+def test_batch_game_matches_game():
+    rng = np.random.default_rng(0)
+    n_games = 16
+    boards_0 = [_fleet(i % 10) for i in range(n_games)]
+    boards_1 = [_fleet(9 - i % 10) for i in range(n_games)]
+    games = [Game(_fleet(i % 10), _fleet(9 - i % 10)) for i in range(n_games)]
+    batch = BatchGame(boards_0, boards_1)
+
+    for _ in range(200):
+        moves = rng.integers(0, 10, size=(n_games, 2))
+        expected: list[AttackResult | None] = []
+        for game, (row, col) in zip(games, moves):
+            if game.check_winner() >= 0:
+                expected.append(None)
+            else:
+                player = game.current_turn
+                expected.append(game.attack(player, Crd(row, col)))
+
+        result = batch.attack(moves)
+        for i, (game, attack) in enumerate(zip(games, expected)):
+            if attack is None:
+                assert not result.hit[i]
+                assert not result.miss[i]
+                continue
+            outcome, sunk = attack
+            assert result.hit[i] == (outcome == 'hit')
+            assert result.miss[i] == (outcome == 'miss')
+            assert result.guessed[i] == (outcome == 'guessed')
+            assert result.sunk[i] == (sunk is not None)
+            assert batch.current_turn[i] == game.current_turn
+            assert result.winner[i] == game.check_winner()
+
+    assert (batch.check_winner() >= 0).any()
+    # moves sent to finished games do not mark their boards
+    for i, game in enumerate(games):
+        for player, board in enumerate(game.boards):
+            guessed = {
+                Crd(*divmod(int(cell), 10))
+                for cell in np.flatnonzero(batch.guessed[i, player])
+            }
+            assert guessed == board.guesses
+
+
+def test_batch_game_sunk():
+    board = Board()
+    board.place_ship(Crd(0, 0), 2, 'horizontal')
+    board.place_ship(Crd(5, 5), 2, 'horizontal')
+    batch = BatchGame([board], [board])
+
+    result = batch.attack([[0, 0]])
+    assert result.hit[0]
+    assert not result.sunk[0]
+    batch.attack([[9, 9]])
+    result = batch.attack([[0, 1]])
+    assert result.sunk[0]
+    assert result.winner[0] == -1
+
+    batch.attack([[9, 8]])
+    result = batch.attack([[0, 1]])
+    assert result.guessed[0]
+    assert batch.current_turn[0] == 0
+
+
+def test_batch_game_invalid():
+    with pytest.raises(ValueError, match='number of boards'):
+        BatchGame([Board()], [])
+    with pytest.raises(ValueError, match='same size'):
+        BatchGame([Board(5)], [Board(10)])
+
+    batch = BatchGame([_fleet(0)], [_fleet(0)])
+    with pytest.raises(ValueError, match='shape'):
+        batch.attack([[0, 0], [0, 0]])
+    with pytest.raises(ValueError, match='outside of the board'):
+        batch.attack([[0, 10]])
+    with pytest.raises(ValueError, match='outside of the board'):
+        batch.attack_cells(np.array([100], dtype=np.uint8))
+    with pytest.raises(ValueError, match='integer cells'):
+        batch.attack_cells([1.0])
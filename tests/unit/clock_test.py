@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from academy_tutorial.clock import _wait_for
+from academy_tutorial.clock import ClockExpiredError
+from academy_tutorial.clock import TimeBank
+
+
+@pytest.mark.asyncio
+async def test_time_bank_spend():
+    bank = TimeBank(1.0, increment=0.5)
+    assert await bank.spend(asyncio.sleep(0.05, 'x')) == 'x'
+    assert 0 < bank.remaining <= 0.95  # noqa: PLR2004
+
+    remaining = bank.remaining
+    bank.add_increment()
+    assert bank.remaining == pytest.approx(remaining + 0.5)
+
+
+async def _slow(cancelled: asyncio.Event) -> None:
+    try:
+        await asyncio.sleep(1)
+    except asyncio.CancelledError:
+        cancelled.set()
+        raise
+
+
+@pytest.mark.asyncio
+async def test_time_bank_expired():
+    bank = TimeBank(0.05)
+    cancelled = asyncio.Event()
+    with pytest.raises(ClockExpiredError):
+        await bank.spend(_slow(cancelled))
+    assert cancelled.is_set()
+    assert bank.remaining == 0
+
+    with pytest.raises(ClockExpiredError):
+        await bank.spend(asyncio.sleep(0.01))
+
+
+@pytest.mark.asyncio
+async def test_wait_for_timeout():
+    # the timeout before Python 3.11, which the bank turns into an expiry
+    assert await _wait_for(asyncio.sleep(0, 'x'), 0.05) == 'x'
+    cancelled = asyncio.Event()
+    with pytest.raises(asyncio.TimeoutError):
+        await _wait_for(_slow(cancelled), 0.05)
+    assert cancelled.is_set()
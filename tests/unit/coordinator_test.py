@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import io
+import pickle
+import random
+from collections import Counter
+from typing import Any
 
 import pytest
+from academy.agent import action
 from academy.handle import ProxyHandle
 
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
 from academy_tutorial.coordinator import Coordinator
+from academy_tutorial.coordinator import CoordinatorPool
 from testing.agents import MyBattleshipPlayer
 
 
@@ -45,6 +54,30 @@ async def test_coordinator_game(coordinator):
     assert state.boards[loser].all_ships_sunk()
 
 
+class BaselineUnpickler(pickle.Unpickler):
+    # the classes of the game module that earlier releases have
+    baseline = frozenset(('Board', 'Crd', 'Game', 'Ship'))
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module == 'academy_tutorial.battleship' and name in self.baseline:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f'{module}.{name} is not in baseline.')
+
+
+@pytest.mark.asyncio
+async def test_coordinator_game_state_pickle(coordinator):
+    await coordinator.game(asyncio.Event())
+    state = await coordinator.get_game_state()
+
+    data = pickle.dumps(state)
+    game = BaselineUnpickler(io.BytesIO(data)).load()
+    assert [type(board) for board in game.boards] == [Board, Board]
+    assert game.check_winner() == state.check_winner()
+    for board, sent in zip(game.boards, state.boards):
+        assert board.guesses == sent.guesses
+        assert board.remaining == sent.remaining
+
+
 @pytest.mark.asyncio
 async def test_coordinator_play_games(coordinator):
     shutdown_event = asyncio.Event()
@@ -55,3 +88,220 @@ async def test_coordinator_play_games(coordinator):
 
     shutdown_event.set()
     await task
+
+
+class RecordingPlayer(MyBattleshipPlayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.game_ids: list[int | None] = []
+
+    @action
+    async def new_game(self, ships, size=10, *, game_id=None) -> Board:
+        self.game_ids.append(game_id)
+        # yield so that the other games start in between
+        await asyncio.sleep(0)
+        return await super().new_game(ships, size, game_id=game_id)
+
+
+class RandomFleetPlayer(MyBattleshipPlayer):
+    def __init__(self, seed: int) -> None:
+        super().__init__()
+        self.rng = random.Random(seed)
+
+    @action
+    async def new_game(self, ships, size=10, *, game_id=None) -> Board:
+        await super().new_game(ships, size, game_id=game_id)
+        return Board.from_random_fleet(ships, size, rng=self.rng)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_random_fleets():
+    coordinator = Coordinator(
+        ProxyHandle(RandomFleetPlayer(0)),
+        ProxyHandle(RandomFleetPlayer(1)),
+    )
+    for _ in range(3):
+        winner = await coordinator.game(asyncio.Event())
+        assert winner in {0, 1}
+        state = coordinator.game_state
+        assert state is not None
+        assert state.boards[1 - winner].all_ships_sunk()
+        assert state.boards[0].occupied != state.boards[1].occupied
+
+
+@pytest.mark.asyncio
+async def test_coordinator_concurrent_games():
+    players = (RecordingPlayer(), RecordingPlayer())
+    coordinator = Coordinator(
+        ProxyHandle(players[0]),
+        ProxyHandle(players[1]),
+        concurrent_games=4,
+    )
+    shutdown_event = asyncio.Event()
+    task = asyncio.create_task(coordinator.play_games(shutdown_event))
+    await asyncio.sleep(0.2)
+    shutdown_event.set()
+    await task
+
+    game_ids = players[0].game_ids
+    assert Counter(game_ids) == Counter(players[1].game_ids)
+    assert len(set(game_ids)) == len(game_ids)
+    assert None not in game_ids
+    # every game that was not interrupted by the shutdown was counted
+    stats = await coordinator.get_player_stats()
+    assert len(game_ids) - 4 <= sum(stats) <= len(game_ids)
+    assert sum(stats) > 4  # noqa: PLR2004
+
+
+def test_coordinator_game_limit():
+    players = (
+        ProxyHandle(MyBattleshipPlayer()),
+        ProxyHandle(MyBattleshipPlayer()),
+    )
+    games = MyBattleshipPlayer.max_games + 1
+    with pytest.raises(ValueError, match='at most'):
+        Coordinator(*players, concurrent_games=games)
+
+    # a shared player is only in one game of each of its pairings
+    pairings = [players, (players[0], ProxyHandle(MyBattleshipPlayer()))]
+    CoordinatorPool(pairings, max_concurrent_games=games)
+    with pytest.raises(ValueError, match='at most'):
+        CoordinatorPool(pairings * games, max_concurrent_games=games)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_game_delta(coordinator):
+    assert await coordinator.get_game_delta() is None
+
+    shutdown_event = asyncio.Event()
+    await coordinator.game(shutdown_event)
+    delta = await coordinator.get_game_delta()
+    assert delta.game == 0
+    assert delta.snapshot is coordinator.game_state
+
+    delta = await coordinator.get_game_delta(0, game=0)
+    assert delta.snapshot is None
+    assert len(delta.events) == delta.version
+    latest = await coordinator.get_game_delta(delta.version, game=0)
+    assert latest.events == []
+    assert latest.snapshot is None
+
+    await coordinator.game(shutdown_event)
+    delta = await coordinator.get_game_delta(latest.version, game=0)
+    assert delta.game == 1
+    assert delta.events == []
+    assert delta.snapshot is coordinator.game_state
+
+
+@pytest.mark.asyncio
+async def test_coordinator_latency_stats(coordinator):
+    assert await coordinator.get_latency_stats() == {}
+    await coordinator.game(asyncio.Event())
+
+    stats = await coordinator.get_latency_stats()
+    assert set(stats) == {'player_0', 'player_1'}
+    for actions in stats.values():
+        assert actions['new_game']['count'] == 1
+        assert actions['take_turn']['count'] > 1
+        assert 'get_move' not in actions
+    turns = sum(stats[p]['take_turn']['count'] for p in stats)
+    assert turns == coordinator.game_state.version
+
+
+@pytest.mark.asyncio
+async def test_coordinator_pool(monkeypatch):
+    pairings = [
+        (ProxyHandle(RecordingPlayer()), ProxyHandle(RecordingPlayer()))
+        for _ in range(5)
+    ]
+    pool = CoordinatorPool(pairings, games_per_pair=3, max_concurrent_games=2)
+    assert not pool.multiplexed
+
+    active = 0
+    most_active = 0
+    for coordinator in pool.coordinators:
+        game = coordinator.game
+
+        async def counted_game(*args, game=game):
+            nonlocal active, most_active
+            active += 1
+            most_active = max(most_active, active)
+            try:
+                return await game(*args)
+            finally:
+                active -= 1
+
+        monkeypatch.setattr(coordinator, 'game', counted_game)
+
+    await pool.play_games(asyncio.Event())
+    assert most_active == 2  # noqa: PLR2004
+
+    stats = await pool.get_pair_stats()
+    assert len(stats) == len(pairings)
+    for pair, (player_0, _) in zip(stats, pairings):
+        assert pair['games'] == 3  # noqa: PLR2004
+        assert sum(pair['wins']) == 3  # noqa: PLR2004
+        assert pair['latency']['player_0']['new_game']['count'] == 3  # noqa: PLR2004
+        assert player_0.agent.game_ids == [None, None, None]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_pool_shared_player():
+    shared = ProxyHandle(RecordingPlayer())
+    pairings = [(shared, ProxyHandle(RecordingPlayer())) for _ in range(3)]
+    pool = CoordinatorPool(pairings, games_per_pair=2)
+    assert pool.multiplexed
+
+    await pool.play_games(asyncio.Event())
+    assert Counter(shared.agent.game_ids) == Counter(range(6))
+    stats = await pool.get_pair_stats()
+    assert [sum(pair['wins']) for pair in stats] == [2, 2, 2]
+
+
+class RepeatingPlayer(MyBattleshipPlayer):
+    @action
+    async def get_move(self, *, game_id=None) -> Crd:
+        return Crd(0, 0)
+
+
+class OffBoardPlayer(MyBattleshipPlayer):
+    @action
+    async def get_move(self, *, game_id=None) -> Crd:
+        return Crd(10, 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('cheat', (RepeatingPlayer, OffBoardPlayer))
+async def test_coordinator_illegal_move(cheat):
+    coordinator = Coordinator(
+        ProxyHandle(MyBattleshipPlayer()),
+        ProxyHandle(cheat()),
+    )
+    assert await coordinator.game(asyncio.Event()) == 0
+
+    stalls = await coordinator.get_stall_stats()
+    assert stalls['count'] == 1
+    assert stalls['total'] == stalls['max'] > 0
+
+
+@pytest.mark.asyncio
+async def test_coordinator_move_cap():
+    coordinator = Coordinator(
+        ProxyHandle(RepeatingPlayer()),
+        ProxyHandle(RepeatingPlayer()),
+        max_moves=10,
+        max_repeats=100,
+    )
+    assert await coordinator.game(asyncio.Event()) == -1
+    assert coordinator.game_state is not None
+    assert coordinator.game_state.version == 10  # noqa: PLR2004
+    assert coordinator.stalls.count == 1
+
+    # games that end without a winner do not stop the coordinator
+    shutdown_event = asyncio.Event()
+    task = asyncio.create_task(coordinator.play_games(shutdown_event))
+    await asyncio.sleep(0.05)
+    shutdown_event.set()
+    await task
+    assert coordinator.stalls.count > 2  # noqa: PLR2004
+    assert await coordinator.get_player_stats() == [0, 0]
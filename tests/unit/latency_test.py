@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import math
+
+import pytest
+
+from academy_tutorial.latency import LatencyHistogram
+from academy_tutorial.latency import LatencyStats
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000  # noqa: PLR2004
+    assert histogram.mean == pytest.approx(0.5005)
+    assert histogram.min == 0.001  # noqa: PLR2004
+    assert histogram.max == 1.0
+    for q in (0.5, 0.9, 0.99):
+        # within one bucket, an eighth of a doubling
+        assert q <= histogram.percentile(q) <= q * 2 ** (1 / 8)
+    assert histogram.percentile(1.0) == 1.0
+
+
+def test_histogram_empty():
+    summary = LatencyHistogram().summary()
+    assert summary['count'] == 0
+    assert all(value == 0 for value in summary.values())
+
+
+def test_histogram_merge():
+    fast, slow, both = (LatencyHistogram() for _ in range(3))
+    for i in range(100):
+        fast.record(0.001 * (1 + i % 5))
+        slow.record(0.1 * (1 + i % 7))
+        both.record(0.001 * (1 + i % 5))
+        both.record(0.1 * (1 + i % 7))
+
+    fast.merge(slow)
+    assert fast.buckets == both.buckets
+    assert fast.summary() == pytest.approx(both.summary())
+
+    fast.merge(LatencyHistogram())
+    assert fast.summary() == pytest.approx(both.summary())
+
+
+def test_stats_merge():
+    stats = LatencyStats()
+    stats.record('a', 'get_move', 0.01)
+    other = LatencyStats()
+    other.record('a', 'get_move', 0.02)
+    other.record('b', 'new_game', 0.03)
+
+    stats.merge(other)
+    summary = stats.summary()
+    assert summary['a']['get_move']['count'] == 2  # noqa: PLR2004
+    assert summary['b']['new_game']['max'] == 0.03  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_stats_time():
+    stats = LatencyStats()
+    assert await stats.time('a', 'get_move', asyncio.sleep(0.01, 'x')) == 'x'
+
+    with pytest.raises(TimeoutError):
+        await stats.time(
+            'a',
+            'get_move',
+            asyncio.wait_for(asyncio.sleep(1), 0.01),
+        )
+
+    histogram = stats.histograms['a']['get_move']
+    assert histogram.count == 2  # noqa: PLR2004
+    assert histogram.min >= 0.01  # noqa: PLR2004
+    assert not math.isinf(histogram.max)
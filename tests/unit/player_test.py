@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Literal
+
+import pytest
+from academy.agent import action
+from academy.agent import Agent
+from academy.handle import ProxyHandle
+
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.coordinator import Coordinator
+from academy_tutorial.player import check_game_limit
+from academy_tutorial.player import GameStates
+from academy_tutorial.player import LastResult
+from academy_tutorial.player import MultiplexedPlayer
+from academy_tutorial.player import TurnClient
+from academy_tutorial.tournament import TournamentAgent
+from testing.agents import MyBattleshipPlayer
+
+
+class CountingPlayer(MyBattleshipPlayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+        self.results: list[tuple[Crd, str]] = []
+        self.moves: list[Crd] = []
+
+    @action
+    async def take_turn(
+        self,
+        last_result: LastResult | None,
+        opponent_last_move: Crd | None,
+        *,
+        game_id: int | None = None,
+    ) -> Crd:
+        self.calls.append('take_turn')
+        return await super().take_turn(
+            last_result,
+            opponent_last_move,
+            game_id=game_id,
+        )
+
+    @action
+    async def notify_result(
+        self,
+        loc: Crd,
+        result: Literal['hit', 'miss', 'guessed'],
+        *,
+        game_id: int | None = None,
+    ) -> None:
+        self.results.append((loc, result))
+
+    @action
+    async def notify_move(
+        self,
+        loc: Crd,
+        *,
+        game_id: int | None = None,
+    ) -> None:
+        self.moves.append(loc)
+
+
+class LegacyPlayer(Agent):
+    """Player without the take_turn action."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.player = CountingPlayer()
+
+    @action
+    async def get_move(self) -> Crd:
+        self.player.calls.append('get_move')
+        return await self.player.get_move()
+
+    @action
+    async def notify_result(
+        self,
+        loc: Crd,
+        result: Literal['hit', 'miss', 'guessed'],
+    ) -> None:
+        self.player.calls.append('notify_result')
+        await self.player.notify_result(loc, result)
+
+    @action
+    async def notify_move(self, loc: Crd) -> None:
+        self.player.calls.append('notify_move')
+        await self.player.notify_move(loc)
+
+    @action
+    async def new_game(self, ships: list[int], size: int = 10) -> Board:
+        return await self.player.new_game(ships, size)
+
+
+def test_game_states():
+    states: GameStates[str] = GameStates(max_games=2)
+    assert states.start(None, 'a') == 'a'
+    states.start(1, 'b')
+    # restarting a game makes it the newest
+    states.start(None, 'c')
+    states.start(2, 'd')
+    assert len(states) == 2  # noqa: PLR2004
+    assert 1 not in states
+    assert states[None] == 'c'
+    with pytest.raises(KeyError, match='Game 1 has not started'):
+        states[1]
+
+    assert states.finish(2) == 'd'
+    assert states.finish(2) is None
+    assert len(states) == 1
+
+
+def test_game_states_keeps_used_games():
+    states: GameStates[str] = GameStates(max_games=2)
+    states.start(0, 'a')
+    states.start(1, 'b')
+    # a game in progress is used every turn, so it outlives idle games
+    assert states[0] == 'a'
+    states.start(2, 'c')
+    assert 0 in states
+    assert 1 not in states
+
+
+def test_check_game_limit():
+    check_game_limit(MultiplexedPlayer.max_games)
+    with pytest.raises(ValueError, match='at most'):
+        check_game_limit(MultiplexedPlayer.max_games + 1)
+
+
+@pytest.mark.asyncio
+async def test_default_take_turn():
+    player = CountingPlayer()
+    await player.new_game([2], size=2)
+    first = await player.take_turn(None, None)
+    assert player.results == []
+    assert player.moves == []
+
+    second = await player.take_turn((first, 'miss'), Crd(1, 1))
+    assert player.results == [(first, 'miss')]
+    assert player.moves == [Crd(1, 1)]
+    assert second != first
+
+
+@pytest.mark.asyncio
+async def test_turn_client_legacy_player():
+    legacy = LegacyPlayer()
+    await legacy.new_game([2], size=2)
+    client = TurnClient(ProxyHandle(legacy))  # type: ignore[arg-type]
+    move = await client.take_turn(None)
+    assert not client.single_message
+
+    # the result is sent in the background before the next turn
+    client.notify_result((move, 'hit'))
+    await asyncio.sleep(0)
+    assert legacy.player.calls == ['get_move', 'notify_result']
+
+    await client.take_turn(Crd(0, 0))
+    client.notify_result((move, 'miss'))
+    await client.finish()
+    assert legacy.player.calls == [
+        'get_move',
+        'notify_result',
+        'notify_move',
+        'get_move',
+        'notify_result',
+    ]
+
+
+class SlowNotifyPlayer(LegacyPlayer):
+    @action
+    async def notify_result(
+        self,
+        loc: Crd,
+        result: Literal['hit', 'miss', 'guessed'],
+    ) -> None:
+        await asyncio.sleep(1)
+
+
+@pytest.mark.asyncio
+async def test_turn_client_notify_timeout():
+    player = SlowNotifyPlayer()
+    await player.new_game([2], size=2)
+    client = TurnClient(ProxyHandle(player), timeout=0.01)  # type: ignore[arg-type]
+    move = await client.take_turn(None)
+    client.notify_result((move, 'miss'))
+    with pytest.raises(TimeoutError):
+        await client.take_turn(Crd(0, 0))
+
+    client.notify_result((move, 'miss'))
+    client.cancel()
+    assert client._pending is None
+
+
+@pytest.mark.asyncio
+async def test_turn_client_reraises():
+    class BrokenPlayer(MyBattleshipPlayer):
+        @action
+        async def take_turn(
+            self,
+            last_result: LastResult | None,
+            opponent_last_move: Crd | None,
+            *,
+            game_id: int | None = None,
+        ) -> Crd:
+            raise AttributeError('bug')
+
+    client = TurnClient(ProxyHandle(BrokenPlayer()))
+    with pytest.raises(AttributeError, match='bug'):
+        await client.take_turn(None)
+    assert client.single_message
+
+
+@pytest.mark.asyncio
+async def test_coordinator_single_message_turns():
+    players = (CountingPlayer(), CountingPlayer())
+    coordinator = Coordinator(
+        ProxyHandle(players[0]),
+        ProxyHandle(players[1]),
+    )
+    winner = await coordinator.game(asyncio.Event())
+    assert coordinator.game_state is not None
+    assert coordinator.game_state.check_winner() == winner
+
+    # one message per turn, plus the result of the winning attack
+    calls = [len(player.calls) for player in players]
+    assert calls[0] == calls[1] + (1 - winner)
+    assert len(players[winner].results) == calls[winner]
+    assert len(players[1 - winner].results) == calls[1 - winner] - 1
+    assert len(players[1 - winner].moves) == calls[winner] - 1
+
+
+@pytest.mark.asyncio
+async def test_tournament_legacy_player():
+    tournament = TournamentAgent()
+    legacy = LegacyPlayer()
+    winner = await tournament.play_game(
+        asyncio.Event(),
+        ProxyHandle(legacy),  # type: ignore[arg-type]
+        ProxyHandle(MyBattleshipPlayer()),
+    )
+    assert winner in {0, 1}
+    assert legacy.player.calls.count('get_move') > 1
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from academy_tutorial.tournament.rating import DEFAULT_RATING
+from academy_tutorial.tournament.rating import elo_update
+from academy_tutorial.tournament.rating import expected_score
+from academy_tutorial.tournament.rating import Ranking
+
+
+def test_expected_score():
+    assert expected_score(1500, 1500) == pytest.approx(0.5)
+    assert expected_score(1900, 1500) == pytest.approx(10 / 11)
+    assert expected_score(1500, 1700) + expected_score(1700, 1500) == (
+        pytest.approx(1)
+    )
+
+
+def test_elo_update():
+    winner, loser = elo_update(DEFAULT_RATING, DEFAULT_RATING, k=32)
+    assert winner == pytest.approx(1516)
+    assert loser == pytest.approx(1484)
+
+    # an upset moves the ratings more than an expected result
+    upset, _ = elo_update(1400, 1600)
+    expected, _ = elo_update(1600, 1400)
+    assert upset - 1400 > expected - 1600
+
+
+def test_ranking():
+    ranking = Ranking()
+    ranking.update('velma', 1500)
+    ranking.update('fred', 1600)
+    ranking.update('shaggy', 1400)
+    ranking.update('daphne', 1500)
+    assert len(ranking) == 4  # noqa: PLR2004
+    assert ranking.page() == [
+        ('fred', 1600),
+        ('daphne', 1500),
+        ('velma', 1500),
+        ('shaggy', 1400),
+    ]
+    assert ranking.rank('fred') == 0
+    assert ranking.rank('velma') == 2  # noqa: PLR2004
+
+    ranking.update('shaggy', 1700)
+    assert ranking.rank('shaggy') == 0
+    assert ranking.rating('shaggy') == 1700  # noqa: PLR2004
+    assert ranking.page(1, 2) == [('fred', 1600), ('daphne', 1500)]
+    assert ranking.page(4) == []
+
+    ranking.remove('fred')
+    assert 'fred' not in ranking
+    assert ranking.rank('velma') == 2  # noqa: PLR2004
+    with pytest.raises(KeyError):
+        ranking.rank('fred')
+
+
+def test_ranking_random():
+    rng = random.Random(0)
+    ranking = Ranking(seed=0)
+    ratings: dict[str, float] = {}
+    for _ in range(2000):
+        name = f'player-{rng.randrange(100)}'
+        if name in ratings and rng.random() < 0.2:  # noqa: PLR2004
+            ranking.remove(name)
+            del ratings[name]
+        else:
+            ratings[name] = round(rng.gauss(DEFAULT_RATING, 200))
+            ranking.update(name, ratings[name])
+
+    expected = sorted(ratings.items(), key=lambda item: (-item[1], item[0]))
+    assert ranking.page() == expected
+    assert ranking.page(10, 5) == expected[10:15]
+    for rank, (name, _) in enumerate(expected):
+        assert ranking.rank(name) == rank
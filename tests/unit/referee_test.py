@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from academy_tutorial.battleship import Crd
+from academy_tutorial.referee import DEFAULT_MAX_REPEATS
+from academy_tutorial.referee import IllegalMoveError
+from academy_tutorial.referee import Referee
+
+
+def test_referee_default_cap():
+    referee = Referee(10, max_repeats=1)
+    assert referee.max_moves == 2 * (100 + 1)
+    assert not referee.exhausted
+
+
+def test_referee_default_repeats():
+    referee = Referee(10)
+    assert referee.max_repeats == DEFAULT_MAX_REPEATS > 0
+    for _ in range(DEFAULT_MAX_REPEATS):
+        referee.check_result(0, 'guessed')
+    with pytest.raises(IllegalMoveError, match='repeated'):
+        referee.check_result(0, 'guessed')
+
+
+@pytest.mark.parametrize(
+    'pos',
+    (Crd(-1, 0), Crd(0, 10), (1, 2, 3), None, (0.5, 1), 'ab'),
+)
+def test_referee_off_board(pos):
+    referee = Referee(10)
+    with pytest.raises(IllegalMoveError, match='off the board'):
+        referee.check_move(0, pos)
+
+
+def test_referee_moves():
+    referee = Referee(4, max_moves=3, max_repeats=1)
+    assert referee.check_move(0, (np.int64(1), 2)) == Crd(1, 2)
+    referee.check_result(0, 'guessed')
+    referee.check_move(1, Crd(3, 3))
+    referee.check_result(1, 'hit')
+    assert not referee.exhausted
+
+    referee.check_move(0, Crd(1, 2))
+    assert referee.exhausted
+    with pytest.raises(IllegalMoveError, match='Player 0 repeated 2 shots'):
+        referee.check_result(0, 'guessed')
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import warnings
+
+import numpy as np
+import pytest
+from academy.agent import action
+from academy.handle import ProxyHandle
+
+from academy_tutorial import coordinator as coordinator_module
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Board
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import Game
+from academy_tutorial.battleship import Ship
+from academy_tutorial.coordinator import Coordinator
+from academy_tutorial.replay import GameRecorder
+from academy_tutorial.replay import GUESSED
+from academy_tutorial.replay import HIT
+from academy_tutorial.replay import MAGIC
+from academy_tutorial.replay import MISS
+from academy_tutorial.replay import OFF_BOARD
+from academy_tutorial.replay import ReplayReader
+from academy_tutorial.replay import ReplayWriter
+from academy_tutorial.replay import SUNK
+from academy_tutorial.tournament import TournamentAgent
+from testing.agents import MyBattleshipPlayer
+
+SHIPS = (5, 4, 3, 3, 2)
+
+
+def _encoded(game: Game) -> list[bytes]:
+    return [board.to_bytes() for board in game.boards]
+
+
+def _play(seed: int, max_moves: int = 1000) -> GameRecorder:
+    rng = random.Random(seed)
+    game = Game(
+        BitBoard.from_random_fleet(SHIPS, rng=rng),
+        BitBoard.from_random_fleet(SHIPS, rng=rng),
+    )
+    recorder = GameRecorder()
+    recorder.start(game)
+    cells = [
+        [Crd(row, col) for row in range(10) for col in range(10)]
+        for _ in range(2)
+    ]
+    for moves in cells:
+        rng.shuffle(moves)
+    player = 0
+    while game.check_winner() < 0 and max_moves > 0:
+        move = cells[player].pop()
+        recorder.move(player, move, game.attack(player, move), rng.random())
+        player = 1 - player
+        max_moves -= 1
+    return recorder
+
+
+def test_record_roundtrip():
+    recorder = _play(0)
+    game = recorder.game
+    assert game is not None
+    record = recorder.finish(game.check_winner())
+    assert record is not None
+    assert not record.forfeit
+    assert record.fleets == (game.boards[0].fleet(), game.boards[1].fleet())
+    assert set(record.results.tolist()) == {MISS, HIT, HIT | SUNK}
+
+    replayed = record.replay()
+    assert _encoded(replayed) == _encoded(game)
+    assert replayed.check_winner() == record.winner
+
+    decoded = type(record).from_bytes(record.to_bytes())
+    assert decoded.fleets == record.fleets
+    assert decoded.winner == record.winner
+    for name in ('players', 'cells', 'results', 'latencies'):
+        np.testing.assert_array_equal(
+            getattr(decoded, name),
+            getattr(record, name),
+        )
+
+
+def test_record_unusual_moves():
+    game = Game(
+        BitBoard.from_random_fleet([2], size=4),
+        BitBoard.from_random_fleet([2], size=4),
+    )
+    recorder = GameRecorder()
+    recorder.start(game)
+    for player, move in ((0, Crd(0, 0)), (0, Crd(0, 0)), (1, Crd(-1, 9))):
+        recorder.move(player, move, game.attack(player, move), 0.0)
+    record = recorder.finish(1)
+    assert record is not None
+    assert record.forfeit
+    assert record.cells.tolist() == [0, 0, OFF_BOARD]
+    assert record.results[1] == GUESSED
+    assert record.moves() == [Crd(0, 0), Crd(0, 0), None]
+    # the off board shot of player 1 is not replayed
+    assert _encoded(record.replay())[1] == _encoded(game)[1]
+
+    record.results[0] ^= HIT
+    with pytest.raises(ValueError, match='record has result code'):
+        record.replay()
+
+
+def test_recorder_not_started():
+    assert GameRecorder().finish(0) is None
+
+
+def test_replay_log(tmp_path):
+    path = tmp_path / 'games.replay'
+    records = [_play(seed).finish(-1) for seed in range(5)]
+    with ReplayWriter(path) as log:
+        for record in records[:3]:
+            assert record is not None
+            log.write(record)
+    with ReplayWriter(path) as log:
+        for record in records[3:]:
+            assert record is not None
+            log.write(record)
+
+    with ReplayReader(path) as reader:
+        offsets = []
+        for (offset, read), record in zip(reader.records(), records):
+            assert record is not None
+            assert read.fleets == record.fleets
+            np.testing.assert_array_equal(read.cells, record.cells)
+            offsets.append(offset)
+        assert len(offsets) == len(records)
+        assert reader.read(offsets[2]).winner == -1
+
+
+def test_replay_log_truncated(tmp_path):
+    path = tmp_path / 'games.replay'
+    with ReplayWriter(path) as log:
+        for seed in range(2):
+            record = _play(seed).finish(-1)
+            assert record is not None
+            log.write(record)
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+
+    with ReplayReader(path) as reader:
+        assert len(list(reader)) == 1
+        with pytest.raises(IndexError):
+            reader.read(len(data) - 10)
+
+
+def test_replay_log_empty(tmp_path):
+    path = tmp_path / 'games.replay'
+    ReplayWriter(path).close()
+    assert path.read_bytes() == MAGIC
+    with ReplayReader(path) as reader:
+        assert list(reader) == []
+
+
+def test_replay_log_bad_magic(tmp_path):
+    path = tmp_path / 'games.replay'
+    path.write_bytes(b'not a log')
+    with pytest.raises(ValueError, match='not a replay log'):
+        ReplayWriter(path)
+    with pytest.raises(ValueError, match='not a replay log'):
+        ReplayReader(path)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_replay(tmp_path):
+    path = tmp_path / 'games.replay'
+    coordinator = Coordinator(
+        ProxyHandle(MyBattleshipPlayer()),
+        ProxyHandle(MyBattleshipPlayer()),
+        replay_path=path,
+    )
+    winner = await coordinator.game(asyncio.Event())
+    await coordinator.agent_on_shutdown()
+
+    with ReplayReader(path) as reader:
+        (record,) = list(reader)
+    assert record.winner == winner
+    assert not record.forfeit
+    assert (record.latencies >= 0).all()
+    assert coordinator.game_state is not None
+    assert _encoded(record.replay()) == _encoded(coordinator.game_state)
+
+
+class ExceptionPlayer(MyBattleshipPlayer):
+    @action
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
+        raise ValueError('Mistake')
+
+
+@pytest.mark.asyncio
+async def test_tournament_replay(tmp_path):
+    path = tmp_path / 'games.replay'
+    tournament = TournamentAgent(replay_path=path)
+    player = ProxyHandle(MyBattleshipPlayer())
+    shutdown = asyncio.Event()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        winner = await tournament.play_game(
+            shutdown,
+            player,
+            ProxyHandle(MyBattleshipPlayer()),
+        )
+    with pytest.warns(UserWarning, match='raised exception'):
+        await tournament.play_game(
+            shutdown,
+            ProxyHandle(ExceptionPlayer()),
+            player,
+        )
+    await tournament.agent_on_shutdown()
+
+    with ReplayReader(path) as reader:
+        finished, forfeit = list(reader)
+    assert finished.winner == winner
+    assert not finished.forfeit
+    assert finished.replay().check_winner() == winner
+    assert forfeit.winner == 1
+    assert forfeit.forfeit
+    assert len(forfeit.cells) == 0
+
+
+class BentShipPlayer(MyBattleshipPlayer):
+    @action
+    async def new_game(self, ships, size=10, *, game_id=None) -> Board:
+        board = await super().new_game(ships, size, game_id=game_id)
+        # the ships have the right lengths, but the last one is bent
+        length = board.ships[-1].length
+        row = size - 1
+        board.ships[-1] = Ship(
+            [Crd(row, col) for col in range(length - 1)]
+            + [Crd(row - 1, length - 2)],
+        )
+        return board
+
+
+@pytest.mark.asyncio
+async def test_coordinator_bent_ship(tmp_path):
+    path = tmp_path / 'games.replay'
+    coordinator = Coordinator(
+        ProxyHandle(MyBattleshipPlayer()),
+        ProxyHandle(BentShipPlayer()),
+        replay_path=path,
+    )
+    assert await coordinator.game(asyncio.Event()) == 0
+    assert await coordinator.game(asyncio.Event()) == 0
+    await coordinator.agent_on_shutdown()
+    # games that never started are not recorded
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_tournament_bent_ship(tmp_path):
+    path = tmp_path / 'games.replay'
+    tournament = TournamentAgent(replay_path=path)
+    with pytest.warns(UserWarning, match='invalid board'):
+        winner = await tournament.play_game(
+            asyncio.Event(),
+            ProxyHandle(BentShipPlayer()),
+            ProxyHandle(MyBattleshipPlayer()),
+        )
+    assert winner == 1
+    await tournament.agent_on_shutdown()
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_without_replay(monkeypatch):
+    # games are not recorded when there is no log to write them to
+    monkeypatch.setattr(coordinator_module, 'GameRecorder', None)
+    coordinator = Coordinator(
+        ProxyHandle(MyBattleshipPlayer()),
+        ProxyHandle(MyBattleshipPlayer()),
+    )
+    assert await coordinator.game(asyncio.Event()) in {0, 1}
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from academy_tutorial.arena import play_game
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import placement_index
+from academy_tutorial.sampler import FleetSampler
+from academy_tutorial.sampler import SamplingPlayer
+from testing.agents import MyBattleshipPlayer
+
+
+def _exact_heatmap(
+    ships: tuple[int, ...],
+    size: int,
+    hits: int,
+    misses: int,
+) -> np.ndarray:
+    tables = [placement_index(size, n).masks for n in ships]
+    counts = np.zeros(size * size)
+    total = 0
+    for fleet in itertools.product(*tables):
+        union = 0
+        for mask in fleet:
+            if union & mask:
+                break
+            union |= mask
+        else:
+            if union & hits == hits and not union & misses:
+                total += 1
+                counts += [union >> cell & 1 for cell in range(size * size)]
+    return (counts / total).reshape(size, size)
+
+
+def test_sampler_matches_posterior():
+    ships = (3, 2)
+    sampler = FleetSampler(ships, size=4, workers=1, seed=0)
+    sampler.record(Crd(1, 1), 'hit')
+    sampler.record(Crd(2, 2), 'miss')
+    sampler.record(Crd(0, 3), 'miss')
+
+    heatmap = sampler.heatmap(budget=0.5)
+    assert len(sampler.samples) > 1000  # noqa: PLR2004
+    expected = _exact_heatmap(ships, 4, 1 << 5, (1 << 10) | (1 << 3))
+    np.testing.assert_allclose(heatmap, expected, atol=0.05)
+
+
+def test_sampler_reuses_samples():
+    sampler = FleetSampler((3, 2), size=4, workers=1, seed=0)
+    assert sampler.sample(budget=0.05) > 0
+    before = len(sampler.samples)
+
+    sampler.record(Crd(0, 0), 'miss')
+    sampler.record(Crd(-1, 0), 'miss')
+    sampler.record(Crd(0, 0), 'guessed')
+    assert 0 < len(sampler.samples) < before
+    assert sampler.heatmap(budget=0)[0, 0] == 0
+
+    sampler.record(Crd(1, 0), 'hit')
+    assert len(sampler.samples) > 0
+    assert sampler.heatmap(budget=0)[1, 0] == 1
+
+    sampler.record_sunk([Crd(1, 0), Crd(2, 0)])
+    assert sampler.ships == (3,)
+    assert len(sampler.samples) == 0
+    heatmap = sampler.heatmap(budget=0.05)
+    assert heatmap[1, 0] == 1
+    assert heatmap[0, 0] == 0
+
+
+def test_sampler_full_board():
+    sampler = FleetSampler([1], size=2, workers=1, seed=0)
+    for _ in range(4):
+        sampler.record(sampler.next_move(budget=0.01), 'miss')
+    with pytest.raises(ValueError, match='Every cell'):
+        sampler.next_move(budget=0.01)
+
+
+def test_sampler_process_pool():
+    with FleetSampler((5, 4, 3), workers=2, seed=0) as sampler:
+        sampler.record(Crd(5, 5), 'hit')
+        move = sampler.next_move(budget=0.2)
+        assert abs(move.x - 5) + abs(move.y - 5) == 1
+        assert len(sampler.samples) > 0
+    assert sampler._pool is None
+
+
+@pytest.mark.asyncio
+async def test_sampling_player():
+    random.seed(0)
+    player = SamplingPlayer(budget=0.005, workers=1)
+    assert player.sampler is None
+    await player.agent_on_startup()
+    winner, _, forfeit = await play_game(player, MyBattleshipPlayer())
+    assert winner == 0
+    assert not forfeit
+    await player.agent_on_shutdown()
+
+
+def test_sampler_spawn():
+    with FleetSampler([], workers=2, seed=0) as sampler:
+        game = sampler.spawn((3, 2), size=4)
+        assert game._pool is sampler._pool
+        assert game.sample(budget=0.05) > 0
+        game.close()
+        assert sampler._pool is not None
+
+
+@pytest.mark.asyncio
+async def test_sampling_player_games():
+    player = SamplingPlayer(budget=0.005, workers=1)
+    with pytest.raises(RuntimeError, match='not started'):
+        await player.new_game([3, 2], size=4, game_id=0)
+    await player.agent_on_startup()
+    await player.new_game([3, 2], size=4, game_id=0)
+    await player.new_game([3, 2], size=4, game_id=1)
+    await player.notify_result(Crd(0, 0), 'hit', game_id=0)
+    assert player.samplers[0].hits != player.samplers[1].hits
+    await player.get_move(game_id=1)
+    await player.agent_on_shutdown()
+    assert player.sampler is None
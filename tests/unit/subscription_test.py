@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from academy.agent import action
+from academy.handle import ProxyHandle
+
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import Game
+from academy_tutorial.battleship import MoveEvent
+from academy_tutorial.coordinator import Coordinator
+from academy_tutorial.subscription import EventBatch
+from academy_tutorial.subscription import GameSubscriber
+from academy_tutorial.subscription import Subscription
+from testing.agents import MyBattleshipPlayer
+
+
+class RecordingSubscriber(GameSubscriber):
+    def __init__(self, delay: float = 0) -> None:
+        super().__init__()
+        self.delay = delay
+        self.batches: list[EventBatch] = []
+
+    @action
+    async def receive_events(self, batch: EventBatch) -> None:
+        await asyncio.sleep(self.delay)
+        self.batches.append(batch)
+
+
+class FailingSubscriber(GameSubscriber):
+    @action
+    async def receive_events(self, batch: EventBatch) -> None:
+        raise RuntimeError('Gone')
+
+
+def _event(version: int) -> MoveEvent:
+    return MoveEvent(version, 0, Crd(0, 0), 'miss', False)
+
+
+@pytest.mark.asyncio
+async def test_subscription_batches():
+    subscriber = RecordingSubscriber()
+    subscription = Subscription(ProxyHandle(subscriber), window=0.01)
+    subscription.start()
+    for version in range(1, 4):
+        subscription.publish(0, _event(version))
+    await asyncio.sleep(0.05)
+    subscription.publish(1, _event(1))
+    await asyncio.sleep(0.05)
+    await subscription.stop()
+
+    assert [len(batch.events) for batch in subscriber.batches] == [3, 1]
+    assert subscriber.batches[1].events == [(1, _event(1))]
+    assert subscription.sent == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_subscription_drops_oldest():
+    subscriber = RecordingSubscriber(delay=0.1)
+    subscription = Subscription(
+        ProxyHandle(subscriber),
+        window=0,
+        max_updates=4,
+    )
+    subscription.start()
+    subscription.publish(0, _event(1))
+    await asyncio.sleep(0.01)
+    # the first batch is being sent, so these wait in the queue
+    for version in range(2, 12):
+        subscription.publish(0, _event(version))
+    await asyncio.sleep(0.3)
+    await subscription.stop()
+
+    first, second = subscriber.batches
+    assert first.dropped == 0
+    assert second.dropped == 6  # noqa: PLR2004
+    assert [event.version for _, event in second.events] == [8, 9, 10, 11]
+
+
+@pytest.mark.asyncio
+async def test_subscription_failure():
+    subscription = Subscription(ProxyHandle(FailingSubscriber()), window=0)
+    subscription.start()
+    assert subscription.active
+    subscription.publish(0, _event(1))
+    await asyncio.sleep(0.01)
+    assert not subscription.active
+
+
+@pytest.mark.asyncio
+async def test_coordinator_subscribe():
+    coordinator = Coordinator(
+        ProxyHandle(MyBattleshipPlayer()),
+        ProxyHandle(MyBattleshipPlayer()),
+    )
+    subscriber = RecordingSubscriber()
+    subscription_id = await coordinator.subscribe(
+        ProxyHandle(subscriber),
+        window=0.01,
+    )
+    failing = await coordinator.subscribe(ProxyHandle(FailingSubscriber()))
+
+    await coordinator.game(asyncio.Event())
+    await asyncio.sleep(0.15)
+    assert not coordinator.subscriptions[failing].active
+
+    started = [game for batch in subscriber.batches for game in batch.started]
+    events = [event for batch in subscriber.batches for event in batch.events]
+    assert [number for number, _ in started] == [0]
+    assert started[0][1] is coordinator.game_state
+    assert [event for _, event in events] == coordinator.game_state.events
+    assert all(batch.dropped == 0 for batch in subscriber.batches)
+
+    # a copy of the initial game follows along with the events alone
+    game = coordinator.game_state
+    boards = []
+    for board in game.boards:
+        fresh = BitBoard(board.size)
+        for placement in board.fleet():
+            fresh.place_ship(*placement)
+        boards.append(fresh)
+    copy = Game(*boards)
+    copy.apply(event for _, event in events)
+    assert copy.to_bytes() == game.to_bytes()
+
+    # failed subscriptions are dropped when the next update is published
+    await coordinator.unsubscribe(subscription_id)
+    await coordinator.game(asyncio.Event())
+    assert failing not in coordinator.subscriptions
+    assert coordinator.subscriptions == {}
+    await coordinator.agent_on_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_slow_subscriber():
+    coordinator = Coordinator(
+        ProxyHandle(MyBattleshipPlayer()),
+        ProxyHandle(MyBattleshipPlayer()),
+    )
+    subscriber = RecordingSubscriber(delay=10)
+    await coordinator.subscribe(ProxyHandle(subscriber), window=0)
+
+    winner = await asyncio.wait_for(coordinator.game(asyncio.Event()), 1)
+    assert winner in {0, 1}
+    await coordinator.agent_on_shutdown()
+    assert coordinator.subscriptions == {}
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import random
+import time
+
+from academy_tutorial.tournament import TournamentAgent
+from academy_tutorial.tournament.agent import PlayerInfo
+from academy_tutorial.tournament.swiss import swiss_pairs
+
+
+def test_swiss_pairs_by_rank():
+    pairs, bye = swiss_pairs(['a', 'b', 'c', 'd'], {})
+    assert pairs == [('a', 'b'), ('c', 'd')]
+    assert bye is None
+
+
+def test_swiss_pairs_avoid_rematches():
+    opponents = {'a': {'b', 'c'}, 'b': {'a'}, 'c': {'a'}}
+    pairs, _ = swiss_pairs(['a', 'b', 'c', 'd'], opponents)
+    assert pairs == [('a', 'd'), ('b', 'c')]
+
+
+def test_swiss_pairs_forced_rematch():
+    opponents = {'a': {'b'}, 'b': {'a'}}
+    pairs, _ = swiss_pairs(['a', 'b'], opponents)
+    assert pairs == [('a', 'b')]
+
+
+def test_swiss_pairs_no_rematches():
+    ranking = ['a', 'b', 'c', 'd', 'e']
+    opponents = {'a': {'b', 'c', 'd', 'e'}, 'b': {'a'}}
+    pairs, bye = swiss_pairs(ranking, opponents, rematches=False)
+    assert pairs == [('b', 'c'), ('d', 'e')]
+    assert bye is None
+
+
+def test_swiss_pairs_bye():
+    ranking = ['a', 'b', 'c', 'd', 'e']
+    pairs, bye = swiss_pairs(ranking, {})
+    assert bye == 'e'
+    assert pairs == [('a', 'b'), ('c', 'd')]
+
+    _, bye = swiss_pairs(ranking, {}, byes={'e', 'd'})
+    assert bye == 'c'
+    _, bye = swiss_pairs(ranking, {}, byes=set(ranking))
+    assert bye == 'e'
+
+
+def test_swiss_pairs_large():
+    rng = random.Random(0)
+    players = [f'player {i}' for i in range(10_001)]
+    scores = dict.fromkeys(players, 0)
+    opponents: dict[str, set[str]] = {player: set() for player in players}
+    byes: set[str] = set()
+    for _ in range(10):
+        ranking = sorted(players, key=scores.__getitem__, reverse=True)
+        start = time.perf_counter()
+        pairs, bye = swiss_pairs(ranking, opponents, byes)
+        assert time.perf_counter() - start < 0.5  # noqa: PLR2004
+
+        assert bye is not None
+        assert bye not in byes
+        byes.add(bye)
+        assert len(pairs) == len(players) // 2
+        paired = {player for pair in pairs for player in pair}
+        assert len(paired) == len(players) - 1
+        for a, b in pairs:
+            assert b not in opponents[a]
+            opponents[a].add(b)
+            opponents[b].add(a)
+            scores[rng.choice((a, b))] += 1
+
+
+def test_tournament_swiss_matching():
+    tournament = TournamentAgent(pairing='swiss')
+    players = ['velma', 'fred', 'shaggy', 'scooby', 'daphne']
+    for name in players:
+        tournament.registered_players[name] = PlayerInfo(None)  # type: ignore[arg-type]
+    tournament.registered_players['shaggy'].wins = 1
+    tournament.registered_players['daphne'].byes = 1
+    tournament.opponents = {'shaggy': {'daphne'}, 'daphne': {'shaggy'}}
+
+    # scooby gets the bye, as the lowest ranked player without one
+    assert tournament._matching(players) == [
+        ('shaggy', 'velma'),
+        ('daphne', 'fred'),
+    ]
+    assert tournament.registered_players['scooby'].byes == 1
+    assert tournament.registered_players['scooby'].score == 1
+
+
+def test_tournament_swiss_matching_busy():
+    tournament = TournamentAgent(pairing='swiss')
+    players = ['velma', 'fred', 'shaggy']
+    for name in players:
+        tournament.registered_players[name] = PlayerInfo(None)  # type: ignore[arg-type]
+    tournament.opponents = {'velma': {'fred'}, 'fred': {'velma'}}
+
+    # while other games are in progress, the free players that are left
+    # out wait for them instead of getting a bye or a rematch
+    assert tournament._matching(['velma', 'fred'], idle=False) == []
+    assert tournament._matching(players, idle=False) == [('velma', 'shaggy')]
+    assert tournament.registered_players['fred'].byes == 0
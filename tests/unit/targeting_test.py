@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import random
+import time
+
+import numpy as np
+import pytest
+
+from academy_tutorial.arena import play_game
+from academy_tutorial.battleship import BitBoard
+from academy_tutorial.battleship import Crd
+from academy_tutorial.battleship import placement_index
+from academy_tutorial.targeting import DensityPlayer
+from academy_tutorial.targeting import DensityTargeter
+from testing.agents import MyBattleshipPlayer
+
+SHIPS = (5, 4, 3, 3, 2)
+
+
+def _brute_force_density(targeter: DensityTargeter) -> np.ndarray:
+    state = targeter.state
+    blocked = (state == targeter.MISS) | (state == targeter.SUNK)
+    hits = state == targeter.HIT
+    density = np.zeros(state.shape)
+    for length, count in targeter.afloat.items():
+        cells = placement_index(targeter.size, length).cells
+        possible = cells[~(cells & blocked).any(axis=1)]
+        weights = 1 + targeter.hit_weight * (possible & hits).sum(axis=1)
+        density += count * (weights[:, None] * possible).sum(axis=0)
+    density[state != targeter.UNKNOWN] = 0
+    return density.reshape(targeter.size, targeter.size)
+
+
+def test_targeter_empty_board():
+    targeter = DensityTargeter(SHIPS)
+    density = targeter.density()
+    assert np.allclose(density, density.T)
+    assert density[0, 0] < density[4, 4]
+    np.testing.assert_allclose(density, _brute_force_density(targeter))
+
+
+def test_targeter_matches_brute_force():
+    rng = random.Random(0)
+    board = BitBoard.from_random_fleet(SHIPS, rng=rng)
+    targeter = DensityTargeter(SHIPS, rng=rng)
+    for _ in range(40):
+        move = targeter.next_move()
+        assert targeter.grid[move] == targeter.UNKNOWN
+        targeter.record(move, board.receive_attack(move))
+        np.testing.assert_allclose(
+            targeter.density(),
+            _brute_force_density(targeter),
+        )
+
+
+def test_targeter_follows_hit():
+    targeter = DensityTargeter([3])
+    targeter.record(Crd(5, 5), 'hit')
+    assert targeter.next_move() in {
+        Crd(4, 5),
+        Crd(6, 5),
+        Crd(5, 4),
+        Crd(5, 6),
+    }
+
+    targeter.record(Crd(-1, 0), 'miss')
+    targeter.record(Crd(5, 5), 'miss')
+    assert targeter.grid[5, 5] == targeter.HIT
+
+
+def test_targeter_sunk():
+    targeter = DensityTargeter([2, 2], size=4)
+    targeter.record(Crd(0, 0), 'hit')
+    targeter.record(Crd(0, 1), 'hit')
+    targeter.record_sunk([Crd(0, 0), Crd(0, 1)])
+    assert targeter.afloat[2] == 1
+    assert targeter.grid[0, 1] == targeter.SUNK
+    np.testing.assert_allclose(
+        targeter.density(),
+        _brute_force_density(targeter),
+    )
+
+
+def test_targeter_full_board():
+    targeter = DensityTargeter([1], size=2)
+    for _ in range(4):
+        targeter.record(targeter.next_move(), 'miss')
+    with pytest.raises(ValueError, match='Every cell'):
+        targeter.next_move()
+
+
+def test_targeter_large_board():
+    targeter = DensityTargeter(SHIPS, size=100)
+    start = time.perf_counter()
+    for _ in range(20):
+        targeter.record(targeter.next_move(), 'miss')
+    assert (time.perf_counter() - start) / 20 < 0.25  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_density_player():
+    random.seed(0)
+    winner, _, forfeit = await play_game(
+        DensityPlayer(),
+        MyBattleshipPlayer(),
+    )
+    assert winner == 0
+    assert not forfeit
+
+
+@pytest.mark.asyncio
+async def test_density_player_games():
+    player = DensityPlayer()
+    await player.new_game(list(SHIPS), game_id=0)
+    await player.new_game(list(SHIPS), game_id=1)
+    move = await player.get_move(game_id=0)
+    await player.notify_result(move, 'miss', game_id=0)
+
+    assert player.targeters[0].grid[move] == DensityTargeter.MISS
+    assert player.targeters[1].grid[move] == DensityTargeter.UNKNOWN
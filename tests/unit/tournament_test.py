@@ -10,6 +10,7 @@ from academy.handle import ProxyHandle
 from academy_tutorial.battleship import Board
 from academy_tutorial.battleship import Crd
 from academy_tutorial.tournament import TournamentAgent
+from academy_tutorial.tournament.agent import PlayerInfo
 from testing.agents import MyBattleshipPlayer
 
 
@@ -31,29 +32,85 @@ async def test_register_player():
     assert players[0]['win_rate'] == 0
 
 
+@pytest.mark.asyncio
+async def test_get_players_page():
+    tournament = TournamentAgent()
+    for name in ('velma', 'fred', 'shaggy'):
+        await tournament.register_player(
+            ProxyHandle(MyBattleshipPlayer()),
+            name,
+        )
+    tournament._record_result(('shaggy', 'fred'), 0)
+
+    players = await tournament.get_players(offset=1, limit=1)
+    assert [player['name'] for player in players] == ['velma']
+    assert players[0]['rank'] == 2  # noqa: PLR2004
+
+    shaggy = await tournament.get_player('shaggy')
+    assert shaggy['rank'] == 1
+    assert shaggy['rating'] > 1500  # noqa: PLR2004
+    fred = await tournament.get_player('fred')
+    assert fred['rank'] == 3  # noqa: PLR2004
+    assert await tournament.get_players(limit=0) == []
+
+
 def test_matching():
     players = ['velma', 'fred', 'shaggy', 'scooby', 'daphne']
     tournament = TournamentAgent()
-    round_1 = set(tournament._matching(players, 1))
+    round_1 = set(tournament._matching(players))
     assert len(round_1) == 2  # noqa: PLR2004
 
-    round_2 = set(tournament._matching(players, 2))
+    round_2 = set(tournament._matching(players))
     assert len(round_2) == 2  # noqa: PLR2004
     for matchup in round_1:
         assert matchup not in round_2
 
 
+def test_matching_plays_every_pair_once():
+    players = ['velma', 'fred', 'shaggy', 'scooby', 'daphne']
+    tournament = TournamentAgent()
+    played: set[frozenset[str]] = set()
+    rounds = 0
+    while matchups := tournament._matching(players):
+        rounds += 1
+        names = [name for matchup in matchups for name in matchup]
+        assert len(names) == len(set(names))
+        played.update(frozenset(matchup) for matchup in matchups)
+    assert len(played) == 10  # noqa: PLR2004
+    assert rounds == 5  # noqa: PLR2004
+
+
+def test_matching_late_registration():
+    players = ['velma', 'fred', 'shaggy', 'scooby']
+    tournament = TournamentAgent()
+    played = [frozenset(m) for m in tournament._matching(players)]
+
+    players.append('daphne')
+    rounds = 0
+    while matchups := tournament._matching(players):
+        rounds += 1
+        played.extend(frozenset(matchup) for matchup in matchups)
+        # the late player catches up every round
+        assert any('daphne' in matchup for matchup in matchups)
+
+    # no pairing is replayed after the registration
+    assert len(played) == len(set(played)) == 10  # noqa: PLR2004
+    assert rounds == 4  # noqa: PLR2004
+
+
 def test_matching_one_player():
     players = ['velma']
     tournament = TournamentAgent()
-    round_1 = set(tournament._matching(players, 1))
+    round_1 = set(tournament._matching(players))
     assert len(round_1) == 0
 
 
 def test_matching_too_short():
     players = ['velma', 'fred']
     tournament = TournamentAgent()
-    round_2 = set(tournament._matching(players, 2))
+    round_1 = set(tournament._matching(players))
+    assert len(round_1) == 1
+    round_2 = set(tournament._matching(players))
     assert len(round_2) == 0
 
 
@@ -73,9 +130,15 @@ async def test_game():
 
 class SlowPlayer(MyBattleshipPlayer):
     @action
-    async def new_game(self, ships, size=10) -> Board:
+    async def new_game(
+        self,
+        ships: list[int],
+        size: int = 10,
+        *,
+        game_id: int | None = None,
+    ) -> Board:
         await asyncio.sleep(0.2)
-        return await super().new_game(ships, size)
+        return await super().new_game(ships, size, game_id=game_id)
 
 
 @pytest.mark.asyncio
@@ -103,7 +166,7 @@ async def test_play_game_init_timeout():
 
 class ExceptionPlayer(MyBattleshipPlayer):
     @action
-    async def get_move(self) -> Crd:
+    async def get_move(self, *, game_id: int | None = None) -> Crd:
         raise ValueError('Mistake')
 
 
@@ -142,9 +205,242 @@ async def test_play_tournament():
     assert tournament.round_num > 1
     players = await tournament.get_players()
 
-    assert players[0]['win_rate'] > 0
+    assert players[0]['rating'] > players[-1]['rating']
     for i in range(15):
-        assert players[i]['win_rate'] >= players[i + 1]['win_rate']
+        assert players[i]['rank'] == i + 1
+        assert players[i]['rating'] >= players[i + 1]['rating']
+
+    shutdown_event.set()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_game_latency_stats():
+    tournament = TournamentAgent()
+    await tournament.play_game(
+        asyncio.Event(),
+        ProxyHandle(MyBattleshipPlayer()),
+        ProxyHandle(MyBattleshipPlayer()),
+        ('velma', 'fred'),
+    )
+
+    stats = await tournament.get_latency_stats()
+    assert set(stats) == {'velma', 'fred'}
+    assert stats['velma']['new_game']['count'] == 1
+    assert stats['velma']['take_turn']['p99'] <= tournament.timeout
+
+
+def test_tournament_game_limit():
+    with pytest.raises(ValueError, match='at most'):
+        TournamentAgent(concurrent_games=MyBattleshipPlayer.max_games + 1)
+
+
+@pytest.mark.asyncio
+async def test_tournament_concurrent_games():
+    tournament = TournamentAgent(concurrent_games=4)
+    for name in ('velma', 'fred'):
+        await tournament.register_player(
+            ProxyHandle(MyBattleshipPlayer()),
+            name,
+        )
+
+    # with two players, there is a single matchup
+    shutdown_event = asyncio.Event()
+    task = asyncio.create_task(tournament.play_tournament(shutdown_event))
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if tournament.registered_players['velma'].games >= 4:  # noqa: PLR2004
+            break
+    shutdown_event.set()
+    task.cancel()
+
+    players = await tournament.get_players()
+    assert [player['games'] for player in players] == [4, 4]
+    assert sum(player['wins'] for player in players) == 4  # noqa: PLR2004
+
+
+class SlowMovePlayer(MyBattleshipPlayer):
+    @action
+    async def get_move(self, *, game_id=None) -> Crd:
+        await asyncio.sleep(0.02)
+        return await super().get_move(game_id=game_id)
+
+
+@pytest.mark.asyncio
+async def test_play_tournament_rolling():
+    tournament = TournamentAgent()
+    await tournament.register_player(ProxyHandle(SlowMovePlayer()), 'slow')
+    for name in ('velma', 'fred', 'shaggy', 'daphne'):
+        await tournament.register_player(
+            ProxyHandle(MyBattleshipPlayer()),
+            name,
+        )
+
+    shutdown_event = asyncio.Event()
+    task = asyncio.create_task(tournament.play_tournament(shutdown_event))
+    await asyncio.sleep(0.5)
+
+    # the other players keep playing while the slow game goes on
+    players = {
+        player['name']: player for player in await tournament.get_players()
+    }
+    assert players['slow']['games'] == 0
+    assert max(player['games'] for player in players.values()) >= 2  # noqa: PLR2004
+
+    utilization = await tournament.get_utilization()
+    assert utilization['games_per_hour'] > 0
+    assert utilization['players']['slow'] > 0.9  # noqa: PLR2004
+    assert all(0 <= u <= 1 for u in utilization['players'].values())
 
     shutdown_event.set()
     await task
+    assert tournament.matchups == []
+    assert all(
+        info.busy_since is None
+        for info in tournament.registered_players.values()
+    )
+
+
+class CountingPlayer(MyBattleshipPlayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @action
+    async def get_move(self, *, game_id=None) -> Crd:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            return await super().get_move(game_id=game_id)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_play_tournament_player_calls():
+    tournament = TournamentAgent(concurrent_games=4, max_player_calls=1)
+    players = [CountingPlayer(), CountingPlayer()]
+    for player, name in zip(players, ('velma', 'fred')):
+        await tournament.register_player(ProxyHandle(player), name)
+
+    shutdown_event = asyncio.Event()
+    task = asyncio.create_task(tournament.play_tournament(shutdown_event))
+    await asyncio.sleep(0.2)
+    shutdown_event.set()
+    await task
+
+    assert [player.max_in_flight for player in players] == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_play_tournament_max_concurrent_games():
+    tournament = TournamentAgent(max_concurrent_games=1)
+    for i in range(8):
+        await tournament.register_player(
+            ProxyHandle(MyBattleshipPlayer()),
+            f'player-{i}',
+        )
+
+    shutdown_event = asyncio.Event()
+    task = asyncio.create_task(tournament.play_tournament(shutdown_event))
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+        assert len(await tournament.get_current_matchups()) <= 1
+    stats = await tournament.get_queue_stats()
+    shutdown_event.set()
+    await task
+
+    assert stats['games'] <= 1
+    assert stats['max_depth'] >= 3  # noqa: PLR2004
+    assert stats['wait']['count'] > 0
+
+
+def test_backlog_fewest_games_first():
+    tournament = TournamentAgent(max_concurrent_games=2)
+    for name, games in (
+        ('velma', 3),
+        ('fred', 1),
+        ('shaggy', 0),
+        ('scooby', 2),
+    ):
+        tournament.registered_players[name] = PlayerInfo(None, games=games)  # type: ignore[arg-type]
+
+    tournament._queue_matchups([('velma', 'scooby'), ('fred', 'shaggy')])
+    assert tournament._admit_matchups() == [
+        ('fred', 'shaggy'),
+        ('velma', 'scooby'),
+    ]
+    assert tournament._backlog == []
+
+
+class RepeatingPlayer(MyBattleshipPlayer):
+    @action
+    async def get_move(self, *, game_id=None) -> Crd:
+        return Crd(0, 0)
+
+
+@pytest.mark.asyncio
+async def test_game_repeated_shots():
+    tournament = TournamentAgent()
+    repeats = tournament.max_repeats + 1
+    with pytest.warns(UserWarning, match=f'Player 1 repeated {repeats} shots'):
+        winner = await tournament.play_game(
+            asyncio.Event(),
+            ProxyHandle(MyBattleshipPlayer()),
+            ProxyHandle(RepeatingPlayer()),
+        )
+    assert winner == 0
+
+    stalls = await tournament.get_stall_stats()
+    assert stalls['count'] == 1
+
+
+class OnceSlowPlayer(MyBattleshipPlayer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.moves = 0
+
+    @action
+    async def get_move(self, *, game_id=None) -> Crd:
+        self.moves += 1
+        if self.moves == 3:  # noqa: PLR2004
+            await asyncio.sleep(0.3)
+        return await super().get_move(game_id=game_id)
+
+
+@pytest.mark.asyncio
+async def test_game_time_bank():
+    tournament = TournamentAgent(time_budget=0.5, time_increment=0.01)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        winner = await tournament.play_game(
+            asyncio.Event(),
+            ProxyHandle(OnceSlowPlayer()),
+            ProxyHandle(MyBattleshipPlayer()),
+            ('slow', 'fast'),
+        )
+
+    [result] = await tournament.get_game_results()
+    assert result.players == ('slow', 'fast')
+    assert result.winner == winner
+    assert result.clock is not None
+    slow, fast = result.clock
+    # the slow move cost more than the fixed timeout but not the game
+    assert 0 < slow < fast - tournament.timeout
+
+
+@pytest.mark.asyncio
+async def test_game_time_bank_empty():
+    tournament = TournamentAgent(time_budget=0.2)
+    with pytest.warns(UserWarning, match='Player 0 raised exception'):
+        winner = await tournament.play_game(
+            asyncio.Event(),
+            ProxyHandle(OnceSlowPlayer()),
+            ProxyHandle(MyBattleshipPlayer()),
+        )
+    assert winner == 1
+    [result] = await tournament.get_game_results()
+    assert result.clock is not None
+    assert result.clock[0] == 0